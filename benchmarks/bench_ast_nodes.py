@@ -0,0 +1,62 @@
+"""Allocation rate and memory of AST node variants from the generator: python -m benchmarks.bench_ast_nodes"""
+import argparse
+import time
+import tracemalloc
+
+from lox.tokens import Token, TokenType
+from lox.tools.ast_generator import render_ast_module
+
+
+VARIANTS = {
+    "dict": {},
+    "slots": {"slots": True},
+    "slots+frozen": {"slots": True, "frozen": True},
+}
+
+
+def load_variant(**options: bool) -> dict:
+    namespace = {"__name__": "lox.bench_expressions", "__package__": "lox"}
+    exec(render_ast_module(**options), namespace)
+    return namespace
+
+
+def build_tree(nodes: dict, depth: int):
+    """Left-leaning tree of (-i + (i)) terms, 4 nodes per level"""
+    Binary, Grouping, Literal, Unary = nodes["Binary"], nodes["Grouping"], nodes["Literal"], nodes["Unary"]
+    plus = Token(TokenType.PLUS, "+", None, 1)
+    minus = Token(TokenType.MINUS, "-", None, 1)
+
+    expr = Literal(0.0)
+    for i in range(depth):
+        expr = Binary(Unary(minus, expr), plus, Grouping(Literal(float(i))))
+    return expr
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=250_000, help="Levels of the generated tree (4 nodes each)")
+    params = parser.parse_args()
+    node_count = params.depth * 4 + 1
+
+    for name, options in VARIANTS.items():
+        nodes = load_variant(**options)
+
+        start = time.perf_counter()
+        tree = build_tree(nodes, params.depth)
+        elapsed = time.perf_counter() - start
+        del tree
+
+        tracemalloc.start()
+        tree = build_tree(nodes, params.depth)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del tree
+
+        print(
+            f"{name:<13} {node_count / elapsed:12,.0f} nodes/s  "
+            f"retained {retained / 2**20:8.2f} MiB  {retained / node_count:6.1f} B/node"
+        )
+
+
+if __name__ == "__main__":
+    main()
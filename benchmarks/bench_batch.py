@@ -0,0 +1,36 @@
+"""Batch checking of many scripts with a growing number of worker processes: python -m benchmarks.bench_batch"""
+import argparse
+import io
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from lox.batch import run_batch
+from .bench_cache import make_script
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=2_000)
+    parser.add_argument("--terms", type=int, default=300, help="Terms of the expression in every file")
+    parser.add_argument("--jobs", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    params = parser.parse_args()
+
+    rng = random.Random(1337)
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(params.files):
+            subdirectory = Path(directory) / f"package_{i % 20}"
+            subdirectory.mkdir(exist_ok=True)
+            (subdirectory / f"script_{i}.lox").write_text(make_script(params.terms, rng))
+
+        for jobs in params.jobs:
+            start = time.perf_counter()
+            code = run_batch([directory], "regex", "precedence", jobs, io.StringIO())
+            elapsed = time.perf_counter() - start
+            print(f"{params.files:,} files  jobs {jobs:>3}  {elapsed:8.3f} s  {params.files / elapsed:10,.0f} files/s  exit {code}")
+
+
+if __name__ == "__main__":
+    main()
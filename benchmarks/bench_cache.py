@@ -0,0 +1,56 @@
+"""Cold vs warm startup of `python -m lox` with the parsed-AST cache: python -m benchmarks.bench_cache"""
+import argparse
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from lox.cache import CACHE_DIR
+
+
+def make_script(terms: int, rng: random.Random) -> str:
+    """One long expression, the VM evaluates it without recursion so only scanning and parsing cost depends on size"""
+    parts = [str(rng.randint(1, 9))]
+    for i in range(1, terms):
+        operand = f"({rng.randint(1, 9)} - {rng.randint(1, 9)} / 2)" if i % 3 == 0 else f"{rng.randint(1, 9)}.5"
+        parts.append(f"{rng.choice('+-*')} {operand}")
+        if i % 8 == 0:
+            parts.append("\n")
+    return " ".join(parts)
+
+
+def startup(script: Path, *options: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "lox", "--eval", "vm", *options, str(script)], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, nargs="+", default=[1_000, 20_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of every script, the best one is reported")
+    params = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for terms in params.terms:
+            script = Path(directory) / f"script_{terms}.lox"
+            script.write_text(make_script(terms, random.Random(1337)))
+
+            no_cache = min(startup(script, "--no-cache") for _ in range(params.repeat))
+            cold = []
+            for _ in range(params.repeat):
+                shutil.rmtree(Path(directory) / CACHE_DIR, ignore_errors=True)
+                cold.append(startup(script))
+            warm = min(startup(script) for _ in range(params.repeat))
+
+            print(
+                f"{terms:>8,} terms  {script.stat().st_size / 1024:8.1f} KiB  no cache {no_cache * 1e3:8.1f} ms  "
+                f"cold {min(cold) * 1e3:8.1f} ms  warm {warm * 1e3:8.1f} ms  ({no_cache / warm:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
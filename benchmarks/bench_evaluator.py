@@ -0,0 +1,55 @@
+"""Tree-walking interpreter vs closure compilation on large arithmetic expressions: python -m benchmarks.bench_evaluator"""
+import argparse
+import random
+import time
+
+from lox.regex_scanner import RegexScanner
+from lox.parser import Parser
+from lox.interpreter import evaluate, compile_expr
+
+
+def make_source(terms: int, rng: random.Random) -> str:
+    """Balanced expression over random numbers, nesting depth stays logarithmic in the number of terms"""
+    if terms == 1:
+        return str(rng.randint(1, 100))
+    half = terms // 2
+    operator = rng.choice(["+", "-", "*", "<", "=="]) if terms > 2 else rng.choice(["+", "-", "*"])
+    left, right = make_source(half, rng), make_source(terms - half, rng)
+    if operator in ("<", "=="):
+        return f"({left} {operator} {right} ? {rng.randint(1, 100)} : -{rng.randint(1, 100)})"
+    return f"({left} {operator} {right})"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=20, help="Evaluations of every expression")
+    params = parser.parse_args()
+    rng = random.Random(1337)
+
+    for terms in params.terms:
+        expr = Parser(RegexScanner(make_source(terms, rng)).scan_tokens()).parse()
+
+        start = time.perf_counter()
+        for _ in range(params.repeat):
+            expected = evaluate(expr)
+        tree_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = compile_expr(expr)
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(params.repeat):
+            assert compiled() == expected
+        closure_time = time.perf_counter() - start
+
+        print(
+            f"{terms:>8,} terms  tree {tree_time / params.repeat * 1e3:9.3f} ms/eval  "
+            f"closure {closure_time / params.repeat * 1e3:9.3f} ms/eval (+{compile_time * 1e3:.3f} ms compile)  "
+            f"speedup {tree_time / closure_time:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Throughput and memory of scanning, parsing and printing generated workloads, saved as JSON for comparing runs:
+python -m benchmarks.bench_frontend [--output results.json] [--compare baseline.json]"""
+import argparse
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from lox.lox import SCANNER_ENGINES, PARSER_ENGINES
+from lox.diagnostics import Diagnostics
+from lox.ast_utils import count_nodes
+from lox.ast_printer import pprint_expr
+from .workloads import WORKLOADS, generate
+
+
+def measure(stage, repeat: int) -> dict:
+    """Best time out of repeat runs, then a single run under tracemalloc for the peak of memory allocated meanwhile
+       and the number of memory blocks still allocated after it, i.e. what the stage's result takes up"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        result = None
+        start = time.perf_counter()
+        result = stage()
+        best = min(best, time.perf_counter() - start)
+
+    result = None
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = stage()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "peak_bytes": peak, "allocated_blocks": sys.getallocatedblocks() - blocks}, result
+
+
+def run(workload: str, terms: int, scanner_engine: str, parser_engine: str, repeat: int) -> list[dict]:
+    source = generate(workload, terms)
+    scanner_type, parser_type = SCANNER_ENGINES[scanner_engine], PARSER_ENGINES[parser_engine]
+
+    def scan():
+        if scanner_engine == "stream":
+            return list(scanner_type(io.StringIO(source), reporter=Diagnostics()).scan_tokens())
+        return scanner_type(source, reporter=Diagnostics()).scan_tokens()
+
+    scanning, tokens = measure(scan, repeat)
+    parsing, expr = measure(lambda: parser_type(tokens, reporter=Diagnostics()).parse(), repeat)
+    nodes = count_nodes(expr)
+
+    scanning["tokens_per_s"] = len(tokens) / scanning["seconds"]
+    parsing["tokens_per_s"] = len(tokens) / parsing["seconds"]
+    parsing["nodes_per_s"] = nodes / parsing["seconds"]
+    results = [{"stage": "scan", **scanning}, {"stage": "parse", **parsing}]
+
+    try:
+        printing, _ = measure(lambda: pprint_expr(expr), repeat)
+        printing["nodes_per_s"] = nodes / printing["seconds"]
+        results.append({"stage": "pprint", **printing})
+    except RecursionError:
+        results.append({"stage": "pprint", "error": "RecursionError"})
+
+    common = {"workload": workload, "terms": terms, "source_bytes": len(source), "tokens": len(tokens), "nodes": nodes}
+    return [{**common, **result} for result in results]
+
+
+def print_result(result: dict, baseline: dict | None) -> None:
+    line = f"{result['workload']:<9}{result['terms']:>9,}  {result['stage']:<7}"
+    if "error" in result:
+        print(f"{line} {result['error']}")
+        return
+
+    line += f" {result['seconds'] * 1e3:10.2f} ms"
+    if "tokens_per_s" in result:
+        line += f" {result['tokens_per_s']:12,.0f} tokens/s"
+    if "nodes_per_s" in result:
+        line += f" {result['nodes_per_s']:12,.0f} nodes/s"
+    line += f" {result['peak_bytes'] / 2**20:8.1f} MiB peak {result['allocated_blocks']:10,} blocks"
+    if baseline is not None and "seconds" in baseline:
+        line += f"  x{baseline['seconds'] / result['seconds']:.2f} vs baseline"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument("--terms", type=int, nargs="+", default=[1_000, 20_000])
+    parser.add_argument("--scanner", choices=SCANNER_ENGINES, default="classic")
+    parser.add_argument("--parser", choices=PARSER_ENGINES, default="recursive")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of every stage, the best one is reported")
+    parser.add_argument("--output", help="JSON file to write the results to")
+    parser.add_argument("--compare", help="JSON file of an earlier run to report speedups against")
+    params = parser.parse_args()
+
+    baselines = {}
+    if params.compare:
+        with open(params.compare) as file:
+            for result in json.load(file)["results"]:
+                baselines[result["workload"], result["terms"], result["stage"]] = result
+
+    results = []
+    for workload in params.workloads:
+        for terms in params.terms:
+            for result in run(workload, terms, params.scanner, params.parser, params.repeat):
+                print_result(result, baselines.get((workload, terms, result["stage"])))
+                results.append(result)
+
+    if params.output:
+        report = {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "scanner": params.scanner,
+            "parser": params.parser,
+            "repeat": params.repeat,
+            "results": results,
+        }
+        with open(params.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
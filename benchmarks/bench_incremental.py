@@ -0,0 +1,67 @@
+"""Per-keystroke latency of incremental vs full re-scanning and re-parsing: python -m benchmarks.bench_incremental"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+from lox.incremental import IncrementalDocument
+from lox.regex_scanner import RegexScanner
+from lox.parser import Parser
+from lox.diagnostics import Diagnostics
+from .bench_cache import make_script
+
+
+def typing_trace(text: str, edits: int, rng: random.Random) -> list[tuple[int, int, str]]:
+    """Someone typing a few terms at random spots, a character at a time, fixing a typo every now and then"""
+    trace = []
+    while len(trace) < edits:
+        offset = text.find(" ", rng.randrange(len(text)))
+        offset = len(text) if offset < 0 else offset
+        typed = rng.choice([" + 7", " * (1 - 2)", " - \"a\"", " /* ? */"])
+        for i, char in enumerate(typed):
+            trace.append((offset + i, 0, char))
+        text = text[:offset] + typed + text[offset:]
+        if rng.random() < 0.3:
+            trace.append((offset + len(typed) - 1, 1, ""))
+            text = text[:offset + len(typed) - 1] + text[offset + len(typed):]
+    return trace[:edits]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--trace", help="JSON file with a list of [offset, deleted, inserted] edits to replay instead")
+    params = parser.parse_args()
+
+    for terms in params.terms:
+        text = make_script(terms, random.Random(1337))
+        if params.trace:
+            with open(params.trace) as file:
+                trace = [tuple(edit) for edit in json.load(file)]
+        else:
+            trace = typing_trace(text, params.edits, random.Random(7))
+
+        document = IncrementalDocument(text)
+        document.parse(Diagnostics())
+        incremental, full = [], []
+        for offset, deleted, inserted in trace:
+            start = time.perf_counter()
+            document.edit(offset, deleted, inserted)
+            document.parse(Diagnostics())
+            incremental.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            diagnostics = Diagnostics()
+            Parser(RegexScanner(document.text, reporter=diagnostics).scan_tokens(), reporter=diagnostics).parse()
+            full.append(time.perf_counter() - start)
+
+        print(f"{terms:,} terms, {len(trace)} edits")
+        for name, times in ("incremental", incremental), ("full", full):
+            median, worst = statistics.median(times), max(times)
+            print(f"  {name:<12} median {median * 1e3:8.2f} ms  max {worst * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Memory and parse time with and without hash-consed nodes: python -m benchmarks.bench_interning"""
+import argparse
+import time
+import tracemalloc
+
+from lox.regex_scanner import RegexScanner
+from lox.parser import Parser
+from lox.interning import InterningNodeFactory
+
+
+SHAPES = ["a * (b + c)", "-(a - b) / c", "(a + b) * (a + b)", "!(a == b)", "\"lox\" + \"lox\""]
+
+
+def make_source(terms: int) -> str:
+    """Long sum of a few repeated sub-expression shapes over a small pool of constants"""
+    parts = []
+    for i in range(terms):
+        shape = SHAPES[i % len(SHAPES)]
+        parts.append(shape.replace("a", str(i % 7)).replace("b", str(i % 3)).replace("c", str(i % 5 + 1)))
+    return " + ".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, default=100_000)
+    params = parser.parse_args()
+
+    tokens = RegexScanner(make_source(params.terms)).scan_tokens()
+
+    for name, factory in [("plain", lambda: None), ("interning", InterningNodeFactory)]:
+        start = time.perf_counter()
+        Parser(tokens, factory()).parse()
+        elapsed = time.perf_counter() - start
+
+        node_factory = factory()
+        tracemalloc.start()
+        tree = Parser(tokens, node_factory).parse()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del tree
+
+        stats = f"hit rate {node_factory.hit_rate:6.1%}" if node_factory else ""
+        print(f"{name:<10} parse {elapsed:7.3f} s  retained {retained / 2**20:8.2f} MiB  {stats}")
+
+
+if __name__ == "__main__":
+    main()
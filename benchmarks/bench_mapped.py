@@ -0,0 +1,49 @@
+"""Scanning a memory-mapped script as bytes against reading it as text: python -m benchmarks.bench_mapped [--sizes 1 10]"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from lox.lox import SCANNER_ENGINES
+from lox.mapped_scanner import MappedScanner, map_file
+from .bench_scanner import make_source
+
+
+def read_and_scan(path: Path, engine: str) -> list:
+    with open(path, "r") as file:
+        return SCANNER_ENGINES[engine](file.read()).scan_tokens()
+
+
+def map_and_scan(path: Path) -> list:
+    return MappedScanner(map_file(str(path))).scan_tokens()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10], help="Script sizes in MB")
+    parser.add_argument("--engines", nargs="+", choices=SCANNER_ENGINES, default=["classic", "regex"])
+    params = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size_mb in params.sizes:
+            path = Path(directory) / f"script_{size_mb}.lox"
+            path.write_text(make_source(size_mb))
+
+            runs = [(f"text {engine}", lambda engine=engine: read_and_scan(path, engine)) for engine in params.engines]
+            for name, run in runs + [("mapped", lambda: map_and_scan(path))]:
+                start = time.perf_counter()
+                tokens = run()
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{size_mb:>6.1f} MB  {name:<14} {elapsed:8.3f} s  "
+                    f"{size_mb / elapsed:8.2f} MB/s  {len(tokens) / elapsed:12,.0f} tokens/s"
+                )
+
+            # what an error report pays: the newline index is built in bulk by the first line looked up
+            start = time.perf_counter()
+            line = tokens[-1].line
+            print(f"{size_mb:>6.1f} MB  {'line index':<14} {time.perf_counter() - start:8.3f} s  ({line:,} lines)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Recursive descent vs operator-precedence parser on wide and deep expressions: python -m benchmarks.bench_parser"""
+import argparse
+import sys
+import time
+
+from lox.regex_scanner import RegexScanner
+from lox.lox import PARSER_ENGINES
+
+
+WORKLOADS = {
+    # long flat operator chains, every operand pays the full descent in the recursive parser
+    "wide": lambda n: " + ".join(f"{i} * {i % 7} - -{i} / 3 == true" for i in range(n)),
+    # nested parentheses and unary chains, recursion depth grows with n
+    "deep": lambda n: "(" * n + "1" + ")" * n + " * " + "-" * n + "2",
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    params = parser.parse_args()
+    print(f"recursion limit: {sys.getrecursionlimit()}")
+
+    for workload, make_source in WORKLOADS.items():
+        for size in params.sizes:
+            tokens = RegexScanner(make_source(size)).scan_tokens()
+            results = []
+            for engine, parser_type in PARSER_ENGINES.items():
+                try:
+                    start = time.perf_counter()
+                    parser_type(tokens).parse()
+                    elapsed = time.perf_counter() - start
+                    results.append(f"{engine} {elapsed * 1e3:10.2f} ms {len(tokens) / elapsed:12,.0f} tokens/s")
+                except RecursionError:
+                    results.append(f"{engine} {'RecursionError':>38}")
+            print(f"{workload:<5} {size:>8,}  " + "  ".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Expressions/s of --pipe mode against a process per expression: python -m benchmarks.bench_pipe"""
+import argparse
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .workloads import generate
+
+
+def expressions(count: int, terms: int) -> list[str]:
+    rng = random.Random(1337)
+    return [generate("tokens", terms, seed=rng.randrange(1 << 30)).replace("\n", " ") for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10_000, help="Expressions piped through a single process")
+    parser.add_argument("--processes", type=int, default=50, help="Expressions run by a process each")
+    parser.add_argument("--terms", type=int, default=8, help="Operands of every expression")
+    parser.add_argument("--eval", default="vm")
+    params = parser.parse_args()
+    command = [sys.executable, "-m", "lox", "--eval", params.eval, "--no-cache"]
+
+    piped = "\n".join(expressions(params.count, params.terms)).encode()
+    start = time.perf_counter()
+    result = subprocess.run(command + ["--pipe"], input=piped, capture_output=True)
+    elapsed = time.perf_counter() - start
+    print(f"pipe        {params.count:>8,} expressions {elapsed:8.3f} s {params.count / elapsed:12,.0f} expressions/s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        scripts = []
+        for i, source in enumerate(expressions(params.processes, params.terms)):
+            scripts.append(Path(directory) / f"expression_{i}.lox")
+            scripts[-1].write_text(source)
+
+        start = time.perf_counter()
+        for script in scripts:
+            subprocess.run(command + [str(script)], capture_output=True)
+        elapsed = time.perf_counter() - start
+    print(f"per process {params.processes:>8,} expressions {elapsed:8.3f} s {params.processes / elapsed:12,.0f} expressions/s")
+
+
+if __name__ == "__main__":
+    main()
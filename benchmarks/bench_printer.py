@@ -0,0 +1,57 @@
+"""Recursive vs iterative AST printing of 100k-node trees: python -m benchmarks.bench_printer"""
+import argparse
+import io
+import random
+import time
+
+from lox.regex_scanner import RegexScanner
+from lox.parser import Parser
+from lox.interning import InterningNodeFactory
+from lox.ast_printer import pprint_expr, pprint_expr_recursive, write_expr
+from .workloads import WORKLOADS
+
+
+TREES = {
+    # balanced and logarithmically deep, within reach of the recursive printer
+    "balanced": lambda terms: Parser(RegexScanner(WORKLOADS["tokens"](terms, random.Random(1337))).scan_tokens()).parse(),
+    # a left-leaning chain as deep as it is long
+    "chain": lambda terms: Parser(RegexScanner(WORKLOADS["chain"](terms, random.Random(1337))).scan_tokens()).parse(),
+    # few distinct subtrees repeated over and over, shared once interned
+    "shared": lambda terms: Parser(
+        RegexScanner(" + ".join(f"({i % 10} * (2 - {i % 3}))" for i in range(terms // 6))).scan_tokens(),
+        InterningNodeFactory(),
+    ).parse(),
+}
+
+PRINTERS = {
+    "recursive": pprint_expr_recursive,
+    "iterative": pprint_expr,
+    "memoized": lambda expr: pprint_expr(expr, memoize=True),
+    "streamed": lambda expr: write_expr(expr, io.StringIO()),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, default=50_000, help="Operands of every tree, 100k nodes by default")
+    parser.add_argument("--repeat", type=int, default=5)
+    params = parser.parse_args()
+
+    for tree, make_tree in TREES.items():
+        expr = make_tree(params.terms)
+        results = []
+        for printer, print_expr in PRINTERS.items():
+            try:
+                best = float("inf")
+                for _ in range(params.repeat):
+                    start = time.perf_counter()
+                    print_expr(expr)
+                    best = min(best, time.perf_counter() - start)
+                results.append(f"{printer} {best * 1e3:8.1f} ms")
+            except RecursionError:
+                results.append(f"{printer} {'RecursionError':>16}")
+        print(f"{tree:<9} " + "  ".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Scanning engines compared on large generated sources: python -m benchmarks.bench_scanner [--sizes 1 10]"""
+import argparse
+import time
+
+from lox.lox import SCANNER_ENGINES
+
+
+SNIPPET = (
+    "var x /* float */ = 3 + 2;\n"
+    "print (1 == 2 ? 45 : -123 * (45.67 + 8.901)) >= identity(addPair);\n"
+    "// inline comment that will be discarded by lexer\n"
+    "var greeting = \"hello\" + \"world\";\n"
+    "/*\n * C-style comment\n */\n"
+    "fun addPair(a, b) { return a + b; }\n"
+)
+
+
+def make_source(size_mb: float) -> str:
+    repeats = int(size_mb * 1024 * 1024) // len(SNIPPET) + 1
+    return SNIPPET * repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10], help="Source sizes in MB")
+    parser.add_argument("--engines", nargs="+", choices=SCANNER_ENGINES, default=list(SCANNER_ENGINES))
+    params = parser.parse_args()
+
+    for size_mb in params.sizes:
+        source = make_source(size_mb)
+        for engine in params.engines:
+            start = time.perf_counter()
+            tokens = SCANNER_ENGINES[engine](source).scan_tokens()
+            elapsed = time.perf_counter() - start
+            print(
+                f"{size_mb:>6.1f} MB  {engine:<8} {elapsed:8.3f} s  "
+                f"{size_mb / elapsed:8.2f} MB/s  {len(tokens) / elapsed:12,.0f} tokens/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Binary format vs pickle for token streams and syntax trees: python -m benchmarks.bench_serialization"""
+import argparse
+import pickle
+import random
+import time
+
+from lox.scanner import Scanner
+from lox.parser import Parser
+from lox.serialization import flatten, unflatten, dump_tokens, load_tokens, dump_ast, load_ast, AstReader
+from .bench_cache import make_script
+
+
+def timed(function, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def report(name: str, dump, load, repeat: int) -> None:
+    data, dump_time = timed(dump, repeat)
+    _, load_time = timed(lambda: load(data), repeat)
+    print(f"  {name:<16} {len(data) / 1024:10.1f} KiB  dump {dump_time * 1e3:8.1f} ms  load {load_time * 1e3:8.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, nargs="+", default=[1_000, 20_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    params = parser.parse_args()
+
+    for terms in params.terms:
+        source = make_script(terms, random.Random(1337))
+        tokens = Scanner(source).scan_tokens()
+        expr = Parser(tokens).parse()
+        print(f"{terms:,} terms, {len(source) / 1024:.1f} KiB of source, {len(tokens):,} tokens")
+
+        report("tokens binary", lambda: dump_tokens(tokens), lambda data: list(load_tokens(data)), params.repeat)
+        report("tokens pickle", lambda: pickle.dumps(tokens, pickle.HIGHEST_PROTOCOL), pickle.loads, params.repeat)
+        report("ast binary", lambda: dump_ast(expr), load_ast, params.repeat)
+        # nested dataclasses can't be pickled directly beyond the recursion limit, hence flattened
+        report("ast pickle", lambda: pickle.dumps(flatten(expr), pickle.HIGHEST_PROTOCOL),
+               lambda data: unflatten(pickle.loads(data)), params.repeat)
+        report("ast root only", lambda: dump_ast(expr), lambda data: AstReader(data).root.children, params.repeat)
+
+
+if __name__ == "__main__":
+    main()
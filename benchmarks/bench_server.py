@@ -0,0 +1,88 @@
+"""Latency of running small scripts on a --serve server against a fresh process each: python -m benchmarks.bench_server"""
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from lox.client import LoxClient
+from .workloads import generate
+
+
+def percentiles(latencies: list[float]) -> str:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return f"p50 {cuts[49] * 1e3:8.2f} ms  p99 {cuts[98] * 1e3:8.2f} ms  mean {statistics.fmean(latencies) * 1e3:8.2f} ms"
+
+
+def measure(run, scripts: list[Path], requests: int) -> list[float]:
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        run(scripts[i % len(scripts)])
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def wait_for_server(path: str, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            LoxClient(path).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.01)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200, help="Scripts run in every mode")
+    parser.add_argument("--scripts", type=int, default=20, help="Distinct scripts, the server's AST cache is warm after them")
+    parser.add_argument("--terms", type=int, default=8, help="Operands of every script")
+    parser.add_argument("--eval", default="vm")
+    params = parser.parse_args()
+    options = ["--eval", params.eval]
+
+    with tempfile.TemporaryDirectory() as directory:
+        rng = random.Random(1337)
+        scripts = []
+        for i in range(params.scripts):
+            scripts.append(Path(directory) / f"script_{i}.lox")
+            scripts[-1].write_text(generate("tokens", params.terms, seed=rng.randrange(1 << 30)))
+
+        socket_path = os.path.join(directory, "plox.sock")
+        server = subprocess.Popen([sys.executable, "-m", "lox", "--serve", socket_path] + options)
+        try:
+            wait_for_server(socket_path)
+
+            def fresh_process(script: Path) -> None:
+                subprocess.run([sys.executable, "-m", "lox", "--no-cache"] + options + [str(script)], capture_output=True)
+
+            def client_process(script: Path) -> None:
+                subprocess.run([sys.executable, "-m", "lox.client", socket_path, str(script)], capture_output=True)
+
+            def new_connection(script: Path) -> None:
+                with LoxClient(socket_path) as client:
+                    client.run(script.read_bytes())
+
+            with LoxClient(socket_path) as persistent:
+                modes = {
+                    "fresh process": fresh_process,
+                    "client process": client_process,
+                    "new connection": new_connection,
+                    "persistent connection": lambda script: persistent.run(script.read_bytes()),
+                }
+                for name, run in modes.items():
+                    print(f"{name:<22} {percentiles(measure(run, scripts, params.requests))}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
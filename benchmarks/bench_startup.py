@@ -0,0 +1,56 @@
+"""Import time of the interpreter measured with -X importtime: python -m benchmarks.bench_startup"""
+import argparse
+import os
+import subprocess
+import sys
+
+from lox.__main__ import DEFERRED_MODULES, STARTUP_BUDGET_US
+
+
+def import_times(module: str = "lox.__main__") -> dict[str, tuple[int, int]]:
+    """Self and cumulative microseconds of every module imported by a fresh interpreter importing the given one"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="")  # timing loads of cached bytecode, not compiling sources
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True, env=env
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(own), int(cumulative)
+    return times
+
+
+def fastest_import_times(module: str = "lox.__main__", runs: int = 5) -> dict[str, tuple[int, int]]:
+    """Minimum over a few runs, what a warm file system cache allows rather than scheduling noise"""
+    fastest: dict[str, tuple[int, int]] = {}
+    for _ in range(runs):
+        for name, (own, cumulative) in import_times(module).items():
+            best_own, best_cumulative = fastest.get(name, (own, cumulative))
+            fastest[name] = min(own, best_own), min(cumulative, best_cumulative)
+    return fastest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="lox.__main__")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules listed")
+    params = parser.parse_args()
+
+    times = fastest_import_times(params.module, params.runs)
+    print(f"{'module':<30} {'self us':>10} {'cumulative us':>14}")
+    for name, (own, cumulative) in sorted(times.items(), key=lambda item: -item[1][1])[:params.top]:
+        print(f"{name:<30} {own:>10,} {cumulative:>14,}")
+
+    own_lox = sum(own for name, (own, _) in times.items() if name == "lox" or name.startswith("lox."))
+    total = times[params.module][1]
+    print(f"lox modules themselves {own_lox:,} us, {params.module} {total:,} us of {STARTUP_BUDGET_US:,} us budget")
+    deferred = [name for name in DEFERRED_MODULES if name in times]
+    if deferred:
+        print("imported although deferred:", ", ".join(deferred))
+
+
+if __name__ == "__main__":
+    main()
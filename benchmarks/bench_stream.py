@@ -0,0 +1,43 @@
+"""Peak memory of scanning a script file eagerly vs as a lazy token stream: python -m benchmarks.bench_stream"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from lox.regex_scanner import RegexScanner
+from lox.stream_scanner import StreamScanner
+from .bench_scanner import make_source
+
+
+def eager(path: str) -> int:
+    with open(path) as file:
+        return len(RegexScanner(file.read()).scan_tokens())
+
+
+def streaming(path: str) -> int:
+    with open(path) as file:
+        return sum(1 for _ in StreamScanner(file).scan_tokens())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 5], help="Script sizes in MB")
+    params = parser.parse_args()
+
+    for size_mb in params.sizes:
+        with tempfile.NamedTemporaryFile("w", suffix=".lox") as script:
+            script.write(make_source(size_mb))
+            script.flush()
+
+            for name, scan in [("eager", eager), ("stream", streaming)]:
+                tracemalloc.start()
+                start = time.perf_counter()
+                count = scan(script.name)
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{size_mb:>6.1f} MB  {name:<7} {count:>10,} tokens  {elapsed:8.3f} s  peak {peak / 2**20:9.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
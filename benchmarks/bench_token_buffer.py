@@ -0,0 +1,43 @@
+"""Memory and throughput of a list of Token instances vs a columnar TokenBuffer: python -m benchmarks.bench_token_buffer"""
+import argparse
+import time
+import tracemalloc
+
+from lox.regex_scanner import RegexScanner, ColumnarScanner
+from .bench_scanner import make_source
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10], help="Source sizes in MB")
+    params = parser.parse_args()
+
+    for size_mb in params.sizes:
+        source = make_source(size_mb)
+
+        for name, engine in [("list", RegexScanner), ("buffer", ColumnarScanner)]:
+            start = time.perf_counter()
+            tokens = engine(source).scan_tokens()
+            scan_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for token in tokens:
+                token.token_type
+            read_time = time.perf_counter() - start
+            del tokens
+
+            # measured separately since tracing allocations skews timings
+            tracemalloc.start()
+            tokens = engine(source).scan_tokens()
+            retained, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(
+                f"{size_mb:>6.1f} MB  {name:<7} {len(tokens):>10,} tokens  scan {scan_time:7.3f} s  "
+                f"read {read_time:7.3f} s  retained {retained / 2**20:8.2f} MiB  {retained / len(tokens):6.1f} B/token"
+            )
+            del tokens
+
+
+if __name__ == "__main__":
+    main()
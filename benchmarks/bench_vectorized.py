@@ -0,0 +1,71 @@
+"""One expression over many rows, column-wise with NumPy vs a compiled closure per row: python -m benchmarks.bench_vectorized"""
+import argparse
+import time
+
+import numpy as np
+
+from lox.regex_scanner import RegexScanner
+from lox.parser import Parser
+from lox.interpreter import compile_expr
+from lox.vectorized import evaluate_columns
+
+
+EXPRESSIONS = {
+    "arithmetic": "price * quantity * (1 - discount) + 2.5",
+    "conditional": "quantity > 10 ? price * quantity * (1 - discount) : price * quantity > 100 ? 0 : -1",
+    "nil": "note == nil ? price : price * 2",  # object column, numbers are vectorized again past the conditional
+    "strings": "quantity > 50 ? \"bulk\" : \"retail\"",
+}
+
+
+def make_columns(rows: int, rng: np.random.Generator) -> dict[str, np.ndarray]:
+    note = np.empty(rows, dtype=object)
+    note[rng.random(rows) < 0.5] = "gift"
+    return {
+        "price": rng.uniform(1, 100, rows),
+        "quantity": rng.integers(1, 100, rows).astype(np.float64),
+        "discount": rng.uniform(0, 0.5, rows),
+        "note": note,
+    }
+
+
+def per_row(expr, columns: dict[str, np.ndarray]) -> list:
+    environment: dict = {}
+    run = compile_expr(expr, environment)
+    names = list(columns)
+    results = []
+    for values in zip(*(columns[name].tolist() for name in names)):
+        environment.update(zip(names, values))
+        results.append(run())
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=float, nargs="+", default=[1e3, 1e4, 1e5, 1e6, 1e7])
+    parser.add_argument("--loop-limit", type=float, default=1e6, help="Most rows evaluated by the per-row loop")
+    parser.add_argument("--expressions", nargs="+", choices=EXPRESSIONS, default=list(EXPRESSIONS))
+    params = parser.parse_args()
+    rng = np.random.default_rng(1337)
+
+    for rows in map(int, params.rows):
+        columns = make_columns(rows, rng)
+        for name in params.expressions:
+            expr = Parser(RegexScanner(EXPRESSIONS[name]).scan_tokens()).parse()
+
+            start = time.perf_counter()
+            result = evaluate_columns(expr, columns)
+            vectorized_time = time.perf_counter() - start
+            line = f"{rows:>12,} rows  {name:<12} vectorized {vectorized_time * 1e3:10.2f} ms {rows / vectorized_time:14,.0f} rows/s"
+
+            if rows <= params.loop_limit:
+                start = time.perf_counter()
+                expected = per_row(expr, columns)
+                loop_time = time.perf_counter() - start
+                assert result.tolist() == expected, f"Vectorized {name} differs from the per-row loop"
+                line += f"  per row {loop_time * 1e3:10.2f} ms  speedup {loop_time / vectorized_time:7.1f}x"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Tree walker vs closures vs bytecode VM on deeply nested expressions: python -m benchmarks.bench_vm"""
+import argparse
+import random
+import sys
+import time
+
+from lox.tokens import Token, TokenType
+from lox.expressions import Expr, Binary, Conditional, Grouping, Literal, Unary
+from lox.interpreter import evaluate, compile_expr
+from lox.bytecode import compile_bytecode
+from lox.vm import execute
+
+
+OPERATORS = [Token(TokenType.PLUS, "+", None, 1), Token(TokenType.MINUS, "-", None, 1), Token(TokenType.STAR, "*", None, 1)]
+LESS = Token(TokenType.LESS, "<", None, 1)
+NEGATE = Token(TokenType.MINUS, "-", None, 1)
+
+
+def make_tree(depth: int, rng: random.Random) -> Expr:
+    """Left spine of the given depth, the shape generated code takes and the one blowing up recursive evaluators"""
+    expr = Literal(1.0)
+    for i in range(depth):
+        match i % 4:
+            case 0:
+                expr = Binary(expr, rng.choice(OPERATORS), Literal(float(rng.randint(1, 9))))
+            case 1:
+                expr = Grouping(Unary(NEGATE, expr))
+            case 2:
+                expr = Conditional(Binary(expr, LESS, Literal(0.0)), Literal(-1.0), Literal(1.0))
+            case 3:
+                expr = Binary(expr, OPERATORS[0], Literal(0.5))
+    return expr
+
+
+def timed(engine, repeat: int) -> str:
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            engine()
+        return f"{(time.perf_counter() - start) / repeat * 1e3:9.3f} ms"
+    except RecursionError:
+        return f"{'RecursionError':>12}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depths", type=int, nargs="+", default=[500, 5_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=20, help="Evaluations of every expression")
+    params = parser.parse_args()
+    print(f"recursion limit: {sys.getrecursionlimit()}")
+
+    for depth in params.depths:
+        expr = make_tree(depth, random.Random(1337))
+        chunk = compile_bytecode(expr)
+        try:
+            closure = compile_expr(expr)
+        except RecursionError:
+            closure = lambda: compile_expr(expr)  # reports the RecursionError again when timed
+
+        print(
+            f"depth {depth:>7,}  tree {timed(lambda: evaluate(expr), params.repeat)}  "
+            f"closure {timed(lambda: closure(), params.repeat)}  "
+            f"vm {timed(lambda: execute(chunk), params.repeat)}  ({len(chunk.code):,} instructions)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Seeded generators of Lox sources stressing different parts of the front-end, shared by the benchmarks.
+Every generator takes the number of terms (operands) and a random.Random, so a seed always yields the same source."""
+import random
+from typing import Callable
+
+
+OPERATORS = ["+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">="]
+
+
+def balanced(operands: list[str], rng: random.Random) -> str:
+    """Joins operands with random binary operators into a single expression nested logarithmically deep,
+       so that even a huge one neither overflows a recursive parser nor a recursive printer"""
+    while len(operands) > 1:
+        paired = [f"({left} {rng.choice(OPERATORS)} {right})" for left, right in zip(operands[::2], operands[1::2])]
+        operands = paired + operands[len(paired) * 2:]
+    return operands[0]
+
+
+def primary(rng: random.Random) -> str:
+    match rng.randrange(8):
+        case 0:
+            return f"\"s{rng.randrange(1000)}\""
+        case 1:
+            return rng.choice(["true", "false", "nil"])
+        case 2:
+            return f"-{rng.randint(1, 99)}"
+        case 3:
+            return f"!{rng.choice(['true', 'false'])}"
+        case 4:
+            return f"({rng.randint(1, 9)} < {rng.randint(1, 9)} ? {rng.randint(1, 9)} : {rng.randint(1, 9)}.5)"
+        case _:
+            return f"{rng.randint(0, 999)}.{rng.randint(0, 99)}" if rng.random() < 0.5 else str(rng.randint(0, 9999))
+
+
+def long_token_stream(terms: int, rng: random.Random) -> str:
+    """Every kind of literal, unary and binary operator and conditionals, broken into lines"""
+    source = balanced([primary(rng) for _ in range(terms)], rng)
+    return source.replace(" + ", "\n+ ")
+
+
+def nested_groupings(terms: int, rng: random.Random) -> str:
+    """Operands wrapped in up to 16 levels of parentheses and a unary operator each"""
+    operands = []
+    for _ in range(terms):
+        depth = rng.randint(1, 16)
+        operands.append("(" * depth + rng.choice(["-", "!", ""]) + primary(rng) + ")" * depth)
+    return balanced(operands, rng)
+
+
+def operator_chain(terms: int, rng: random.Random) -> str:
+    """A single flat chain of additions and multiplications, its syntax tree is as deep as it is long"""
+    return " ".join([str(rng.randint(1, 9))] + [f"{rng.choice('+-*/')} {rng.randint(1, 9)}" for _ in range(terms - 1)])
+
+
+def comments_and_strings(terms: int, rng: random.Random) -> str:
+    """Operands far apart - long string literals, C-style comments spanning lines and line comments between them"""
+    operands = []
+    for _ in range(terms):
+        match rng.randrange(3):
+            case 0:
+                operands.append("\"" + "lorem ipsum " * rng.randint(5, 30) + "\"")
+            case 1:
+                operands.append("/* " + "dolor sit amet\n" * rng.randint(5, 30) + " */ " + primary(rng))
+            case 2:
+                operands.append(primary(rng) + " // consectetur adipiscing elit\n")
+    return balanced(operands, rng)
+
+
+def error_heavy(terms: int, rng: random.Random) -> str:
+    """Binary operators missing their left operand (the error productions of Parser.primary) and stray characters"""
+    operands = []
+    for _ in range(terms):
+        match rng.randrange(4):
+            case 0:
+                operands.append(f"({rng.choice(['==', '!=', '>', '>=', '<', '<=', '+', '*', '/'])} {primary(rng)})")
+            case 1:
+                operands.append(f"{primary(rng)} {rng.choice('@#$')}")
+            case _:
+                operands.append(primary(rng))
+    return balanced(operands, rng)
+
+
+WORKLOADS: dict[str, Callable[[int, random.Random], str]] = {
+    "tokens": long_token_stream,
+    "nested": nested_groupings,
+    "chain": operator_chain,
+    "comments": comments_and_strings,
+    "errors": error_heavy,
+}
+
+
+def generate(workload: str, terms: int, seed: int = 1337) -> str:
+    return WORKLOADS[workload](terms, random.Random(seed))
@@ -1,16 +1,162 @@
+import os
 import sys
-from .lox import Lox
+import argparse
+from typing import TYPE_CHECKING
+from .lox import Lox, SCANNER_ENGINES, PARSER_ENGINES, EVALUATORS
+from .parser import DEFAULT_MAX_ERRORS
+
+if TYPE_CHECKING:
+    from .instrumentation import Instrumentation
+
+# modes other than running a single script import what they need themselves (batch mode a process pool, --profile
+# cProfile and pstats), which would otherwise take longer than the whole run of a short script
+DEFERRED_MODULES = [
+    "dataclasses", "multiprocessing", "concurrent.futures", "pstats", "cProfile", "tracemalloc", "pickle", "hashlib",
+    "pathlib", "lox.batch", "lox.pipe", "lox.instrumentation", "lox.incremental", "lox.regex_scanner",
+    "lox.stream_scanner", "lox.mapped_scanner", "lox.precedence_parser", "lox.generated_parser", "lox.ast_printer",
+    "lox.interpreter", "lox.optimizer", "lox.ast_utils", "lox.bytecode", "lox.vm", "lox.disassembler", "lox.vectorized",
+    "numpy", "asyncio", "lox.server", "lox.client",
+]
+
+# microseconds importing this module may take - loose enough for a busy machine, yet well under the ~75 ms it took
+# when every engine, the process pool and the profiler were imported up front
+STARTUP_BUDGET_US = 40_000
+
+
+def __parse_params() -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(prog="plox")
+
+    parser.add_argument(
+        "scripts", nargs="*", metavar="script",
+        help="Lox script to run, starts the REPL when omitted. Many scripts or directories are scanned and parsed in batch",
+    )
+    parser.add_argument("--scanner", choices=SCANNER_ENGINES, default=Lox.scanner_engine, help="Scanning engine")
+    parser.add_argument("--parser", choices=PARSER_ENGINES, default=Lox.parser_engine, help="Parsing engine")
+    parser.add_argument("-O", "--optimize", action="store_true", help="Fold constants and simplify expressions")
+    parser.add_argument("--disassemble", action="store_true", help="Print bytecode listing of compiled expressions")
+    parser.add_argument("--eval", choices=EVALUATORS, help="Evaluate expressions with given engine instead of printing their AST")
+    parser.add_argument("-j", "--jobs", type=int, help="Worker processes of batch mode, one per CPU by default")
+    parser.add_argument(
+        "--mmap", action="store_true",
+        help="Memory-map a script and scan it as bytes whatever the --scanner, errors are reported with columns",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always scan and parse, neither read nor write __loxcache__")
+    parser.add_argument(
+        "--recover", action="store_true",
+        help="Only check scripts (even a single one) in batch mode, reporting all syntax errors in one pass",
+    )
+    parser.add_argument(
+        "--max-errors", type=int, default=DEFAULT_MAX_ERRORS, help="Syntax errors reported per script with --recover",
+    )
+    parser.add_argument(
+        "--pipe", action="store_true",
+        help="Run many programs read from stdin in bulk, one per line or separated by --delimiter, instead of the REPL",
+    )
+    parser.add_argument("--delimiter", default="\\n", help="Separator of --pipe programs, escapes such as \\0 allowed")
+    parser.add_argument(
+        "--serve", metavar="SOCKET",
+        help="Run programs sent to this Unix socket by python -m lox.client until interrupted, instead of the REPL",
+    )
+    parser.add_argument("--max-concurrent", type=int, help="Programs run at once by --serve, one per CPU by default")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds a --serve request may wait and run")
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="Report time, tokens, nodes and tree depth of every phase as JSON on stderr (not in batch mode)",
+    )
+    parser.add_argument("--stats-file", help="Write the --stats report to this file instead")
+    parser.add_argument("--profile", action="store_true", help="Also trace peak memory of phases and profile runs")
+    parser.add_argument("--profile-file", help="Dump the --profile pstats to this file instead of printing them")
+
+    return parser.parse_known_args()
 
 
 def main() -> None:
-    match len(sys.argv):
-        case 1:
+    params, unknown = __parse_params()
+    if unknown:
+        print("Usage: plox [options] [script ...]")
+        sys.exit(64)
+
+    Lox.scanner_engine = params.scanner
+    Lox.parser_engine = params.parser
+    Lox.evaluator = params.eval
+    Lox.optimize = params.optimize
+    Lox.disassemble = params.disassemble
+    Lox.memory_map = params.mmap
+    if params.no_cache:
+        Lox.ast_cache = None
+    params.stats |= params.stats_file is not None
+    params.profile |= params.profile_file is not None
+    if params.stats or params.profile:
+        from .instrumentation import Instrumentation
+        Lox.instrumentation = Instrumentation(trace_memory=bool(params.profile), profile=bool(params.profile))
+
+    try:
+        if params.pipe:
+            try:
+                delimiter = params.delimiter.encode().decode("unicode_escape")
+            except UnicodeDecodeError:
+                delimiter = ""  # a malformed escape
+            if not delimiter:
+                print("Usage: plox --pipe [--delimiter separator], the separator has to be a non-empty string")
+                sys.exit(64)
+            sys.exit(__run_pipe(delimiter))
+        elif params.serve:
+            __run_server(params.serve, params.max_concurrent, params.timeout)
+        elif not params.scripts:
             Lox.run_prompt()
-        case 2:
-            Lox.run_file(sys.argv[1])
-        case _:
-            print("Usage: plox [script]")
-            sys.exit(64)
+        elif len(params.scripts) == 1 and not os.path.isdir(params.scripts[0]) and not params.recover:
+            Lox.run_file(params.scripts[0])
+        else:
+            if Lox.evaluator is not None or Lox.optimize or Lox.disassemble:
+                # batch mode only checks scripts, rather than running them without the options asked for
+                print("Usage: plox [options] [script ...], batch mode doesn't take --eval, -O or --disassemble")
+                sys.exit(64)
+            from .batch import run_batch
+            max_errors = params.max_errors if params.recover else None
+            sys.exit(run_batch(
+                params.scripts, Lox.scanner_engine, Lox.parser_engine, params.jobs, max_errors=max_errors,
+                memory_map=Lox.memory_map,
+            ))
+    finally:
+        if Lox.instrumentation is not None:
+            __write_reports(Lox.instrumentation, params.stats_file, params.profile_file)
+
+
+def __run_pipe(delimiter: str) -> int:
+    from .pipe import run_pipe, WRITE_BUFFER_SIZE
+    # results are written through a buffer of their own, without a flush per line even on a terminal
+    with open(sys.stdout.fileno(), "w", buffering=WRITE_BUFFER_SIZE, encoding="utf-8", closefd=False) as out:
+        return run_pipe(
+            sys.stdin.buffer, out, delimiter, scanner_engine=Lox.scanner_engine, parser_engine=Lox.parser_engine,
+            evaluator=Lox.evaluator, optimize=Lox.optimize, disassemble=Lox.disassemble, ast_cache=Lox.ast_cache,
+            instrumentation=Lox.instrumentation,
+        )
+
+
+def __run_server(path: str, max_concurrent: int | None, timeout: float) -> None:
+    from .server import run_server
+    # requests are run with the options of the server, the AST cache is shared by all of them
+    run_server(
+        path, max_concurrent=max_concurrent, timeout=timeout, scanner_engine=Lox.scanner_engine,
+        parser_engine=Lox.parser_engine, evaluator=Lox.evaluator, optimize=Lox.optimize, disassemble=Lox.disassemble,
+        ast_cache=Lox.ast_cache,
+    )
+
+
+def __write_reports(instrumentation: "Instrumentation", stats_file: str | None, profile_file: str | None) -> None:
+    if stats_file is None:
+        instrumentation.write_report(sys.stderr)
+    else:
+        with open(stats_file, "w") as file:
+            instrumentation.write_report(file)
+
+    if instrumentation.profiler is None:
+        return
+    if profile_file is None:
+        import pstats
+        pstats.Stats(instrumentation.profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+    else:
+        instrumentation.profiler.dump_stats(profile_file)
 
 
 if __name__ == "__main__":
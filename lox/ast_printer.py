@@ -1,14 +1,20 @@
-from .expressions import Expr, Binary, Grouping, Literal, Unary, Conditional
+from typing import Any, Callable, TextIO
+from .expressions import Expr, Binary, Grouping, Literal, Unary, Conditional, Variable, Error
+
+
+SYNTAX_ERROR = "[SYNTAX ERROR]"  # error nodes of recovery, followed by the partial tree within if there's one
+FLUSH_EVERY = 4096  # fragments buffered before they're written out to a file
 
 
 def parenthesize(name: str, *exprs: Expr) -> str:
     res = "(" + name + " "
-    res += " ".join([pprint_expr(expr) for expr in exprs])
+    res += " ".join([pprint_expr_recursive(expr) for expr in exprs])
     res += ")"
     return res
 
 
-def pprint_expr(expr: Expr) -> str:
+def pprint_expr_recursive(expr: Expr) -> str:
+    """Reference printer, builds the text by recursive concatenation - quadratic and limited by the recursion limit"""
     match expr:
         case Binary(left, operator, right):
             return parenthesize(operator.lexeme, left, right)
@@ -18,14 +24,134 @@ def pprint_expr(expr: Expr) -> str:
             return "nil" if value is None else str(value)
         case Unary(operator, right):
             return parenthesize(operator.lexeme, right)
+        case Variable(name):
+            return name.lexeme
         case Conditional(conditional, then_branch, else_branch):
-            return "(if " + pprint_expr(conditional) + " then " + pprint_expr(then_branch) + " else " + pprint_expr(else_branch) + ")"
-        case None:
-            return "[SYNTAX ERROR]"
+            return "(if " + pprint_expr_recursive(conditional) + " then " + pprint_expr_recursive(then_branch) + " else " + pprint_expr_recursive(else_branch) + ")"
+        case Error(_, None):
+            return SYNTAX_ERROR
+        case Error(_, partial):
+            return SYNTAX_ERROR[:-1] + " " + pprint_expr_recursive(partial) + "]"
         case _:
             raise NotImplementedError(f"Non-exhaustive match in AST Pretty Printer failed on expression: {type(expr)}")
 
 
+def shared_nodes(expr: Expr) -> set[int]:
+    """Ids of inner nodes referenced more than once in the tree, as built by an InterningNodeFactory"""
+    seen, shared = set(), set()
+    stack = [expr]
+    pop, push = stack.pop, stack.append
+    while stack:
+        node = pop()
+        node_type = type(node)
+        if node_type is Literal or node_type is Variable:
+            continue  # leaves are printed quicker than looked up
+        if id(node) in seen:
+            shared.add(id(node))
+            continue
+
+        seen.add(id(node))
+        if node_type is Binary:
+            push(node.left)
+            push(node.right)
+        elif node_type is Grouping:
+            push(node.expression)
+        elif node_type is Unary:
+            push(node.right)
+        elif node_type is Conditional:
+            stack += [node.condition, node.then_branch, node.else_branch]
+        elif node_type is Error and node.partial is not None:
+            push(node.partial)
+    return shared
+
+
+def literal_text(value: Any) -> str:
+    return "nil" if value is None else str(value)
+
+
+def print_fragments(expr: Expr, write: Callable[[str], object] | None = None, memoize: bool = False) -> list[str]:
+    """Walks the tree with an explicit stack, appending pieces of text to a list - which is passed to write and cleared
+       every now and then if given, or returned as a whole otherwise. Subtrees referenced many times are printed just
+       once if memoized, at the cost of a pass over the tree looking for them first."""
+    out: list[str] = []
+    append = out.append
+    shared = shared_nodes(expr) if memoize else ()
+    memo: dict[int, str] = {}
+    recording: list[int] = []  # where text of shared subtrees printed at the moment starts in out
+    stack: list = [expr]
+    pop, push = stack.pop, stack.append
+
+    # dispatching on exact node types and printing literal operands of binary operators right away
+    # (the most common leaves by far) takes less than half the time of matching every node against the patterns
+    while stack:
+        node = pop()
+        node_type = type(node)
+
+        if node_type is str:
+            append(node)
+            if write is not None and len(out) >= FLUSH_EVERY and not recording:
+                write("".join(out))
+                out.clear()
+            continue
+        if node_type is tuple:  # end of a shared subtree
+            text = memo[node[0]] = "".join(out[recording[-1]:])
+            del out[recording.pop():]
+            append(text)
+            continue
+
+        if shared and id(node) in shared:
+            if id(node) in memo:
+                append(memo[id(node)])
+                continue
+            recording.append(len(out))
+            push((id(node),))
+
+        if node_type is Binary:
+            append("(" + node.operator.lexeme + " ")
+            right, left = node.right, node.left
+            if type(right) is Literal:
+                push(" " + literal_text(right.value) + ")")
+            else:
+                stack += [")", right, " "]
+            if type(left) is Literal:
+                append(literal_text(left.value))
+            else:
+                push(left)
+        elif node_type is Literal:
+            append(literal_text(node.value))
+        elif node_type is Grouping:
+            append("(group ")
+            stack += [")", node.expression]
+        elif node_type is Unary:
+            append("(" + node.operator.lexeme + " ")
+            stack += [")", node.right]
+        elif node_type is Variable:
+            append(node.name.lexeme)
+        elif node_type is Conditional:
+            append("(if ")
+            stack += [")", node.else_branch, " else ", node.then_branch, " then ", node.condition]
+        elif node_type is Error:
+            if node.partial is None:
+                append(SYNTAX_ERROR)
+            else:
+                append(SYNTAX_ERROR[:-1] + " ")
+                stack += ["]", node.partial]
+        else:
+            raise NotImplementedError(f"Non-exhaustive match in AST Pretty Printer failed on expression: {node_type}")
+
+    return out
+
+
+def pprint_expr(expr: Expr, memoize: bool = False) -> str:
+    """Lisp-like text of the tree, same as pprint_expr_recursive's, but for trees of any depth and in linear time"""
+    return "".join(print_fragments(expr, memoize=memoize))
+
+
+def write_expr(expr: Expr, file: TextIO, memoize: bool = False) -> None:
+    """Streams text of the tree to a file, never holding more than a few thousand pieces of it in memory"""
+    file.write("".join(print_fragments(expr, file.write, memoize)))
+
+
 if __name__ == "__main__":
     from tokens import Token, TokenType
 
@@ -48,5 +174,6 @@ if __name__ == "__main__":
     )
 
     res = pprint_expr(expression)
+    assert res == pprint_expr_recursive(expression)
     assert res == "(* (- 123) (group (+ 45.67 8.901)))"
     print(res)
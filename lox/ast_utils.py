@@ -0,0 +1,29 @@
+from .expressions import Expr, Binary, Grouping, Unary, Conditional, Error
+
+
+def tree_shape(expr: Expr | None) -> tuple[int, int]:
+    """Number of nodes and depth of a tree, found without recursion as trees may be arbitrarily deep"""
+    nodes = depth = 0
+    stack = [(expr, 1)]
+    while stack:
+        expr, level = stack.pop()
+        match expr:
+            case Binary(left, _, right):
+                stack += [(left, level + 1), (right, level + 1)]
+            case Grouping(expression):
+                stack.append((expression, level + 1))
+            case Unary(_, right):
+                stack.append((right, level + 1))
+            case Conditional(condition, then_branch, else_branch):
+                stack += [(condition, level + 1), (then_branch, level + 1), (else_branch, level + 1)]
+            case Error(_, partial) if partial is not None:
+                stack.append((partial, level + 1))
+            case None:
+                continue  # of a parse that gave up on a syntax error
+        nodes += 1
+        depth = max(depth, level)
+    return nodes, depth
+
+
+def count_nodes(expr: Expr | None) -> int:
+    return tree_shape(expr)[0]
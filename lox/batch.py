@@ -0,0 +1,105 @@
+import os
+import sys
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable, TextIO
+from .diagnostics import Diagnostics, Diagnostic
+from .session import SCANNER_ENGINES, PARSER_ENGINES
+
+
+SCRIPT_SUFFIX = ".lox"
+
+
+def collect_scripts(paths: Iterable[str]) -> list[Path]:
+    """Files are taken as given, directories are searched recursively for Lox scripts in a stable (sorted) order"""
+    scripts: list[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            scripts += sorted(script for script in path.rglob(f"*{SCRIPT_SUFFIX}") if script.is_file())
+        else:
+            scripts.append(path)
+    return scripts
+
+
+def check_script(
+    path: Path, scanner_engine: str, parser_engine: str, max_errors: int | None = None, memory_map: bool = False
+) -> list[Diagnostic] | str:
+    """Scans and parses a single script, returning its errors instead of reporting them through Lox
+       (or why it couldn't be read, raising that would end the whole pool.map).
+       With max_errors the parser recovers from syntax errors and reports up to that many of them.
+       With memory_map the script is mapped and scanned as bytes whatever the scanner_engine, as --mmap runs do."""
+    diagnostics = Diagnostics()
+
+    try:
+        with open(path, "r") as file:
+            if memory_map:
+                from .mapped_scanner import MappedScanner, map_file
+                scanner = MappedScanner(map_file(str(path)), reporter=diagnostics)
+            elif scanner_engine == "stream":
+                scanner = SCANNER_ENGINES[scanner_engine](file, reporter=diagnostics)
+            else:
+                scanner = SCANNER_ENGINES[scanner_engine](file.read(), reporter=diagnostics)
+
+            parser = PARSER_ENGINES[parser_engine](scanner.scan_tokens(), reporter=diagnostics)
+            if max_errors is None:
+                parser.parse()
+            else:
+                parser.parse_all(max_errors)
+            for _ in parser.tokens:
+                pass  # lexer errors past the end of the expression
+    except OSError as error:
+        return error.strerror
+    except UnicodeDecodeError as error:
+        return str(error)
+
+    return diagnostics.items
+
+
+def run_batch(
+    paths: Iterable[str], scanner_engine: str, parser_engine: str, jobs: int | None = None, out: TextIO = sys.stdout,
+    max_errors: int | None = None, memory_map: bool = False,
+) -> int:
+    """Checks many scripts across a pool of processes, reports their errors in the order scripts were given
+       (not the one they were checked in) and returns exit code of the whole batch"""
+    scripts = collect_scripts(paths)
+    jobs = jobs or os.cpu_count() or 1
+    failed = unreadable = errors = 0
+
+    if jobs == 1 or len(scripts) < 2:
+        results = map(
+            check_script, scripts, repeat(scanner_engine), repeat(parser_engine), repeat(max_errors), repeat(memory_map)
+        )
+        pool = None
+    else:
+        import multiprocessing  # a single script is checked without paying for importing the pool machinery
+        from concurrent.futures import ProcessPoolExecutor
+        # thousands of tiny scripts are sent over in chunks, otherwise pickling round trips dominate
+        # forking a process that already runs threads (e.g. an embedder's) may deadlock, a fork server is immune to that
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        pool = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context(start_method))
+        chunk_size = max(1, len(scripts) // (jobs * 8))
+        results = pool.map(
+            check_script, scripts, repeat(scanner_engine), repeat(parser_engine), repeat(max_errors), repeat(memory_map),
+            chunksize=chunk_size,
+        )
+
+    try:
+        for script, diagnostics in zip(scripts, results):
+            if isinstance(diagnostics, str):
+                print(f"{script}: {diagnostics}", file=out)
+                unreadable += 1
+                continue
+
+            for diagnostic in diagnostics:
+                print(f"{script}: {diagnostic}", file=out)
+            if diagnostics:
+                failed += 1
+                errors += len(diagnostics)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    print(f"checked {len(scripts)} files, {errors} errors in {failed} files, {unreadable} unreadable", file=out)
+    if unreadable:
+        return 66
+    return 65 if failed else 0
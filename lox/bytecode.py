@@ -0,0 +1,137 @@
+import math
+from array import array
+from enum import IntEnum, auto
+from typing import Any
+from .tokens import TokenType as TT
+from .expressions import Expr, Binary, Grouping, Literal, Unary, Conditional, Variable, Error
+from .interpreter import syntax_error
+
+
+class OpCode(IntEnum):
+    # grouped by operand kind, the VM dispatches on ranges of opcodes so mind the order when adding new ones
+    CONSTANT = auto()
+    NIL = auto()
+    TRUE = auto()
+    FALSE = auto()
+    NEGATE = auto()
+    NOT = auto()
+    ADD = auto()
+    SUBTRACT = auto()
+    MULTIPLY = auto()
+    DIVIDE = auto()
+    EQUAL = auto()
+    NOT_EQUAL = auto()
+    GREATER = auto()
+    GREATER_EQUAL = auto()
+    LESS = auto()
+    LESS_EQUAL = auto()
+    JUMP_IF_FALSE = auto()  # pops the condition
+    JUMP = auto()
+    RETURN = auto()
+    GET_VARIABLE = auto()  # operand is the constant index of the name
+
+
+# instructions are single words - opcode in the low byte and operand (constant index or jump target) above it
+OPCODE_BITS = 8
+OPCODE_MASK = (1 << OPCODE_BITS) - 1
+MAX_OPERAND = (1 << 24) - 1
+
+UNARY_OPCODES = {
+    TT.MINUS: OpCode.NEGATE,
+    TT.BANG: OpCode.NOT,
+}
+
+BINARY_OPCODES = {
+    TT.PLUS: OpCode.ADD,
+    TT.MINUS: OpCode.SUBTRACT,
+    TT.STAR: OpCode.MULTIPLY,
+    TT.SLASH: OpCode.DIVIDE,
+    TT.EQUAL_EQUAL: OpCode.EQUAL,
+    TT.BANG_EQUAL: OpCode.NOT_EQUAL,
+    TT.GREATER: OpCode.GREATER,
+    TT.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TT.LESS: OpCode.LESS,
+    TT.LESS_EQUAL: OpCode.LESS_EQUAL,
+}
+
+
+class Chunk:
+    """Flat instruction stream of a compiled expression with its constant pool and a source line per instruction"""
+
+    def __init__(self) -> None:
+        self.code = array("I")
+        self.lines = array("I")
+        self.constants: list[Any] = []
+        self.constant_indices: dict[tuple, int] = {}
+
+    def emit(self, opcode: OpCode, line: int, operand: int = 0) -> int:
+        assert operand <= MAX_OPERAND, "Instruction operand doesn't fit in 24 bits"
+        self.code.append(opcode | operand << OPCODE_BITS)
+        self.lines.append(line)
+        return len(self.code) - 1
+
+    def patch_jump(self, offset: int) -> None:
+        """Points jump instruction at offset to the next instruction to be emitted"""
+        opcode = self.code[offset] & OPCODE_MASK
+        self.code[offset] = opcode | len(self.code) << OPCODE_BITS
+
+    def add_constant(self, value: Any) -> int:
+        # sign is part of the key since 0.0 == -0.0, so is the type since true == 1.0
+        key = (type(value), value, math.copysign(1.0, value) if type(value) is float else None)
+        if key not in self.constant_indices:
+            self.constant_indices[key] = len(self.constants)
+            self.constants.append(value)
+        return self.constant_indices[key]
+
+
+def compile_bytecode(expr: Expr) -> Chunk:
+    """Lowers an expression to bytecode in post-order with an explicit work stack instead of recursion,
+       so the compiled chunk can be produced (and executed) for trees of any depth"""
+    chunk = Chunk()
+    line = 0  # operators and variables carry tokens, literals are attributed to the last seen one's line
+    work: list[Expr | tuple] = [expr]
+
+    while work:
+        match work.pop():
+            case Literal(value) as literal:
+                line = literal.line or line  # known for constants the optimizer folded
+                match value:
+                    case None:
+                        chunk.emit(OpCode.NIL, line)
+                    case True:
+                        chunk.emit(OpCode.TRUE, line)
+                    case False:
+                        chunk.emit(OpCode.FALSE, line)
+                    case _:
+                        chunk.emit(OpCode.CONSTANT, line, chunk.add_constant(value))
+            case Variable(name):
+                line = name.line
+                chunk.emit(OpCode.GET_VARIABLE, line, chunk.add_constant(name.lexeme))
+            case Grouping(expression):
+                work.append(expression)
+            case Unary(operator, right):
+                line = operator.line
+                work += [("emit", UNARY_OPCODES[operator.token_type], line), right]
+            case Binary(left, operator, right):
+                line = operator.line
+                work += [("emit", BINARY_OPCODES[operator.token_type], line), right, left]
+            case Conditional(condition, then_branch, else_branch):
+                else_jump, end_jump = [0], [0]  # cells filled with jump offsets once they're emitted
+                work += [
+                    ("patch", end_jump), else_branch, ("patch", else_jump),
+                    ("jump", OpCode.JUMP, end_jump), then_branch, ("jump", OpCode.JUMP_IF_FALSE, else_jump),
+                    condition,
+                ]
+            case Error(token, _):
+                raise syntax_error(token)  # no opcode stands for it, such trees aren't compiled at all
+            case ("emit", opcode, op_line):
+                chunk.emit(opcode, op_line)
+            case ("jump", opcode, cell):
+                cell[0] = chunk.emit(opcode, line)
+            case ("patch", cell):
+                chunk.patch_jump(cell[0])
+            case node:
+                raise NotImplementedError(f"Non-exhaustive match in bytecode compiler failed on expression: {type(node)}")
+
+    chunk.emit(OpCode.RETURN, line)
+    return chunk
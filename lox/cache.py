@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+from . import __version__
+from .expressions import Expr
+from .serialization import FORMAT_VERSION
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+CACHE_DIR = "__loxcache__"
+MAGIC = b"PLOXAST\0"
+VERSION_TAG = f"plox-{__version__}".encode()
+# trees are stored in the binary format of lox.serialization, which only ever decodes into nodes - unlike pickle,
+# a crafted entry in a shared or checked out __loxcache__ can't run any code
+HEADER = MAGIC + bytes([FORMAT_VERSION, len(VERSION_TAG)]) + VERSION_TAG
+
+
+def source_digest(source: str | bytes) -> bytes:
+    import hashlib  # only once something is cached, not at every start of the interpreter
+    return hashlib.sha256(source.encode() if isinstance(source, str) else source).digest()
+
+
+class AstCache:
+    """Cache of parsed expressions keyed by source hash - an in-process LRU in front of an on-disk cache stored next to
+       scripts (in the spirit of __pycache__), so repeated runs of unchanged sources skip scanning and parsing"""
+
+    def __init__(self, capacity: int = 256, use_disk: bool = True) -> None:
+        self.capacity = capacity
+        self.use_disk = use_disk
+        self.entries: OrderedDict[bytes, Expr] = OrderedDict()
+        self.lock = threading.Lock()  # a cache may be shared by sessions running in different threads
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_path(script_path: str | os.PathLike) -> "Path":
+        from pathlib import Path  # pulls in re and urllib, which a REPL or a piped run never need
+        script_path = Path(script_path)
+        return script_path.parent / CACHE_DIR / f"{script_path.name}.{VERSION_TAG.decode()}.ast"
+
+    def get(self, digest: bytes, script_path: str | os.PathLike | None = None) -> Expr | None:
+        with self.lock:
+            expr = self.entries.get(digest)
+            if expr is not None:
+                self.entries.move_to_end(digest)
+                self.hits += 1
+                return expr
+
+        if script_path is not None and self.use_disk:
+            expr = self.load(digest, script_path)
+            if expr is not None:
+                self.remember(digest, expr, disk_hit=True)
+                return expr
+
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, digest: bytes, expr: Expr, script_path: str | os.PathLike | None = None) -> None:
+        self.remember(digest, expr)
+        if script_path is not None and self.use_disk:
+            self.store(digest, expr, script_path)
+
+    def remember(self, digest: bytes, expr: Expr, disk_hit: bool = False) -> None:
+        with self.lock:
+            self.disk_hits += disk_hit
+            self.entries[digest] = expr
+            self.entries.move_to_end(digest)
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def load(self, digest: bytes, script_path: str | os.PathLike) -> Expr | None:
+        """Reads a cached tree, anything stale, from another plox version or otherwise unreadable counts as a miss"""
+        try:
+            data = self.cache_path(script_path).read_bytes()
+        except OSError:
+            return None
+
+        header = HEADER + digest
+        if not data.startswith(header):
+            return None
+        from .serialization import load_ast
+        try:
+            return load_ast(memoryview(data)[len(header):])
+        except Exception:
+            return None  # corrupt or crafted, decoding fails with whatever error the bytes lead to
+
+    def store(self, digest: bytes, expr: Expr, script_path: str | os.PathLike) -> None:
+        from .serialization import dump_ast
+        path = self.cache_path(script_path)
+        header = HEADER + digest
+        try:
+            path.parent.mkdir(exist_ok=True)
+            # written aside and renamed, so a concurrent reader never sees a half-written file
+            temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temp_path.write_bytes(header + dump_ast(expr))
+            os.replace(temp_path, path)
+        except OSError:
+            pass  # caching is best effort, read-only script directories just don't get one
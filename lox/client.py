@@ -0,0 +1,96 @@
+import sys
+import socket
+import struct
+import argparse
+
+
+# Requests and responses of a plox server are frames over a stream socket, any number of them per connection, each
+# request answered in order:
+#   request: 4-byte big-endian length, utf-8 source of a program
+#   response: exit code byte, 4-byte big-endian lengths of the output and the error output, then both in utf-8
+# This module only needs the standard library's socket, so the client starts about as fast as Python itself.
+REQUEST_HEADER = struct.Struct(">I")
+RESPONSE_HEADER = struct.Struct(">BII")
+
+
+def encode_request(source: str | bytes) -> bytes:
+    data = source.encode() if isinstance(source, str) else source
+    return REQUEST_HEADER.pack(len(data)) + data
+
+
+def encode_response(code: int, out: str, err: str) -> bytes:
+    out_data, err_data = out.encode(), err.encode()
+    return RESPONSE_HEADER.pack(code, len(out_data), len(err_data)) + out_data + err_data
+
+
+class LoxClient:
+    """Connection to a plox server, programs sent through it run one after another in sessions of their own"""
+
+    def __init__(self, path: str) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.socket.connect(path)
+        except OSError:
+            self.socket.close()
+            raise
+        self.file = self.socket.makefile("rb")
+
+    def run(self, source: str | bytes) -> tuple[int, str, str]:
+        """Exit code, output and error output of running a program, as a process running it would leave them"""
+        self.socket.sendall(encode_request(source))
+        header = self.file.read(RESPONSE_HEADER.size)
+        if len(header) < RESPONSE_HEADER.size:
+            raise ConnectionError("plox server closed the connection")
+        code, out_size, err_size = RESPONSE_HEADER.unpack(header)
+        data = self.file.read(out_size + err_size)
+        if len(data) < out_size + err_size:
+            raise ConnectionError("plox server closed the connection")
+        return code, data[:out_size].decode(), data[out_size:].decode()
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self) -> "LoxClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="plox-client", description="Runs scripts on a server started with plox --serve")
+    parser.add_argument("socket", help="Unix socket the server listens on")
+    parser.add_argument("scripts", nargs="*", metavar="script", help="Lox script to run, stdin is run when omitted")
+    params = parser.parse_args()
+
+    try:
+        client = LoxClient(params.socket)
+    except OSError as error:
+        print(f"Can't connect to plox server at {params.socket}: {error.strerror or error}", file=sys.stderr)
+        sys.exit(69)
+
+    codes = set()
+    with client:
+        for script in params.scripts or [None]:
+            if script is None:
+                source = sys.stdin.buffer.read()
+            else:
+                try:
+                    with open(script, "rb") as file:
+                        source = file.read()
+                except OSError as error:
+                    print(f"Can't read {script}: {error.strerror}", file=sys.stderr)
+                    codes.add(66)
+                    continue
+            code, out, err = client.run(source)
+            sys.stdout.write(out)
+            sys.stderr.write(err)
+            codes.add(code)
+
+    # a syntax error in any script is reported first, then a runtime error, as in batch and pipe modes
+    sys.exit(65 if 65 in codes else 70 if 70 in codes else max(codes, default=0))
+
+
+if __name__ == "__main__":
+    main()
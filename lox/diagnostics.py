@@ -0,0 +1,86 @@
+from typing import Protocol
+from .tokens import Token, TokenType
+
+
+class Reporter(Protocol):
+    """Receiver of errors found by scanners and parsers, either the Lox class itself or a Diagnostics instance.
+       Scanners of byte sources know the column of an error as well, tokens of those carry it."""
+
+    def lexer_error(self, line: int, message: str, column: int | None = None) -> None: ...
+
+    def parser_error(self, token: Token, message: str) -> None: ...
+
+
+def default_reporter() -> Reporter:
+    # imported lazily, as lox.lox imports all of the front-end
+    from .lox import Lox as LoxImpl
+    return LoxImpl
+
+
+def error_location(token: Token) -> str:
+    if token.token_type == TokenType.EOF:
+        return "at end"
+    return f"at '{token.lexeme}'"
+
+
+class Diagnostic:
+    __slots__ = ("line", "where", "message", "column")
+    __match_args__ = ("line", "where", "message", "column")
+    line: int
+    where: str
+    message: str
+    column: int | None
+
+    def __init__(self, line: int, where: str, message: str, column: int | None = None) -> None:
+        self.line = line
+        self.where = where
+        self.message = message
+        self.column = column
+
+    def __repr__(self) -> str:
+        return (
+            f"Diagnostic(line={self.line!r}, where={self.where!r}, message={self.message!r}, column={self.column!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            (self.line, self.where, self.message, self.column)
+            == (other.line, other.where, other.message, other.column)
+        )
+
+    def __str__(self) -> str:
+        location = f"line {self.line}" if self.column is None else f"line {self.line}:{self.column}"
+        return f"[{location}] Error {self.where}: {self.message}"
+
+
+class Diagnostics:
+    """Errors of a single run collected in the order they were found instead of being printed, so runs happening
+       at the same time (in other threads or processes) don't share any error state"""
+    __match_args__ = ("items",)
+    items: list[Diagnostic]
+
+    def __init__(self, items: list[Diagnostic] | None = None) -> None:
+        self.items = [] if items is None else items
+
+    def __repr__(self) -> str:
+        return f"Diagnostics(items={self.items!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.items == other.items
+
+    @property
+    def had_error(self) -> bool:
+        return bool(self.items)
+
+    def lexer_error(self, line: int, message: str, column: int | None = None) -> None:
+        self.report(line, "", message, column)
+
+    def parser_error(self, token: Token, message: str) -> None:
+        self.report(token.line, error_location(token), message, token.column)
+
+    def report(self, line: int, where: str, message: str, column: int | None = None) -> None:
+        self.items.append(Diagnostic(line, where, message, column))
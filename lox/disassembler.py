@@ -0,0 +1,32 @@
+from .bytecode import Chunk, OpCode, OPCODE_BITS, OPCODE_MASK
+from .interpreter import stringify
+
+
+def disassemble(chunk: Chunk, name: str = "expression") -> str:
+    """Human-readable listing of a chunk, the bytecode counterpart of pprint_expr"""
+    lines = [f"== {name} =="]
+    for offset in range(len(chunk.code)):
+        lines.append(disassemble_instruction(chunk, offset))
+    return "\n".join(lines)
+
+
+def disassemble_instruction(chunk: Chunk, offset: int) -> str:
+    instruction = chunk.code[offset]
+    opcode = OpCode(instruction & OPCODE_MASK)
+    operand = instruction >> OPCODE_BITS
+
+    # repeated lines are collapsed into a pipe just like in clox
+    same_line = offset > 0 and chunk.lines[offset] == chunk.lines[offset - 1]
+    prefix = f"{offset:04d} {'   |' if same_line else f'{chunk.lines[offset]:4d}'} "
+
+    match opcode:
+        case OpCode.CONSTANT:
+            value = chunk.constants[operand]
+            shown = f'"{value}"' if isinstance(value, str) else stringify(value)
+            return prefix + f"{opcode.name:<16} {operand:4d} {shown}"
+        case OpCode.GET_VARIABLE:
+            return prefix + f"{opcode.name:<16} {operand:4d} {chunk.constants[operand]}"
+        case OpCode.JUMP | OpCode.JUMP_IF_FALSE:
+            return prefix + f"{opcode.name:<16} {offset:4d} -> {operand}"
+        case _:
+            return prefix + opcode.name
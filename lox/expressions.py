@@ -1,37 +1,139 @@
-from dataclasses import dataclass
 from typing import Any
 from .tokens import Token
 
 
 class Expr:
-    pass
+    __slots__ = ()
 
 
-@dataclass
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right")
+    __match_args__ = ("left", "operator", "right")  # positional pattern matching on nodes
     left: Expr
     operator: Token
     right: Expr
 
+    def __init__(self, left: Expr, operator: Token, right: Expr) -> None:
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+    def __repr__(self) -> str:
+        return f"Binary(left={self.left!r}, operator={self.operator!r}, right={self.right!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.left, self.operator, self.right) == (other.left, other.operator, other.right)
+
 
-@dataclass
 class Grouping(Expr):
+    __slots__ = ("expression",)
+    __match_args__ = ("expression",)  # positional pattern matching on nodes
     expression: Expr
 
+    def __init__(self, expression: Expr) -> None:
+        self.expression = expression
+
+    def __repr__(self) -> str:
+        return f"Grouping(expression={self.expression!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.expression == other.expression
+
 
-@dataclass
 class Literal(Expr):
+    __slots__ = ("value", "line")
+    __match_args__ = ("value",)  # positional pattern matching on nodes
     value: Any
+    line: int
+
+    def __init__(self, value: Any, line: int = 0) -> None:
+        self.value = value
+        self.line = line
+
+    def __repr__(self) -> str:
+        return f"Literal(value={self.value!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.value == other.value
 
 
-@dataclass
 class Unary(Expr):
+    __slots__ = ("operator", "right")
+    __match_args__ = ("operator", "right")  # positional pattern matching on nodes
     operator: Token
     right: Expr
 
+    def __init__(self, operator: Token, right: Expr) -> None:
+        self.operator = operator
+        self.right = right
+
+    def __repr__(self) -> str:
+        return f"Unary(operator={self.operator!r}, right={self.right!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.operator, self.right) == (other.operator, other.right)
+
 
-@dataclass
 class Conditional(Expr):
+    __slots__ = ("condition", "then_branch", "else_branch")
+    __match_args__ = ("condition", "then_branch", "else_branch")  # positional pattern matching on nodes
     condition: Expr
     then_branch: Expr
     else_branch: Expr
+
+    def __init__(self, condition: Expr, then_branch: Expr, else_branch: Expr) -> None:
+        self.condition = condition
+        self.then_branch = then_branch
+        self.else_branch = else_branch
+
+    def __repr__(self) -> str:
+        return f"Conditional(condition={self.condition!r}, then_branch={self.then_branch!r}, else_branch={self.else_branch!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.condition, self.then_branch, self.else_branch) == (other.condition, other.then_branch, other.else_branch)
+
+
+class Variable(Expr):
+    __slots__ = ("name",)
+    __match_args__ = ("name",)  # positional pattern matching on nodes
+    name: Token
+
+    def __init__(self, name: Token) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Variable(name={self.name!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.name == other.name
+
+
+class Error(Expr):
+    __slots__ = ("token", "partial")
+    __match_args__ = ("token", "partial")  # positional pattern matching on nodes
+    token: Token
+    partial: Expr
+
+    def __init__(self, token: Token, partial: Expr) -> None:
+        self.token = token
+        self.partial = partial
+
+    def __repr__(self) -> str:
+        return f"Error(token={self.token!r}, partial={self.partial!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.token, self.partial) == (other.token, other.partial)
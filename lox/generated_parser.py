@@ -0,0 +1,182 @@
+# generated by python -m lox.tools parser_gen out of assets/lox.gram, regenerate it instead of editing
+from .tokens import TokenType as TT
+from .expressions import Expr
+from .parser import Parser, ParseError
+
+
+EQUALITY_1 = frozenset((TT.BANG_EQUAL, TT.EQUAL_EQUAL))  # "!=" | "=="
+COMPARISON_1 = frozenset((TT.GREATER, TT.GREATER_EQUAL, TT.LESS, TT.LESS_EQUAL))  # ">" | ">=" | "<" | "<="
+TERM_1 = frozenset((TT.MINUS, TT.PLUS))  # "-" | "+"
+FACTOR_1 = frozenset((TT.SLASH, TT.STAR))  # "/" | "*"
+UNARY_1 = frozenset((TT.BANG, TT.MINUS))  # "!" | "-"
+PRIMARY_1 = frozenset((TT.NUMBER, TT.STRING))  # NUMBER | STRING
+
+
+class GeneratedParser(Parser):
+    """Recursive descent parser generated from the grammar, a drop-in for Parser"""
+
+    def expression(self) -> Expr:
+        return self.conditional()
+
+    def conditional(self) -> Expr:
+        expr = self.equality()
+        if self.current_token.token_type is TT.QUESTION:
+            self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            try:
+                then_branch = self.expression()
+            except ParseError as err:
+                err.partial = self.factory.conditional(expr, err.partial, self.factory.error(err.token, None))
+                raise
+            try:
+                self.consume(TT.COLON, "Expect ':' after then branch of conditional expression.")
+                else_branch = self.conditional()
+            except ParseError as err:
+                err.partial = self.factory.conditional(expr, then_branch, err.partial)
+                raise
+            expr = self.factory.conditional(expr, then_branch, else_branch)
+        return expr
+
+    def equality(self) -> Expr:
+        expr = self.comparison()
+        while self.current_token.token_type in EQUALITY_1:
+            operator = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            try:
+                right = self.comparison()
+            except ParseError as err:
+                err.partial = self.factory.binary(expr, operator, err.partial)
+                raise
+            expr = self.factory.binary(expr, operator, right)
+        return expr
+
+    def comparison(self) -> Expr:
+        expr = self.term()
+        while self.current_token.token_type in COMPARISON_1:
+            operator = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            try:
+                right = self.term()
+            except ParseError as err:
+                err.partial = self.factory.binary(expr, operator, err.partial)
+                raise
+            expr = self.factory.binary(expr, operator, right)
+        return expr
+
+    def term(self) -> Expr:
+        expr = self.factor()
+        while self.current_token.token_type in TERM_1:
+            operator = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            try:
+                right = self.factor()
+            except ParseError as err:
+                err.partial = self.factory.binary(expr, operator, err.partial)
+                raise
+            expr = self.factory.binary(expr, operator, right)
+        return expr
+
+    def factor(self) -> Expr:
+        expr = self.unary()
+        while self.current_token.token_type in FACTOR_1:
+            operator = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            try:
+                right = self.unary()
+            except ParseError as err:
+                err.partial = self.factory.binary(expr, operator, err.partial)
+                raise
+            expr = self.factory.binary(expr, operator, right)
+        return expr
+
+    def unary(self) -> Expr:
+        token_type = self.current_token.token_type
+        if token_type in UNARY_1:
+            operator = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            try:
+                right = self.unary()
+            except ParseError as err:
+                err.partial = self.factory.unary(operator, err.partial)
+                raise
+            return self.factory.unary(operator, right)
+        return self.primary()
+
+    def primary(self) -> Expr:
+        token_type = self.current_token.token_type
+        if token_type in PRIMARY_1:
+            value = self.current_token.literal
+            self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            return self.factory.literal(value)
+        if token_type is TT.TRUE:
+            self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            return self.factory.literal(True)
+        if token_type is TT.FALSE:
+            self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            return self.factory.literal(False)
+        if token_type is TT.NIL:
+            self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            return self.factory.literal(None)
+        if token_type is TT.IDENTIFIER:
+            name = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            return self.factory.variable(name)
+        if token_type is TT.LEFT_PAREN:
+            self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            try:
+                expression = self.expression()
+            except ParseError as err:
+                err.partial = self.factory.grouping(err.partial)
+                raise
+            try:
+                self.consume(TT.RIGHT_PAREN, "Expect ')' after expression.")
+            except ParseError as err:
+                err.partial = self.factory.grouping(self.factory.error(err.token, expression))
+                raise
+            return self.factory.grouping(expression)
+        if token_type in EQUALITY_1:
+            token = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            self.error(token, "Missing left-hand operand for binary operator.")
+            try:
+                partial = self.equality()
+            except ParseError as err:
+                err.partial = self.factory.error(token, err.partial)
+                raise
+            return self.factory.error(token, partial)
+        if token_type in COMPARISON_1:
+            token = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            self.error(token, "Missing left-hand operand for binary operator.")
+            try:
+                partial = self.comparison()
+            except ParseError as err:
+                err.partial = self.factory.error(token, err.partial)
+                raise
+            return self.factory.error(token, partial)
+        if token_type is TT.PLUS:
+            token = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            self.error(token, "Missing left-hand operand for binary operator.")
+            try:
+                partial = self.term()
+            except ParseError as err:
+                err.partial = self.factory.error(token, err.partial)
+                raise
+            return self.factory.error(token, partial)
+        if token_type in FACTOR_1:
+            token = self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
+            self.error(token, "Missing left-hand operand for binary operator.")
+            try:
+                partial = self.factor()
+            except ParseError as err:
+                err.partial = self.factory.error(token, err.partial)
+                raise
+            return self.factory.error(token, partial)
+        raise self.error(self.peek(), "Expect expression.")
@@ -0,0 +1,295 @@
+from bisect import bisect_left, bisect_right
+from typing import Callable
+from .tokens import TokenType, Token, KEYWORDS, BINARY_LEVELS
+from .expressions import Expr
+from .regex_scanner import TOKEN_PATTERN, OPERATORS
+from .parser import Parser, ParseError
+from .diagnostics import Reporter, default_reporter
+
+
+TOKEN_KINDS = frozenset(("OPERATOR", "IDENTIFIER", "NUMBER", "STRING"))
+LONG_CHAIN = 16  # operators in a chain worth keeping its prefixes for, shorter ones are quicker to parse again
+MAX_DAMAGE = 1024  # edits tracked before parse results are dropped altogether
+
+
+class IncrementalDocument:
+    """Source text kept scanned across edits - an edit re-lexes only from the last token it can't affect up to the
+       first token after it that lines up with an old one, as the lexer has no state at token boundaries and scanning
+       from there on would just reproduce the old tokens. Tokens are the same as RegexScanner's.
+
+       Token starts live in a gap buffer - those before the gap are offsets from the start of the text, those after it
+       from its end, so only entries between two consecutive edits are ever rewritten. Edits changing the number of
+       lines renumber the tokens after them in place, which updates trees parsed earlier as well, as they share them."""
+
+    def __init__(self, text: str = "") -> None:
+        self.text = text
+        self.tokens: list[Token] = []
+        self.starts: list[int] = []
+        self.gap = 0  # index of the first token whose start is stored relative to the end of text
+        self.lexer_errors: list[tuple[int, int, str]] = []  # (offset, line, message) in source order
+
+        # results of earlier parses by id of the token they start at and rule, (tree, tokens spanned, revision) each,
+        # ids of tokens an edit drops are forgotten, so those of live tokens are never reused for other ones
+        self.memo: dict[int, dict[str, tuple[Expr, int, int]]] = {}
+        self.prefixes: dict[int, dict[str, tuple[list[int], list[Expr], int]]] = {}
+
+        # token indices every edit since the oldest result took place at, along with revisions of the text they made
+        self.revision = 0
+        self.damage: list[int] = []
+        self.damage_revisions: list[int] = []
+
+        self.tokens, self.starts, self.lexer_errors, _, _ = self.relex(0, 1, 0, 0, None)
+        self.gap = len(self.tokens)
+
+    def start_of(self, index: int) -> int:
+        start = self.starts[index]
+        return start if index < self.gap else start + len(self.text)
+
+    def token_index(self, offset: int) -> int:
+        """Index of the first token starting at or after offset"""
+        index = bisect_left(self.starts, offset, 0, self.gap)
+        if index < self.gap:
+            return index
+        return bisect_left(self.starts, offset - len(self.text), self.gap, len(self.starts))
+
+    def move_gap(self, index: int) -> None:
+        starts, length = self.starts, len(self.text)
+        for i in range(index, self.gap):
+            starts[i] -= length
+        for i in range(self.gap, index):
+            starts[i] += length
+        self.gap = index
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> None:
+        """Replaces deleted characters at offset with inserted text"""
+        text = self.text
+        assert 0 <= offset and offset + deleted <= len(text), "Edit out of text bounds"
+
+        # the lexer looks at most 2 characters past a lexeme, tokens ending closer to the edit may change with it -
+        # scanning restarts at the end of the last token that can't, which is where the old scan's next match began
+        first = self.token_index(offset)
+        while first > 0 and self.start_of(first - 1) + len(self.tokens[first - 1].lexeme) + 2 > offset:
+            first -= 1
+        if first > 0:
+            token = self.tokens[first - 1]
+            restart, line = self.start_of(first - 1) + len(token.lexeme), token.line
+        else:
+            restart, line = 0, 1
+
+        self.move_gap(first)
+        delta = len(inserted) - deleted
+        self.text = text[:offset] + inserted + text[offset + deleted:]
+        old_length = len(text)
+
+        def old_token_at(position: int) -> int | None:
+            # starts from first on are relative to the end of the old text now
+            index = bisect_left(self.starts, position - old_length, first, len(self.starts))
+            return index if index < len(self.starts) and self.starts[index] == position - old_length else None
+
+        tokens, starts, errors, resync, line_delta = self.relex(restart, line, offset + len(inserted), delta, old_token_at)
+        end = len(self.tokens) if resync is None else resync
+
+        for token in self.tokens[first:end]:
+            self.memo.pop(id(token), None)
+            self.prefixes.pop(id(token), None)
+        self.mark_damage(first, end, len(tokens))
+
+        self.tokens[first:end] = tokens
+        self.starts[first:end] = starts
+        self.gap = first + len(tokens)
+        if line_delta:
+            for token in self.tokens[self.gap:]:
+                token.line += line_delta
+
+        old_end = old_length if resync is None else self.starts[self.gap] + old_length
+        self.lexer_errors = (
+            [error for error in self.lexer_errors if error[0] < restart]
+            + errors
+            + [(o + delta, line + line_delta, message) for o, line, message in self.lexer_errors if o >= old_end]
+        )
+
+    def mark_damage(self, first: int, end: int, inserted: int) -> None:
+        """Records that tokens first to end got replaced with inserted new ones"""
+        self.revision += 1
+        damage, revisions = self.damage, self.damage_revisions
+        low, high = bisect_left(damage, first), bisect_left(damage, end)
+        # earlier edits within the replaced tokens are covered by this one, those past them move along
+        shift = inserted - (end - first)
+        damage[low:] = [first] + [position + shift for position in damage[high:]]
+        revisions[low:] = [self.revision] + revisions[high:]
+
+        if len(damage) > MAX_DAMAGE:
+            # results of long ago are hardly reusable anymore, a single full parse is cheaper than tracking them
+            self.memo.clear()
+            self.prefixes.clear()
+            damage.clear()
+            revisions.clear()
+
+    def relex(
+        self, position: int, line: int, edit_end: int, delta: int, old_token_at: Callable[[int], int | None] | None
+    ) -> tuple[list[Token], list[int], list[tuple[int, int, str]], int | None, int]:
+        """Scans from position until a token at or past edit_end lines up with an old token (shifted by delta),
+           returns new tokens with their starts and lexer errors, index of that old token and the line shift past it"""
+        text = self.text
+        match_at = TOKEN_PATTERN.match
+        tokens: list[Token] = []
+        starts: list[int] = []
+        errors: list[tuple[int, int, str]] = []
+
+        while (m := match_at(text, position)) is not None:
+            position = m.end()
+            kind = m.lastgroup
+            start = m.start(kind)
+
+            if kind in TOKEN_KINDS:
+                lexeme = m[kind]
+                if kind == "OPERATOR":
+                    token = Token(OPERATORS[lexeme], lexeme, None, line)
+                elif kind == "IDENTIFIER":
+                    token = Token(KEYWORDS.get(lexeme, TokenType.IDENTIFIER), lexeme, lexeme, line)
+                elif kind == "NUMBER":
+                    token = Token(TokenType.NUMBER, lexeme, float(lexeme), line)
+                else:
+                    line += lexeme.count("\n")
+                    token = Token(TokenType.STRING, lexeme, lexeme[1:-1], line)
+
+                if start >= edit_end and old_token_at is not None:
+                    resync = old_token_at(start - delta)
+                    if resync is not None:
+                        return tokens, starts, errors, resync, token.line - self.tokens[resync].line
+
+                tokens.append(token)
+                starts.append(start)
+            elif kind == "NEWLINE" or kind == "C_COMMENT":
+                line += text.count("\n", start, position)
+            elif kind == "LINE_COMMENT":
+                pass
+            elif kind == "UNTERMINATED_C_COMMENT":
+                line += text.count("\n", start, position)
+                errors.append((start, line, "Unterminated C-style comment."))
+            elif kind == "UNTERMINATED_STRING":
+                line += text.count("\n", start, position)
+                errors.append((start, line, "Unterminated string."))
+            else:
+                errors.append((start, line, "Unexpected character."))
+
+        tokens.append(Token(TokenType.EOF, "", None, line))
+        starts.append(len(text))
+        return tokens, starts, errors, None, 0
+
+    def parse(self, reporter: Reporter | None = None) -> Expr | None:
+        """Parses the current text, reusing subtrees of earlier parses edits have left alone.
+           Errors are reported just like RegexScanner and Parser would - lexer errors first."""
+        reporter = reporter or default_reporter()
+        for _, line, message in self.lexer_errors:
+            reporter.lexer_error(line, message)
+
+        return IncrementalParser(self, reporter).parse()
+
+    def undamaged(self, start: int, revision: int) -> int:
+        """How many tokens from start on no edit since revision took place at"""
+        damage, revisions = self.damage, self.damage_revisions
+        for i in range(bisect_right(damage, start), len(damage)):
+            if revisions[i] > revision:
+                return damage[i] - start
+        return len(self.tokens) - start
+
+
+class IncrementalParser(Parser):
+    """Parser memoizing operator chains and groupings in an IncrementalDocument by the token they start at, so later
+       parses of the edited document can take them over. A result is reusable as long as no edit took place within
+       its tokens or at the token its rule looked ahead at - rule results depend on nothing else. Results with parse
+       errors in them are never kept, so errors get reported again.
+
+       Every rule result above an edit changes with it, so within a left-leaning operator chain spanning an edit
+       the longest unchanged prefix of the chain is reused and the rest takes a memo lookup per operand."""
+
+    def __init__(self, document: IncrementalDocument, reporter: Reporter | None = None) -> None:
+        super().__init__(document.tokens, reporter=reporter)
+        self.document = document
+        self.token_list = document.tokens
+        self.position = 0
+        self.memo, self.prefixes = document.memo, document.prefixes
+        self.revision = document.revision
+
+    def advance(self) -> Token:
+        if not self.is_at_end():
+            self.previous_token = self.current_token
+            self.position += 1
+            self.current_token = self.token_list[self.position]
+        return self.previous()
+
+    def jump(self, position: int) -> None:
+        self.previous_token = self.token_list[position - 1]
+        self.current_token = self.token_list[position]
+        self.position = position
+
+    def recall(self, rule: str, start: int) -> Expr | None:
+        """Takes over a subtree of an earlier parse if it's still valid, moving past its tokens"""
+        entry = self.memo.get(id(self.current_token), {}).get(rule)
+        if entry is None:
+            return None
+        node, length, revision = entry
+        if revision != self.revision and length >= self.document.undamaged(start, revision):
+            return None
+        self.jump(start + length)
+        return node
+
+    def remember(self, rule: str, start: int, node: Expr) -> None:
+        self.memo.setdefault(id(self.token_list[start]), {})[rule] = node, self.position - start, self.revision
+
+    def binary_left_assoc(self, higher_precedence_rule: Callable[[], Expr], level: int) -> Expr:
+        rule = higher_precedence_rule.__name__  # chains of every level are told apart by their operand rule
+        start = self.position
+        expr = self.recall(rule, start)
+        if expr is not None:
+            return expr
+
+        errors = self.errors
+        ends: list[int] = []  # offsets of operators following every error-free prefix of the chain from its start
+        nodes: list[Expr] = []
+
+        old_prefixes = self.prefixes.get(id(self.current_token), {}).get(rule)
+        if old_prefixes is not None:
+            old_ends, old_nodes, revision = old_prefixes
+            reusable = bisect_left(old_ends, self.document.undamaged(start, revision))
+            if reusable:
+                ends, nodes = old_ends[:reusable], old_nodes[:reusable]
+        if ends:
+            expr = nodes[-1]
+            self.jump(start + ends[-1])
+        else:
+            expr = higher_precedence_rule()
+
+        while BINARY_LEVELS[self.current_token.token_type] == level:
+            if self.errors == errors and (not ends or start + ends[-1] != self.position):
+                ends.append(self.position - start)
+                nodes.append(expr)
+            operator = self.advance()
+            try:
+                right_most = higher_precedence_rule()
+            except ParseError as err:
+                err.partial = self.factory.binary(expr, operator, err.partial)
+                raise
+            expr = self.factory.binary(expr, operator, right_most)
+
+        if len(ends) >= LONG_CHAIN:
+            self.prefixes.setdefault(id(self.token_list[start]), {})[rule] = ends, nodes, self.revision
+        if self.errors == errors and ends:  # a lone operand is already memoized on its own
+            self.remember(rule, start, expr)
+        return expr
+
+    def primary(self) -> Expr:
+        if self.peek().token_type != TokenType.LEFT_PAREN:
+            return super().primary()
+
+        start = self.position
+        expr = self.recall("grouping", start)
+        if expr is not None:
+            return expr
+
+        errors = self.errors
+        expr = super().primary()
+        if self.errors == errors:
+            self.remember("grouping", start, expr)
+        return expr
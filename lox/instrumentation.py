@@ -0,0 +1,88 @@
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterable, Iterator, TextIO
+from .tokens import Token
+
+
+@dataclass(slots=True)
+class PhaseStats:
+    name: str
+    seconds: float = 0.0
+    tokens: int | None = None
+    nodes: int | None = None
+    depth: int | None = None
+    peak_bytes: int | None = None  # only known while tracing memory allocations
+
+
+def counted(tokens: Iterable[Token], stats: PhaseStats) -> Iterator[Token]:
+    """Counts tokens of a lazy stream into stats as they're pulled"""
+    stats.tokens = 0
+    for token in tokens:
+        stats.tokens += 1
+        yield token
+
+
+class Instrumentation:
+    """Opt-in measurements of the phases of Session.run - scan, parse, optimize, compile, evaluate or print.
+       Sessions without one skip all of it but a None check per phase. Hooks are called with the stats of all phases
+       of every run once it's over, a lazy scanner does its work (and has its tokens counted) during parsing.
+
+       Tracing memory allocations makes runs a few times slower, and profiling even more so."""
+
+    def __init__(
+        self,
+        trace_memory: bool = False,  # peak memory allocated in every phase, with tracemalloc
+        profile: bool = False,  # collect a cProfile profile of all instrumented runs
+        hooks: Iterable[Callable[[list[PhaseStats]], None]] = (),
+    ) -> None:
+        self.trace_memory = trace_memory
+        self.profiler = cProfile.Profile() if profile else None
+        self.hooks = list(hooks)
+        self.runs: list[list[PhaseStats]] = []
+
+    @contextmanager
+    def run(self) -> Iterator[list[PhaseStats]]:
+        phases: list[PhaseStats] = []
+        self.runs.append(phases)
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            yield phases
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+            if started_tracing:
+                tracemalloc.stop()
+            for hook in self.hooks:
+                hook(phases)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseStats]:
+        """Measures a phase of the current run, the stats it yields are filled in with counts afterwards"""
+        stats = PhaseStats(name)
+        self.runs[-1].append(stats)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds = time.perf_counter() - start
+            if self.trace_memory:
+                stats.peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+
+    def report(self) -> dict:
+        """Machine-readable stats of all runs so far"""
+        return {"runs": [[asdict(stats) for stats in phases] for phases in self.runs]}
+
+    def write_report(self, file: TextIO) -> None:
+        json.dump(self.report(), file, indent=2)
+        file.write("\n")
@@ -0,0 +1,65 @@
+import math
+from typing import Any
+from .tokens import Token
+from .expressions import Expr, Binary, Grouping, Literal, Unary, Conditional, Variable, Error
+
+
+class NodeFactory:
+    """Node construction used by Parser, every call allocates a fresh node"""
+    binary = Binary
+    grouping = Grouping
+    literal = Literal
+    unary = Unary
+    conditional = Conditional
+    variable = Variable
+    error = Error
+
+
+class InterningNodeFactory(NodeFactory):
+    """Hash-consing node factory - structurally identical subtrees are built once and shared.
+       Keys hold the node type, operator token type and line and identity of (already interned) children, so a lookup
+       is constant time regardless of subtree size. The line keeps runtime errors of every occurrence pointing at its
+       own line, subtrees repeated on one line are shared all the same. Nodes are the ordinary mutable ones, shared
+       nodes must be treated as immutable, i.e. passes rewriting the tree have to build new nodes. Error nodes aren't
+       interned, each one stands for a syntax error reported on its own."""
+
+    def __init__(self) -> None:
+        self.nodes: dict[tuple, Expr] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def intern(self, key: tuple, node_type: type[Expr], *fields: Any) -> Expr:
+        node = self.nodes.get(key)
+        if node is None:
+            self.misses += 1
+            node = self.nodes[key] = node_type(*fields)
+        else:
+            self.hits += 1
+        return node
+
+    def binary(self, left: Expr, operator: Token, right: Expr) -> Expr:
+        key = (Binary, operator.token_type, operator.line, id(left), id(right))
+        return self.intern(key, Binary, left, operator, right)
+
+    def grouping(self, expression: Expr) -> Expr:
+        return self.intern((Grouping, id(expression)), Grouping, expression)
+
+    def literal(self, value: Any) -> Expr:
+        # type is part of the key since True == 1.0, and so is the sign since 0.0 == -0.0
+        sign = math.copysign(1.0, value) if type(value) is float else None
+        return self.intern((Literal, type(value), value, sign), Literal, value)
+
+    def unary(self, operator: Token, right: Expr) -> Expr:
+        return self.intern((Unary, operator.token_type, operator.line, id(right)), Unary, operator, right)
+
+    def conditional(self, condition: Expr, then_branch: Expr, else_branch: Expr) -> Expr:
+        key = (Conditional, id(condition), id(then_branch), id(else_branch))
+        return self.intern(key, Conditional, condition, then_branch, else_branch)
+
+    def variable(self, name: Token) -> Expr:
+        return self.intern((Variable, name.lexeme, name.line), Variable, name)
@@ -0,0 +1,275 @@
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+from .tokens import Token, TokenType as TT
+from .expressions import Expr, Binary, Grouping, Literal, Unary, Conditional, Variable, Error
+
+
+NO_VARIABLES: Mapping[str, Any] = MappingProxyType({})
+
+
+class LoxRuntimeError(RuntimeError):
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(message)
+        self.line = line
+
+
+def is_truthy(value: Any) -> bool:
+    """Lox follows Ruby's rule: false and nil are falsey, everything else is truthy"""
+    return value is not None and value is not False
+
+
+def is_equal(left: Any, right: Any) -> bool:
+    # type check first, otherwise Python would happily tell us that true == 1
+    return type(left) is type(right) and left == right
+
+
+def stringify(value: Any) -> str:
+    match value:
+        case None:
+            return "nil"
+        case bool():
+            return "true" if value else "false"
+        case float():
+            text = str(value)
+            return text[:-2] if text.endswith(".0") else text
+        case _:
+            return str(value)
+
+
+def check_number_operand(operator: Token, operand: Any) -> None:
+    if type(operand) is not float:
+        raise LoxRuntimeError(operator.line, "Operand must be a number.")
+
+
+def check_number_operands(operator: Token, left: Any, right: Any) -> None:
+    if type(left) is not float or type(right) is not float:
+        raise LoxRuntimeError(operator.line, "Operands must be numbers.")
+
+
+def check_divisor(operator: Token, divisor: float) -> None:
+    if divisor == 0:
+        raise LoxRuntimeError(operator.line, "Division by zero.")
+
+
+def undefined_variable(name: Token) -> LoxRuntimeError:
+    return LoxRuntimeError(name.line, f"Undefined variable '{name.lexeme}'.")
+
+
+def syntax_error(token: Token) -> LoxRuntimeError:
+    """Error of evaluating an error node, partial trees of recovery mode can't be run"""
+    return LoxRuntimeError(token.line, "Can't evaluate an expression with a syntax error.")
+
+
+def expression_line(expr: Expr) -> int:
+    """Line of the outermost token of a tree, found without recursion - where errors about the whole of it point"""
+    while True:
+        match expr:
+            case Binary(_, operator, _) | Unary(operator, _):
+                return operator.line
+            case Variable(name) | Error(name, _):
+                return name.line
+            case Grouping(expression):
+                expr = expression
+            case Conditional(condition, _, _):
+                expr = condition
+            case _:
+                return 1  # a literal, which carries no token
+
+
+def evaluate(expr: Expr, environment: Mapping[str, Any] = NO_VARIABLES) -> Any:
+    """Tree-walking interpreter, dispatches on node and operator type at every visit"""
+    match expr:
+        case Literal(value):
+            return value
+        case Variable(name):
+            try:
+                return environment[name.lexeme]
+            except KeyError:
+                raise undefined_variable(name) from None
+        case Grouping(expression):
+            return evaluate(expression, environment)
+        case Unary(operator, right):
+            right = evaluate(right, environment)
+            match operator.token_type:
+                case TT.MINUS:
+                    check_number_operand(operator, right)
+                    return -right
+                case TT.BANG:
+                    return not is_truthy(right)
+        case Binary(left, operator, right):
+            left = evaluate(left, environment)
+            right = evaluate(right, environment)
+            match operator.token_type:
+                case TT.PLUS:
+                    if type(left) is float and type(right) is float or type(left) is str and type(right) is str:
+                        return left + right
+                    raise LoxRuntimeError(operator.line, "Operands must be two numbers or two strings.")
+                case TT.MINUS:
+                    check_number_operands(operator, left, right)
+                    return left - right
+                case TT.STAR:
+                    check_number_operands(operator, left, right)
+                    return left * right
+                case TT.SLASH:
+                    check_number_operands(operator, left, right)
+                    check_divisor(operator, right)
+                    return left / right
+                case TT.GREATER:
+                    check_number_operands(operator, left, right)
+                    return left > right
+                case TT.GREATER_EQUAL:
+                    check_number_operands(operator, left, right)
+                    return left >= right
+                case TT.LESS:
+                    check_number_operands(operator, left, right)
+                    return left < right
+                case TT.LESS_EQUAL:
+                    check_number_operands(operator, left, right)
+                    return left <= right
+                case TT.EQUAL_EQUAL:
+                    return is_equal(left, right)
+                case TT.BANG_EQUAL:
+                    return not is_equal(left, right)
+        case Conditional(condition, then_branch, else_branch):
+            if is_truthy(evaluate(condition, environment)):
+                return evaluate(then_branch, environment)
+            return evaluate(else_branch, environment)
+        case Error(token, _):
+            raise syntax_error(token)
+
+    raise NotImplementedError(f"Non-exhaustive match in interpreter failed on expression: {type(expr)}")
+
+
+def compile_expr(expr: Expr, environment: Mapping[str, Any] = NO_VARIABLES) -> Callable[[], Any]:
+    """Closure compilation - walks the tree once and returns a nested closure specialized for every node and operator,
+       so evaluating the expression again and again pays no dispatch at all. Variables are looked up in the environment
+       on every call, so one compiled expression can be run against a mapping updated in between."""
+    match expr:
+        case Literal(value):
+            return lambda: value
+        case Variable(name):
+            lexeme = name.lexeme
+
+            def variable() -> Any:
+                try:
+                    return environment[lexeme]
+                except KeyError:
+                    raise undefined_variable(name) from None
+            return variable
+        case Grouping(expression):
+            return compile_expr(expression, environment)  # groupings only matter to the parser
+        case Unary(operator, right):
+            return compile_unary(operator, compile_expr(right, environment))
+        case Binary(left, operator, right):
+            return compile_binary(compile_expr(left, environment), operator, compile_expr(right, environment))
+        case Conditional(condition, then_branch, else_branch):
+            condition, then_branch, else_branch = (
+                compile_expr(branch, environment) for branch in (condition, then_branch, else_branch)
+            )
+
+            def conditional() -> Any:
+                value = condition()
+                return then_branch() if value is not None and value is not False else else_branch()
+            return conditional
+        case Error(token, _):
+            def error() -> Any:
+                raise syntax_error(token)
+            return error
+
+    raise NotImplementedError(f"Non-exhaustive match in closure compiler failed on expression: {type(expr)}")
+
+
+def evaluate_compiled(expr: Expr, environment: Mapping[str, Any] = NO_VARIABLES) -> Any:
+    return compile_expr(expr, environment)()
+
+
+def compile_unary(operator: Token, right: Callable[[], Any]) -> Callable[[], Any]:
+    match operator.token_type:
+        case TT.MINUS:
+            def negate() -> Any:
+                value = right()
+                if type(value) is not float:
+                    raise LoxRuntimeError(operator.line, "Operand must be a number.")
+                return -value
+            return negate
+        case TT.BANG:
+            def bang() -> Any:
+                value = right()
+                return value is None or value is False
+            return bang
+
+    raise NotImplementedError(f"Unary operator {operator.token_type.name} can't be compiled")
+
+
+def compile_binary(left: Callable[[], Any], operator: Token, right: Callable[[], Any]) -> Callable[[], Any]:
+    match operator.token_type:
+        case TT.PLUS:
+            def add() -> Any:
+                a, b = left(), right()
+                if type(a) is float and type(b) is float or type(a) is str and type(b) is str:
+                    return a + b
+                raise LoxRuntimeError(operator.line, "Operands must be two numbers or two strings.")
+            return add
+        case TT.EQUAL_EQUAL:
+            def equal() -> Any:
+                a, b = left(), right()
+                return type(a) is type(b) and a == b
+            return equal
+        case TT.BANG_EQUAL:
+            def not_equal() -> Any:
+                a, b = left(), right()
+                return type(a) is not type(b) or a != b
+            return not_equal
+        case TT.SLASH:
+            def divide() -> Any:
+                a, b = left(), right()
+                if type(a) is not float or type(b) is not float:
+                    raise LoxRuntimeError(operator.line, "Operands must be numbers.")
+                if b == 0:
+                    raise LoxRuntimeError(operator.line, "Division by zero.")
+                return a / b
+            return divide
+        case TT.MINUS:
+            def subtract() -> Any:
+                a, b = left(), right()
+                if type(a) is not float or type(b) is not float:
+                    raise LoxRuntimeError(operator.line, "Operands must be numbers.")
+                return a - b
+            return subtract
+        case TT.STAR:
+            def multiply() -> Any:
+                a, b = left(), right()
+                if type(a) is not float or type(b) is not float:
+                    raise LoxRuntimeError(operator.line, "Operands must be numbers.")
+                return a * b
+            return multiply
+        case TT.GREATER:
+            def greater() -> Any:
+                a, b = left(), right()
+                if type(a) is not float or type(b) is not float:
+                    raise LoxRuntimeError(operator.line, "Operands must be numbers.")
+                return a > b
+            return greater
+        case TT.GREATER_EQUAL:
+            def greater_equal() -> Any:
+                a, b = left(), right()
+                if type(a) is not float or type(b) is not float:
+                    raise LoxRuntimeError(operator.line, "Operands must be numbers.")
+                return a >= b
+            return greater_equal
+        case TT.LESS:
+            def less() -> Any:
+                a, b = left(), right()
+                if type(a) is not float or type(b) is not float:
+                    raise LoxRuntimeError(operator.line, "Operands must be numbers.")
+                return a < b
+            return less
+        case TT.LESS_EQUAL:
+            def less_equal() -> Any:
+                a, b = left(), right()
+                if type(a) is not float or type(b) is not float:
+                    raise LoxRuntimeError(operator.line, "Operands must be numbers.")
+                return a <= b
+            return less_equal
+
+    raise NotImplementedError(f"Binary operator {operator.token_type.name} can't be compiled")
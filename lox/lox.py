@@ -1,56 +1,85 @@
 import sys
-from .tokens import Token, TokenType
-from .scanner import Scanner
-from .parser import Parser
-from .ast_printer import pprint_expr
+from typing import TYPE_CHECKING, TextIO
+from .tokens import Token
+from .expressions import Expr
+from .cache import AstCache
+from .session import Session, SCANNER_ENGINES, PARSER_ENGINES, EVALUATORS
 
+if TYPE_CHECKING:
+    from .interpreter import LoxRuntimeError
+    from .incremental import IncrementalDocument
 
-class Lox:
+
+class SessionAttribute:
+    """Attribute of the Lox class read from and written to its default session"""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, lox: "LoxMeta", owner: type) -> object:
+        return getattr(lox.default_session, self.name)
+
+    def __set__(self, lox: "LoxMeta", value: object) -> None:
+        setattr(lox.default_session, self.name, value)
+
+
+class LoxMeta(type):
     # shamelessly using shared metaclass fields to store state without instance initialization
     # yes I do know what I'm doing, ask me about it in the interview
-    had_error = False
+    # (the state itself has moved to a Session, Lox.had_error and friends are just its most convenient handles)
+    had_error = SessionAttribute()
+    had_runtime_error = SessionAttribute()
+    scanner_engine = SessionAttribute()
+    parser_engine = SessionAttribute()
+    evaluator = SessionAttribute()
+    optimize = SessionAttribute()
+    disassemble = SessionAttribute()
+    ast_cache = SessionAttribute()
+    instrumentation = SessionAttribute()
+    memory_map = SessionAttribute()
+
+
+class Lox(metaclass=LoxMeta):
+    """Static API of the interpreter, a thin wrapper running everything in a single default session of the process.
+       Embedders running code from many threads at once should create a Session for each of them instead."""
+    default_session = Session(ast_cache=AstCache())
 
     @staticmethod
-    def lexer_error(line: int, message: str) -> None:
-        Lox.report(line, "", message)
+    def lexer_error(line: int, message: str, column: int | None = None) -> None:
+        Lox.default_session.lexer_error(line, message, column)
 
     @staticmethod
     def parser_error(token: Token, message: str) -> None:
-        if token.token_type == TokenType.EOF:
-            Lox.report(token.line, "at end", message)
-        else:
-            Lox.report(token.line, f"at '{token.lexeme}'", message)
+        Lox.default_session.parser_error(token, message)
 
     @staticmethod
-    def report(line: int, where: str, message: str) -> None:
-        print(f"[line {line}] Error {where}: {message}")
-        Lox.had_error = True
+    def runtime_error(error: "LoxRuntimeError") -> None:
+        Lox.default_session.runtime_error(error)
 
     @staticmethod
-    def run(source: str) -> None:
-        scanner = Scanner(source)
-        tokens = scanner.scan_tokens()
-
-        parser = Parser(tokens)
-        expression = parser.parse()
+    def report(line: int, where: str, message: str, column: int | None = None) -> None:
+        Lox.default_session.report(line, where, message, column)
 
-        if Lox.had_error:
-            return
+    @staticmethod
+    def run(source: "str | bytes | TextIO | IncrementalDocument", digest: bytes | None = None, script_path: str | None = None) -> None:
+        Lox.default_session.run(source, digest, script_path)
 
-        print(pprint_expr(expression))
-        # REPL input: -123 * (45.67 + 8.901)
-        # REPL output: (* (- 123.0) (group (+ 45.67 8.901)))
+    @staticmethod
+    def parse(source: "str | bytes | TextIO | IncrementalDocument") -> Expr | None:
+        return Lox.default_session.parse(source)
 
-        # REPL input: 1 == 2 ? 45 : -123 * (45.67 + 8.901)
-        # REPL output: (if (== 1.0 2.0) then 45.0 else (* (- 123.0) (group (+ 45.67 8.901))))
+    @staticmethod
+    def interpret(expression: Expr) -> None:
+        Lox.default_session.interpret(expression)
 
     @staticmethod
     def run_file(file_path: str) -> None:
-        with open(file_path, "r") as file:
-            Lox.run(file.read())
+        Lox.default_session.run_file(file_path)
 
         if Lox.had_error:
             sys.exit(65)
+        if Lox.had_runtime_error:
+            sys.exit(70)
 
     @staticmethod
     def run_prompt() -> None:
@@ -58,5 +87,4 @@ class Lox:
             line = input("> ")
             if not line:
                 break
-            Lox.run(line)
-            Lox.had_error = False
+            Lox.run(line)  # which starts without the errors of the line before
@@ -0,0 +1,167 @@
+import mmap
+import re
+from array import array
+from bisect import bisect_left
+from .tokens import TokenType, Token, KEYWORDS
+from .regex_scanner import TOKEN_PATTERN as TEXT_PATTERN, OPERATORS
+from .diagnostics import Reporter, default_reporter
+
+
+# RegexScanner's pattern over bytes, without lines to track even newlines are just blanks - ASCII lexemes (all there
+# is to most scripts) are matched here, runs of word characters and dots with any byte past ASCII in them are decoded
+# and scanned as text, so unicode identifiers and errors come out the same as with the other engines. Numbers and
+# identifiers running into such bytes are left to the text path, and dots are part of the runs, as a number may go
+# on past the end of a run of word characters (e.g. the 12.5 of €12.5)
+BYTES_PATTERN = re.compile(
+    rb"""
+    [ \t\r\n]*+
+    (?:
+      (?P<NUMBER>\d++(?:\.\d++)?+)(?![\x80-\xff]|\.[\x80-\xff])
+    | (?P<IDENTIFIER>[A-Za-z_][A-Za-z0-9]*+)(?![\x80-\xff])
+    | (?P<LINE_COMMENT>//[^\n]*)
+    | (?P<C_COMMENT>/\*.*?\*/)
+    | (?P<UNTERMINATED_C_COMMENT>/\*.*)
+    | (?P<OPERATOR>[!=<>]=?|[(){},.\-+;*?:/])
+    | (?P<STRING>"[^"]*")
+    | (?P<UNTERMINATED_STRING>".*)
+    | (?P<TEXT>[\w.]*+[\x80-\xff][\w.\x80-\xff]*+)
+    | (?P<ERROR>.)
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+NEWLINE = re.compile(b"\n")
+
+BYTE_OPERATORS = {text.encode(): (token_type, text) for text, token_type in OPERATORS.items()}
+BYTE_KEYWORDS = {text.encode(): token_type for text, token_type in KEYWORDS.items()}
+
+
+class LineIndex:
+    """Offsets of the newlines of a source, found in a single pass over it the first time a line or column is looked
+       up - a scan only records byte offsets of tokens and most runs never report anything"""
+
+    def __init__(self, source: bytes | mmap.mmap) -> None:
+        self.source = source
+        self.newlines: array | None = None
+
+    def build(self) -> array:
+        if self.newlines is None:
+            self.newlines = array("q", [m.start() for m in NEWLINE.finditer(self.source)])
+        return self.newlines
+
+    def line(self, offset: int) -> int:
+        """Line number of the byte at offset, i.e. 1 + newlines strictly before it"""
+        return bisect_left(self.build(), offset) + 1
+
+    def column(self, offset: int) -> int:
+        """Column of the byte at offset counted in characters from 1, only a line with anything past ASCII before
+           the offset is decoded to count them"""
+        line = self.line(offset)
+        start = self.newlines[line - 2] + 1 if line > 1 else 0
+        preceding = self.source[start:offset]
+        return (offset - start if preceding.isascii() else len(preceding.decode(errors="replace"))) + 1
+
+
+class LocatedToken(Token):
+    """Token of a byte source holding the offset of its lexeme instead of a line, line and column are looked up
+       in the index of the source only when asked for (by an error report)"""
+    __slots__ = ("offset", "index")
+
+    def __init__(self, token_type: TokenType, lexeme: str, literal: object, offset: int, index: LineIndex) -> None:
+        self.token_type = token_type
+        self.lexeme = lexeme
+        self.literal = literal
+        self.offset = offset
+        self.index = index
+
+    @property
+    def line(self) -> int:
+        return self.index.line(self.offset)
+
+    @property
+    def column(self) -> int:
+        return self.index.column(self.offset)
+
+    def __reduce__(self) -> tuple:
+        # pickled as a plain token, a map of the source can't go along
+        return Token, (self.token_type, self.lexeme, self.literal, self.line)
+
+
+class MappedScanner:
+    """Drop-in replacement for Scanner over the bytes of a script, usually a memory-mapped file, the source is never
+       decoded nor copied as a whole. Tokens are located at the start of their lexemes, so a string spanning many
+       lines is reported at its first one, as are unterminated strings and comments."""
+
+    def __init__(self, source: bytes | mmap.mmap | str, reporter: Reporter | None = None) -> None:
+        self.source = source.encode() if isinstance(source, str) else source
+        self.index = LineIndex(self.source)
+        self.tokens: list[Token] = []
+        self.reporter = reporter or default_reporter()
+
+    def scan_tokens(self) -> list[Token]:
+        index = self.index
+        append = self.tokens.append
+        operators, keywords = BYTE_OPERATORS, BYTE_KEYWORDS
+        identifier, number, string = TokenType.IDENTIFIER, TokenType.NUMBER, TokenType.STRING
+
+        for m in BYTES_PATTERN.finditer(self.source):
+            kind = m.lastgroup
+
+            # lexemes end their matches (past the leading blanks), which is cheaper to go by than a group's start
+            if kind == "OPERATOR":
+                lexeme = m[kind]
+                token_type, text = operators[lexeme]
+                append(LocatedToken(token_type, text, None, m.end() - len(lexeme), index))
+            elif kind == "IDENTIFIER":
+                lexeme = m[kind]
+                text = lexeme.decode("ascii")
+                append(LocatedToken(keywords.get(lexeme, identifier), text, text, m.end() - len(lexeme), index))
+            elif kind == "NUMBER":
+                lexeme = m[kind]
+                append(LocatedToken(number, lexeme.decode("ascii"), float(lexeme), m.end() - len(lexeme), index))
+            elif kind == "LINE_COMMENT" or kind == "C_COMMENT":
+                pass
+            elif kind == "STRING":
+                text = m[kind].decode(errors="replace")
+                append(LocatedToken(string, text, text[1:-1], m.start(kind), index))
+            elif kind == "TEXT":
+                self.scan_text(m[kind], m.start(kind))
+            else:
+                self.error(kind, m.start(kind))
+
+        self.tokens.append(LocatedToken(TokenType.EOF, "", None, len(self.source), index))
+        return self.tokens
+
+    def scan_text(self, lexemes: bytes, offset: int) -> None:
+        """Slow path of word characters, dots and bytes past ASCII, scanned as text like RegexScanner does. Undecodable
+           bytes are kept as lone surrogates, so they're unexpected characters and offsets stay exact."""
+        text = lexemes.decode(errors="surrogateescape")
+        for m in TEXT_PATTERN.finditer(text):
+            kind = m.lastgroup
+            start = offset + len(text[:m.start(kind)].encode(errors="surrogateescape"))
+            lexeme = m[kind]
+            if kind == "IDENTIFIER":
+                self.tokens.append(LocatedToken(KEYWORDS.get(lexeme, TokenType.IDENTIFIER), lexeme, lexeme, start, self.index))
+            elif kind == "NUMBER":
+                self.tokens.append(LocatedToken(TokenType.NUMBER, lexeme, float(lexeme), start, self.index))
+            elif kind == "OPERATOR":
+                self.tokens.append(LocatedToken(OPERATORS[lexeme], lexeme, None, start, self.index))
+            else:
+                self.error(kind, start)
+
+    def error(self, kind: str | None, offset: int) -> None:
+        message = {
+            "UNTERMINATED_C_COMMENT": "Unterminated C-style comment.",
+            "UNTERMINATED_STRING": "Unterminated string.",
+        }.get(kind, "Unexpected character.")
+        self.reporter.lexer_error(self.index.line(offset), message, self.index.column(offset))
+
+
+def map_file(file_path: str) -> bytes | mmap.mmap:
+    """Read-only memory map of a script, pages are read in by the OS as the scanner gets to them. Tokens resolve
+       lines through the map, so it's unmapped once the last of them is gone rather than closed explicitly."""
+    with open(file_path, "rb") as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""  # empty files can't be mapped
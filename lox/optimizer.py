@@ -0,0 +1,106 @@
+import math
+from .tokens import Token, TokenType as TT
+from .expressions import Expr, Binary, Grouping, Literal, Unary, Conditional
+from .interpreter import LoxRuntimeError, evaluate, is_truthy
+from .ast_utils import count_nodes
+
+
+def fold_constants(expr: Expr) -> tuple[Expr, int]:
+    """Optimization pass, returns the simplified tree and the number of nodes eliminated from it"""
+    folded = fold(expr)
+    return folded, count_nodes(expr) - count_nodes(folded)
+
+
+def fold(expr: Expr) -> Expr:
+    """Folds the tree bottom-up with an explicit work stack instead of recursion, so trees of any depth the parsers
+       build can be optimized - nodes are visited before their children, operations are rebuilt from folded
+       children on top of the results stack afterwards"""
+    work: list[Expr | tuple] = [expr]
+    results: list[Expr] = []
+
+    while work:
+        match work.pop():
+            case Grouping(expression):
+                work.append(expression)  # parentheses already did their job in the parser
+            case Unary(operator, right):
+                work += [("unary", operator), right]
+            case Binary(left, operator, right):
+                work += [("binary", operator), right, left]
+            case Conditional(condition, then_branch, else_branch):
+                work += [("branch", then_branch, else_branch), condition]
+            case ("unary", operator):
+                results.append(fold_unary(operator, results.pop()))
+            case ("binary", operator):
+                right = results.pop()
+                left = results.pop()
+                if isinstance(left, Literal) and isinstance(right, Literal):
+                    results.append(evaluate_constant(Binary(left, operator, right)))
+                else:
+                    results.append(simplify_identity(Binary(left, operator, right)))
+            case ("branch", then_branch, else_branch):
+                condition = results.pop()
+                if isinstance(condition, Literal):
+                    work.append(then_branch if is_truthy(condition.value) else else_branch)
+                else:
+                    work += [("conditional", condition), else_branch, then_branch]
+            case ("conditional", condition):
+                else_branch = results.pop()
+                then_branch = results.pop()
+                results.append(Conditional(condition, then_branch, else_branch))
+            case node:
+                results.append(node)  # leaves, error nodes of recovery left as they are
+
+    return results[0]
+
+
+def fold_unary(operator: Token, right: Expr) -> Expr:
+    match right:
+        case Literal():
+            return evaluate_constant(Unary(operator, right))
+        case Unary(inner, operand) if operator.token_type == inner.token_type == TT.MINUS and produces_number(operand):
+            return operand
+        case Unary(inner, Unary(innermost, operand)) if operator.token_type == inner.token_type == innermost.token_type == TT.BANG:
+            return Unary(innermost, operand)  # !!!x is !x, but !!x is not x
+    return Unary(operator, right)
+
+
+def evaluate_constant(expr: Unary | Binary) -> Expr:
+    """Folds an operation on literals unless it fails at runtime, in which case the error is left for the runtime.
+       The literal keeps the line of the operator, so bytecode compiled from it still points at the source."""
+    try:
+        return Literal(evaluate(expr), expr.operator.line)
+    except LoxRuntimeError:
+        return expr
+
+
+def produces_number(expr: Expr) -> bool:
+    """Whether expr always evaluates to a number (or raises a runtime error trying)"""
+    match expr:
+        case Literal(value):
+            return type(value) is float
+        case Unary(operator, _):
+            return operator.token_type == TT.MINUS
+        case Binary(_, operator, _):
+            return operator.token_type in (TT.MINUS, TT.STAR, TT.SLASH)
+    return False
+
+
+def is_number_literal(expr: Expr, value: float) -> bool:
+    # checking the sign too, as neither true == 1 nor -0 == 0 may count here
+    return (isinstance(expr, Literal) and type(expr.value) is float and expr.value == value
+            and math.copysign(1.0, expr.value) == math.copysign(1.0, value))
+
+
+def simplify_identity(expr: Binary) -> Expr:
+    """x * 1, 1 * x, x / 1 and x - 0 are just x when x is a number, x + 0 isn't since -0 + 0 is 0"""
+    match expr.operator.token_type:
+        case TT.STAR | TT.SLASH if is_number_literal(expr.right, 1.0):
+            operand = expr.left
+        case TT.STAR if is_number_literal(expr.left, 1.0):
+            operand = expr.right
+        case TT.MINUS if is_number_literal(expr.right, 0.0):
+            operand = expr.left
+        case _:
+            return expr
+
+    return operand if produces_number(operand) else expr
@@ -1,32 +1,101 @@
 from typing import Iterable, Callable
-from .tokens import Token, TokenType as TT
-from .expressions import Expr, Binary, Unary, Literal, Grouping, Conditional
+from .tokens import (
+    Token, TokenType as TT, BINARY_LEVELS, UNARY_CAPABLE, STATEMENT_STARTS, EQUALITY, COMPARISON, TERM, FACTOR
+)
+from .expressions import Expr
+from .interning import NodeFactory
+from .diagnostics import Reporter, default_reporter
+
+
+DEFAULT_MAX_ERRORS = 100
 
 
 class ParseError(RuntimeError):
+    """Syntax error at token, rules it propagates through wrap what they parsed before it into the partial tree"""
+
+    def __init__(self, token: Token | None = None, partial: Expr | None = None) -> None:
+        super().__init__()
+        self.token = token
+        self.partial = partial
+
+
+class TooManyErrors(ParseError):
     pass
 
 
 class Parser:
     """Top-down predictive parser based on recursive descent algorithm"""
-
-    def __init__(self, tokens: Iterable[Token]) -> None:
-        self.tokens = list(tokens)
-        self.current = 0
+    max_errors: int | None = None  # parsing stops once this many syntax errors were reported, only set by parse_all
+
+    def __init__(
+        self, tokens: Iterable[Token], factory: NodeFactory | None = None, reporter: Reporter | None = None
+    ) -> None:
+        # the grammar needs a single token of lookahead, so tokens are pulled one at a time from any iterable
+        # (a list or a lazy token stream alike) instead of being indexed
+        self.tokens = iter(tokens)
+        self.current_token = next(self.tokens)
+        self.previous_token: Token | None = None
+        self.factory = factory or NodeFactory()
+        self.reporter = reporter or default_reporter()
+        self.errors = 0
 
     def parse(self) -> Expr | None:
         try:
-            return self.expression()
+            return self.bounded_expression()
         except ParseError as err:
             return None
 
-    def binary_left_assoc(self, higher_precedence_rule: Callable[[], Expr], *expected_token_types: TT) -> Expr:
+    def parse_all(self, max_errors: int = DEFAULT_MAX_ERRORS) -> list[Expr]:
+        """Recovery mode - parses expressions separated by `;` up to the end of tokens, reporting every syntax error
+           in a single pass instead of stopping at the first one. An expression with an error is kept as a partial
+           tree - whatever parsed of it before the error, with an Error node where the error took place (printers
+           render them as [SYNTAX ERROR ...]). After an error the parser synchronizes at the next statement boundary,
+           every token is looked at once, so it takes linear time whatever the input. Expressions nesting deeper than
+           the recursion limit are reported as errors too. Parsing stops once max_errors were reported."""
+        self.max_errors = max_errors
+        expressions: list[Expr] = []
+
+        while not self.is_at_end():
+            expression = None
+            try:
+                expression = self.bounded_expression()
+                if not self.is_at_end():
+                    self.consume(TT.SEMICOLON, "Expect ';' after expression.")
+            except TooManyErrors as err:
+                expressions.append(self.partial_tree(err, expression))
+                self.reporter.parser_error(self.peek(), "Too many errors.")
+                break
+            except ParseError as err:
+                expressions.append(self.partial_tree(err, expression))
+                self.synchronize()
+            else:
+                expressions.append(expression)
+
+        return expressions
+
+    def partial_tree(self, error: ParseError, expression: Expr | None) -> Expr:
+        """What parsed of an expression before an error, one missing its `;` is complete but for it"""
+        return error.partial if expression is None else self.factory.error(error.token, expression)
+
+    def bounded_expression(self) -> Expr:
+        """Expression rule reporting expressions nesting deeper than the recursion limit as syntax errors"""
+        try:
+            return self.expression()
+        except RecursionError:
+            raise self.error(self.peek(), "Expression nests too deeply.")
+
+    def binary_left_assoc(self, higher_precedence_rule: Callable[[], Expr], level: int) -> Expr:
+        """Matches operators of a precedence level of BINARY_LEVELS, looked up by token type instead of hashed"""
         expr = higher_precedence_rule()
 
-        while not self.is_at_end() and self.peek().token_type in expected_token_types:  # while=>()* regex rule in lox.gram
+        while BINARY_LEVELS[self.current_token.token_type] == level:  # while=>()* regex rule in lox.gram, never EOF
             operator = self.advance()
-            right_most = higher_precedence_rule()
-            expr = Binary(expr, operator, right_most)
+            try:
+                right_most = higher_precedence_rule()
+            except ParseError as err:
+                err.partial = self.factory.binary(expr, operator, err.partial)
+                raise
+            expr = self.factory.binary(expr, operator, right_most)
 
         return expr
 
@@ -36,114 +105,140 @@ class Parser:
     def conditional(self) -> Expr:
         conditional = self.equality()
 
-        if not self.is_at_end() and self.peek().token_type == TT.QUESTION:
+        if self.current_token.token_type == TT.QUESTION:
             self.advance()  
-            then_branch = self.expression()
-            self.consume(TT.COLON, "Expect ':' after then branch of conditional expression.")
-            else_branch = self.conditional()
-            conditional = Conditional(conditional, then_branch, else_branch)
+            try:
+                then_branch = self.expression()
+            except ParseError as err:
+                err.partial = self.factory.conditional(conditional, err.partial, self.factory.error(err.token, None))
+                raise
+            try:
+                self.consume(TT.COLON, "Expect ':' after then branch of conditional expression.")
+                else_branch = self.conditional()
+            except ParseError as err:
+                err.partial = self.factory.conditional(conditional, then_branch, err.partial)
+                raise
+            conditional = self.factory.conditional(conditional, then_branch, else_branch)
 
         return conditional
 
     def equality(self) -> Expr:
         """Matches an equality operator or anything of higher precedence, is left-associative"""
-        return self.binary_left_assoc(self.comparison, TT.BANG_EQUAL, TT.EQUAL_EQUAL)
+        return self.binary_left_assoc(self.comparison, EQUALITY)
 
     def comparison(self) -> Expr:
         """Matches a comparison operator or anything of higher precedence, is left-associative"""
-        return self.binary_left_assoc(
-            self.term, TT.GREATER, TT.GREATER_EQUAL, TT.LESS, TT.LESS_EQUAL
-        )
+        return self.binary_left_assoc(self.term, COMPARISON)
 
     def term(self) -> Expr:
         """Matches a subtraction or addition operator or anything of higher precedence, is left-associative"""
-        return self.binary_left_assoc(self.factor, TT.MINUS, TT.PLUS)
+        return self.binary_left_assoc(self.factor, TERM)
 
     def factor(self) -> Expr:
         """Matches a factorization operator or anything of higher precedence, is left-associative"""
-        return self.binary_left_assoc(self.unary, TT.SLASH, TT.STAR)
+        return self.binary_left_assoc(self.unary, FACTOR)
 
     def unary(self) -> Expr:
         """Matches a unary operator or anything of higher precedence"""
-        if not self.is_at_end() and self.peek().token_type in [TT.BANG, TT.MINUS]:  # if==()?
+        if UNARY_CAPABLE[self.current_token.token_type]:  # if==()?
             operator = self.advance()
-            right = self.unary()
-            return Unary(operator, right)
+            try:
+                right = self.unary()
+            except ParseError as err:
+                err.partial = self.factory.unary(operator, err.partial)
+                raise
+            return self.factory.unary(operator, right)
 
         return self.primary()
 
-    def primary(self) -> Expr | None:
-        """Matches a singular literal or a grouping of expressions"""
+    def primary(self) -> Expr:
+        """Matches a singular literal, a variable or a grouping of expressions"""
         if self.is_at_end():
-            raise Parser.error(self.peek(), "Expect expression.")
+            raise self.error(self.peek(), "Expect expression.")
 
         match self.peek().token_type:
             case TT.FALSE:
                 self.advance()
-                return Literal(False)
+                return self.factory.literal(False)
             case TT.TRUE:
                 self.advance()
-                return Literal(True)
+                return self.factory.literal(True)
             case TT.NIL:
                 self.advance()
-                return Literal(None)
+                return self.factory.literal(None)
 
             case TT.NUMBER | TT.STRING:
                 token = self.advance()
-                return Literal(token.literal)
+                return self.factory.literal(token.literal)
+
+            case TT.IDENTIFIER:
+                return self.factory.variable(self.advance())
 
             case TT.LEFT_PAREN:
                 self.advance()
-                expr = self.expression()
-                self.consume(TT.RIGHT_PAREN, "Expect ')' after expression.")
-                return Grouping(expr)
+                try:
+                    expr = self.expression()
+                except ParseError as err:
+                    err.partial = self.factory.grouping(err.partial)
+                    raise
+                try:
+                    self.consume(TT.RIGHT_PAREN, "Expect ')' after expression.")
+                except ParseError as err:
+                    err.partial = self.factory.grouping(self.factory.error(err.token, expr))
+                    raise
+                return self.factory.grouping(expr)
 
             # error productions
 
             case TT.BANG_EQUAL | TT.EQUAL_EQUAL:
-                Parser.error(self.advance(), "Missing left-hand operand for binary operator.")
-                self.equality()
-                return None
+                return self.missing_left_operand(self.equality)
             case TT.GREATER | TT.GREATER_EQUAL | TT.LESS | TT.LESS_EQUAL:
-                Parser.error(self.advance(), "Missing left-hand operand for binary operator.")
-                self.comparison()
-                return None
+                return self.missing_left_operand(self.comparison)
             case TT.PLUS:
-                Parser.error(self.advance(), "Missing left-hand operand for binary operator.")
-                self.term()
-                return None
+                return self.missing_left_operand(self.term)
             case TT.SLASH | TT.STAR:
-                Parser.error(self.advance(), "Missing left-hand operand for binary operator.")
-                self.factor()
-                return None
+                return self.missing_left_operand(self.factor)
 
-        raise Parser.error(self.peek(), "Expect expression.")
+        raise self.error(self.peek(), "Expect expression.")
+
+    def missing_left_operand(self, operand_rule: Callable[[], Expr]) -> Expr:
+        """Error production of a binary operator used as a unary one, what follows it is kept in an error node"""
+        token = self.advance()
+        self.error(token, "Missing left-hand operand for binary operator.")
+        try:
+            partial = operand_rule()
+        except ParseError as err:
+            err.partial = self.factory.error(token, err.partial)
+            raise
+        return self.factory.error(token, partial)
 
     def consume(self, expected_type: TT, message: str) -> Token:
         """Consumes a token if it's of expected type, enters error recovery mode otherwise"""
         if not self.is_at_end() and self.peek().token_type == expected_type:
             return self.advance()
-        raise Parser.error(self.peek(), message)
+        raise self.error(self.peek(), message)
 
     def peek(self) -> Token:
-        return self.tokens[self.current]
+        return self.current_token
 
     def previous(self) -> Token:
-        return self.tokens[self.current - 1]
+        return self.previous_token
 
     def advance(self) -> Token:
         if not self.is_at_end():
-            self.current += 1
+            self.previous_token = self.current_token
+            self.current_token = next(self.tokens)
         return self.previous()
 
     def is_at_end(self) -> bool:
         return self.peek().token_type == TT.EOF
 
-    @staticmethod
-    def error(token: Token, message: str) -> ParseError:
-        from .lox import Lox as LoxImpl
-        LoxImpl.parser_error(token, message)
-        return ParseError()
+    def error(self, token: Token, message: str) -> ParseError:
+        self.reporter.parser_error(token, message)
+        self.errors += 1
+        if self.errors == self.max_errors:
+            raise TooManyErrors(token, self.factory.error(token, None))
+        return ParseError(token, self.factory.error(token, None))
 
     def synchronize(self) -> None:
         """Synchronizes parser state to statement boundary after encountering syntax error
@@ -154,11 +249,8 @@ class Parser:
             if self.previous().token_type == TT.SEMICOLON:
                 return
 
-            match self.peek().token_type:
-                case TT.CLASS | TT.FUN | TT.VAR \
-                     | TT.FOR | TT.IF | TT.WHILE \
-                     | TT.PRINT | TT.RETURN:
-                    return
+            if STATEMENT_STARTS[self.peek().token_type]:
+                return
 
             self.advance()
 
@@ -0,0 +1,52 @@
+from typing import Any, BinaryIO, Iterator, TextIO
+from .session import Session
+
+
+READ_SIZE = 1 << 20  # bytes of input taken at once
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def split_items(source: BinaryIO, delimiter: bytes = b"\n", read_size: int = READ_SIZE) -> Iterator[list[bytearray]]:
+    """Programs of a binary stream read in bulk - yields the ones completed by every read, and whatever is left after
+       the last delimiter once the stream ends. A read takes what's available instead of waiting for read_size bytes."""
+    if not delimiter:
+        raise ValueError("Programs can't be separated by an empty delimiter")
+    read = getattr(source, "read1", source.read)
+    buffer = bytearray()
+    while chunk := read(read_size):
+        searched = max(0, len(buffer) - len(delimiter) + 1)  # a delimiter may span two reads
+        buffer += chunk
+        end = buffer.rfind(delimiter, searched)
+        if end < 0:
+            continue
+        items = buffer[:end].split(delimiter)
+        del buffer[:end + len(delimiter)]
+        yield items
+    if buffer:
+        yield [buffer]
+
+
+def run_pipe(source: BinaryIO, out: TextIO, delimiter: str = "\n", **options: Any) -> int:
+    """Runs every program of a stream in a session of its own, so errors of one are reported with it and never leak
+       into the next one, nor into the default session. Blank programs are skipped. Output of a program ends with
+       the delimiter unless it's a newline - outputs of programs reporting many errors may span many lines otherwise.
+       Output is flushed once per read instead of per line. Returns exit code of the whole stream,
+       65 if any program had a syntax error, 70 if any had a runtime error and 0 otherwise."""
+    terminator = "" if delimiter == "\n" else delimiter
+    had_error = had_runtime_error = False
+
+    for items in split_items(source, delimiter.encode()):
+        for item in items:
+            program = item.decode(errors="replace")  # undecodable bytes are reported as unexpected characters
+            if not program.strip():
+                continue
+            session = Session(out=out, **options)
+            session.run(program)
+            out.write(terminator)
+            had_error |= session.had_error
+            had_runtime_error |= session.had_runtime_error
+        out.flush()  # a harness waiting for results of what it has sent so far gets them
+
+    if had_error:
+        return 65
+    return 70 if had_runtime_error else 0
@@ -0,0 +1,149 @@
+from .tokens import Token, TokenType as TT, BINARY_PRECEDENCE, BINARY_LEVELS, UNARY_CAPABLE
+from .expressions import Expr
+from .parser import Parser, ParseError
+
+
+# operator table of assets/lox.gram is BINARY_PRECEDENCE - every left-associative binary rule is a precedence level
+UNARY_OPERATORS = frozenset((TT.BANG, TT.MINUS))
+UNARY_PRECEDENCE = 5
+
+# error productions of primary - a binary operator without its left operand is reported and followed by the rule
+# of that operator's level, e.g. `+` is followed by term, so everything of term's level or higher ends up in its error node
+ERROR_PRODUCTIONS = {token_type: level for token_type, level in BINARY_PRECEDENCE.items() if token_type != TT.MINUS}
+
+LITERALS = {TT.FALSE: False, TT.TRUE: True, TT.NIL: None}
+
+# kinds of nested (sub)expressions the parser keeps on its context stack instead of the call stack,
+# the first four are `expression`/`conditional` rules and may continue with `?`, error productions may not
+EXPRESSION, GROUPING, THEN_BRANCH, ELSE_BRANCH, ERROR_PRODUCTION = range(5)
+
+
+class PrecedenceParser(Parser):
+    """Operator-precedence (shunting-yard) parser - builds the same trees (partial ones of syntax errors included) and
+       reports the same errors as the recursive descent Parser, but keeps pending operators and operands on explicit
+       stacks, so it takes a loop iteration per token instead of a chain of calls per operand and doesn't care how
+       deeply expressions nest"""
+
+    def expression(self) -> Expr:
+        factory = self.factory
+        operators: list[tuple[int, Token]] = []  # (precedence, operator token), unary operators included
+        operands: list[Expr] = []
+        # [kind, minimal precedence of binary operators, operator stack base, condition (operator of an error
+        #  production), then branch]
+        contexts: list[list] = [[EXPRESSION, 0, 0, None, None]]
+        expecting_operand = True
+
+        def reduce(base: int, precedence: int) -> None:
+            while len(operators) > base and operators[-1][0] >= precedence:
+                level, operator = operators.pop()
+                right = operands.pop()
+                if level == UNARY_PRECEDENCE:
+                    operands.append(factory.unary(operator, right))
+                else:
+                    operands.append(factory.binary(operands.pop(), operator, right))
+
+        def unwind(err: ParseError) -> Expr:
+            """Partial tree of a syntax error - every open context wraps what it got so far, as rules would"""
+            partial = err.partial
+            while contexts:
+                kind, _, base, condition, then_branch = contexts.pop()
+                operands.append(partial)
+                reduce(base, 0)
+                partial = operands.pop()
+
+                if kind == GROUPING:
+                    partial = factory.grouping(partial)
+                elif kind == THEN_BRANCH:
+                    partial = factory.conditional(condition, partial, factory.error(err.token, None))
+                elif kind == ELSE_BRANCH:
+                    partial = factory.conditional(condition, then_branch, partial)
+                elif kind == ERROR_PRODUCTION:
+                    partial = factory.error(condition, partial)
+            return partial
+
+        # none of the tokens consumed in the loop below is EOF, so advancing is inlined without Parser.advance checks
+        next_token = self.tokens.__next__
+
+        try:
+            while True:
+                token = self.current_token
+                token_type = token.token_type
+
+                if expecting_operand:
+                    if UNARY_CAPABLE[token_type]:
+                        operators.append((UNARY_PRECEDENCE, token))
+                    elif token_type in LITERALS:
+                        operands.append(factory.literal(LITERALS[token_type]))
+                        expecting_operand = False
+                    elif token_type == TT.NUMBER or token_type == TT.STRING:
+                        operands.append(factory.literal(token.literal))
+                        expecting_operand = False
+                    elif token_type == TT.IDENTIFIER:
+                        operands.append(factory.variable(token))
+                        expecting_operand = False
+                    elif token_type == TT.LEFT_PAREN:
+                        contexts.append([GROUPING, 0, len(operators), None, None])
+                    elif token_type in ERROR_PRODUCTIONS:
+                        # advanced before reporting, a lazy stream reports lexer errors first
+                        self.previous_token, self.current_token = token, next_token()
+                        self.error(token, "Missing left-hand operand for binary operator.")
+                        contexts.append([ERROR_PRODUCTION, ERROR_PRODUCTIONS[token_type], len(operators), token, None])
+                        continue
+                    else:
+                        raise self.error(token, "Expect expression.")
+
+                    self.previous_token, self.current_token = token, next_token()
+                    continue
+
+                context = contexts[-1]
+                precedence = BINARY_LEVELS[token_type]
+
+                if precedence and precedence >= context[1]:
+                    # left associativity - operators of equal precedence already on the stack are applied first
+                    if len(operators) > context[2] and operators[-1][0] >= precedence:
+                        reduce(context[2], precedence)
+                    operators.append((precedence, token))
+                    self.previous_token, self.current_token = token, next_token()
+                    expecting_operand = True
+                    continue
+
+                # current context can't continue with this token, so its expression is complete
+                reduce(context[2], 0)
+
+                if token_type == TT.QUESTION and context[0] != ERROR_PRODUCTION:
+                    self.previous_token, self.current_token = token, next_token()
+                    contexts.append([THEN_BRANCH, 0, len(operators), operands.pop(), None])
+                    expecting_operand = True
+                    continue
+
+                while True:
+                    kind, _, _, condition, then_branch = contexts.pop()
+                    value = operands.pop()
+
+                    if kind == EXPRESSION:
+                        return value
+                    elif kind == ERROR_PRODUCTION:
+                        operands.append(factory.error(condition, value))  # whatever the error production swallowed
+                    elif kind == GROUPING:
+                        try:
+                            self.consume(TT.RIGHT_PAREN, "Expect ')' after expression.")
+                        except ParseError as err:
+                            err.partial = factory.grouping(factory.error(err.token, value))
+                            raise
+                        operands.append(factory.grouping(value))
+                    elif kind == THEN_BRANCH:
+                        try:
+                            self.consume(TT.COLON, "Expect ':' after then branch of conditional expression.")
+                        except ParseError as err:
+                            err.partial = factory.conditional(condition, value, err.partial)
+                            raise
+                        contexts.append([ELSE_BRANCH, 0, len(operators), condition, value])
+                        expecting_operand = True
+                    elif kind == ELSE_BRANCH:
+                        # the conditional completes the expression it was a part of, so that context is closed as well
+                        operands.append(factory.conditional(condition, then_branch, value))
+                        continue
+                    break
+        except ParseError as err:
+            err.partial = unwind(err)
+            raise
@@ -0,0 +1,157 @@
+import re
+from bisect import bisect_left
+from .tokens import TokenType, Token, KEYWORDS
+from .token_buffer import TokenBuffer
+from .diagnostics import Reporter, default_reporter
+
+
+# one alternative per lexical class, tried left to right at every position - order matters where prefixes overlap,
+# so comments have to come before the slash operator and terminated literals before the unterminated ones
+# leading blanks are swallowed (possessively, never backtracking into ERROR) by whatever follows them,
+# which halves the number of matches on typical code
+TOKEN_PATTERN = re.compile(
+    r"""
+    [ \t\r]*+
+    (?:
+      (?P<NEWLINE>\n[ \t\r\n]*)
+    | (?P<NUMBER>\d+(?:\.\d+)?)
+    | (?P<IDENTIFIER>[^\W\d][^\W_]*)
+    | (?P<LINE_COMMENT>//[^\n]*)
+    | (?P<C_COMMENT>/\*.*?\*/)
+    | (?P<UNTERMINATED_C_COMMENT>/\*.*)
+    | (?P<OPERATOR>[!=<>]=?|[(){},.\-+;*?:/])
+    | (?P<STRING>"[^"]*")
+    | (?P<UNTERMINATED_STRING>".*)
+    | (?P<ERROR>.)
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+OPERATORS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "/": TokenType.SLASH,
+    "*": TokenType.STAR,
+    "?": TokenType.QUESTION,
+    ":": TokenType.COLON,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+}
+
+
+class RegexScanner:
+    """Drop-in replacement for Scanner consuming whole lexemes (or runs of whitespace) per step with a single
+       compiled master regex, token lines are looked up in a table of newline offsets instead of being counted"""
+
+    def __init__(self, source: str, reporter: Reporter | None = None) -> None:
+        self.source = source
+        self.tokens: list[Token] = []
+        self.newlines = [m.start() for m in re.finditer("\n", source)]
+        self.reporter = reporter or default_reporter()
+
+    def line_at(self, offset: int) -> int:
+        """Line number of the character at offset, i.e. 1 + newlines strictly before it"""
+        return bisect_left(self.newlines, offset) + 1
+
+    def scan_tokens(self) -> list[Token]:
+        source = self.source
+        tokens = self.tokens
+        append = tokens.append
+        line = 1
+
+        for m in TOKEN_PATTERN.finditer(source):
+            kind = m.lastgroup
+
+            if kind == "OPERATOR":
+                text = m[kind]
+                append(Token(OPERATORS[text], text, None, line))
+            elif kind == "IDENTIFIER":
+                text = m[kind]
+                append(Token(KEYWORDS.get(text, TokenType.IDENTIFIER), text, text, line))
+            elif kind == "NUMBER":
+                text = m[kind]
+                append(Token(TokenType.NUMBER, text, float(text), line))
+            elif kind == "NEWLINE" or kind == "C_COMMENT":
+                line = self.line_at(m.end())
+            elif kind == "LINE_COMMENT":
+                pass
+            elif kind == "STRING":
+                # multiline strings are reported at their last line just like Scanner does
+                line = self.line_at(m.end())
+                text = m[kind]
+                append(Token(TokenType.STRING, text, text[1:-1], line))
+            else:
+                self.error(kind, m.start(kind))
+
+        self.tokens.append(Token(TokenType.EOF, "", None, len(self.newlines) + 1))
+        return self.tokens
+
+    def error(self, kind: str | None, offset: int) -> None:
+        match kind:
+            case "UNTERMINATED_C_COMMENT":
+                self.reporter.lexer_error(len(self.newlines) + 1, "Unterminated C-style comment.")
+            case "UNTERMINATED_STRING":
+                self.reporter.lexer_error(len(self.newlines) + 1, "Unterminated string.")
+            case _:
+                self.reporter.lexer_error(self.line_at(offset), "Unexpected character.")
+
+
+class ColumnarScanner(RegexScanner):
+    """RegexScanner filling a columnar TokenBuffer instead of a list of Token instances"""
+
+    def scan_tokens(self) -> TokenBuffer:
+        buffer = TokenBuffer(self.source)
+        add_type, add_start, add_length, add_line = (
+            buffer.types.append, buffer.starts.append, buffer.lengths.append, buffer.lines.append
+        )
+        literals = buffer.literals
+        line = 1
+        number, string = TokenType.NUMBER.value, TokenType.STRING.value
+        operators = {text: token_type.value for text, token_type in OPERATORS.items()}
+        keywords = {text: token_type.value for text, token_type in KEYWORDS.items()}
+        identifier = TokenType.IDENTIFIER.value
+
+        for m in TOKEN_PATTERN.finditer(self.source):
+            kind = m.lastgroup
+
+            if kind == "OPERATOR":
+                add_type(operators[m[kind]])
+            elif kind == "IDENTIFIER":
+                add_type(keywords.get(m[kind], identifier))
+            elif kind == "NUMBER":
+                literals[len(buffer.types)] = float(m[kind])
+                add_type(number)
+            elif kind == "NEWLINE" or kind == "C_COMMENT":
+                line = self.line_at(m.end())
+                continue
+            elif kind == "LINE_COMMENT":
+                continue
+            elif kind == "STRING":
+                line = self.line_at(m.end())
+                literals[len(buffer.types)] = m[kind][1:-1]
+                add_type(string)
+            else:
+                self.error(kind, m.start(kind))
+                continue
+
+            start, end = m.span(kind)
+            add_start(start)
+            add_length(end - start)
+            add_line(line)
+
+        buffer.append(TokenType.EOF, len(self.source), 0, len(self.newlines) + 1)
+        return buffer
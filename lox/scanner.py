@@ -1,12 +1,31 @@
 from typing import Any
 from .tokens import TokenType, Token, KEYWORDS
+from .diagnostics import Reporter, default_reporter
+
+
+# looked up before matching the rest, most tokens of an expression are one of these
+SINGLE_CHARACTER_TOKENS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "*": TokenType.STAR,
+    "?": TokenType.QUESTION,
+    ":": TokenType.COLON,
+}
 
 
 class Scanner:
-    def __init__(self, source: str) -> None:
+    def __init__(self, source: str, reporter: Reporter | None = None) -> None:
         self.source = source
         self.source_len = len(source)
         self.tokens: list[Token] = []
+        self.reporter = reporter or default_reporter()
 
         self.start = 0
         self.current = 0
@@ -25,20 +44,17 @@ class Scanner:
 
     def scan_token(self) -> None:
         c = self.advance()
+        token_type = SINGLE_CHARACTER_TOKENS.get(c)
+        if token_type is not None:
+            self.add_token(token_type)
+            return
+
         match c:
-            # single character lexemes
-            case "(": self.add_token(TokenType.LEFT_PAREN)
-            case ")": self.add_token(TokenType.RIGHT_PAREN)
-            case "{": self.add_token(TokenType.LEFT_BRACE)
-            case "}": self.add_token(TokenType.RIGHT_BRACE)
-            case ",": self.add_token(TokenType.COMMA)
-            case ".": self.add_token(TokenType.DOT)
-            case "-": self.add_token(TokenType.MINUS)
-            case "+": self.add_token(TokenType.PLUS)
-            case ";": self.add_token(TokenType.SEMICOLON)
-            case "*": self.add_token(TokenType.STAR)
-            case "?": self.add_token(TokenType.QUESTION)
-            case ":": self.add_token(TokenType.COLON)
+            # whitespaces
+            case " ": pass
+            case "\r": pass
+            case "\t": pass
+            case "\n": self.line += 1
 
             # operators
             case "!": self.add_token(TokenType.BANG_EQUAL if self.match_next("=") else TokenType.BANG)
@@ -56,12 +72,6 @@ class Scanner:
                 else:
                     self.add_token(TokenType.SLASH)
 
-            # whitespaces
-            case " ": pass
-            case "\r": pass
-            case "\t": pass
-            case "\n": self.line += 1
-
             case "\"": self.string_literal()
 
             case _:
@@ -70,8 +80,7 @@ class Scanner:
                 elif c.isalpha() or c == "_":
                     self.identifier()
                 else:
-                    from .lox import Lox as LoxImpl
-                    LoxImpl.lexer_error(self.line, "Unexpected character.")
+                    self.reporter.lexer_error(self.line, "Unexpected character.")
 
     def add_token(self, token_type: TokenType, literal: Any = None) -> None:
         text = self.source[self.start:self.current]
@@ -106,8 +115,7 @@ class Scanner:
             self.advance()
 
         if self.is_at_end():
-            from .lox import Lox as LoxImpl
-            LoxImpl.lexer_error(self.line, "Unterminated C-style comment.")
+            self.reporter.lexer_error(self.line, "Unterminated C-style comment.")
             return
 
         self.advance()
@@ -120,8 +128,7 @@ class Scanner:
             self.advance()
 
         if self.is_at_end():
-            from .lox import Lox as LoxImpl
-            LoxImpl.lexer_error(self.line, "Unterminated string.")
+            self.reporter.lexer_error(self.line, "Unterminated string.")
             return
 
         self.advance()  # closing quote
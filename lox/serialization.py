@@ -0,0 +1,441 @@
+import math
+import struct
+from typing import Any, Iterable, Iterator
+from .tokens import Token, TokenType
+from .expressions import Expr, Binary, Grouping, Literal, Unary, Conditional, Variable, Error
+
+
+# Layout of both formats: MAGIC, FORMAT_VERSION, kind byte, string table (varint count, then varint byte length and
+# utf-8 bytes of every string), body. All integers are unsigned LEB128 varints, signed ones are zigzag encoded first.
+#
+# Token stream body: varint count, then per token varint (type value << 1 | has literal), lexeme string index,
+#   zigzag line delta to the previous token and the literal value when present.
+# AST body: pre-order nodes, each starting with its kind byte - structural nodes are followed by their operator token
+#   (type, lexeme index, line) if they have one and byte sizes of all but their last child subtree, so a reader can jump
+#   to any child without decoding its siblings. Literal nodes are just their value, the kind byte being its tag.
+#   Variable nodes are leaves with their name token written like an operator. Error nodes of recovery have their token
+#   written in full (as in a token stream, but for an absolute line), a kind of their own tells a partial tree follows.
+MAGIC = b"PLXB"
+FORMAT_VERSION = 3
+TOKENS_KIND, AST_KIND = b"T", b"A"
+
+BINARY, GROUPING, UNARY, CONDITIONAL, VARIABLE, ERROR, PARTIAL = range(7)  # ERROR nodes have no partial tree
+NIL, TRUE, FALSE, INTEGER, FLOAT, STRING, LEXEME = range(7, 14)  # value tags, LEXEME only for token literals
+
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+DOUBLE = struct.Struct("<d")
+MAX_EXACT_INTEGER = 2 ** 53
+
+
+def flatten(expr: Expr) -> list[Any]:
+    """Pre-order [kind, payload, kind, payload, ...] list of the tree, built without recursion,
+       as pickling (or printing) deeply nested trees directly would overflow the stack"""
+    flat: list[Any] = []
+    stack = [expr]
+
+    while stack:
+        match stack.pop():
+            case Binary(left, operator, right):
+                flat += [BINARY, operator]
+                stack += [right, left]
+            case Grouping(expression):
+                flat += [GROUPING, None]
+                stack.append(expression)
+            case Literal(value):
+                flat += [NIL, value]  # any value tag stands for a literal here
+            case Unary(operator, right):
+                flat += [UNARY, operator]
+                stack.append(right)
+            case Conditional(condition, then_branch, else_branch):
+                flat += [CONDITIONAL, None]
+                stack += [else_branch, then_branch, condition]
+            case Variable(name):
+                flat += [VARIABLE, name]
+            case Error(token, None):
+                flat += [ERROR, token]
+            case Error(token, partial):
+                flat += [PARTIAL, token]
+                stack.append(partial)
+            case node:
+                raise NotImplementedError(f"Non-exhaustive match in AST flattening failed on expression: {type(node)}")
+
+    return flat
+
+
+def unflatten(flat: list[Any]) -> Expr:
+    # walking pre-order backwards every node finds its children already built on top of the stack, first child first
+    stack: list[Expr] = []
+    pop = stack.pop
+
+    for i in range(len(flat) - 2, -1, -2):
+        kind, payload = flat[i], flat[i + 1]
+        if kind >= NIL:
+            stack.append(Literal(payload))
+        elif kind == BINARY:
+            stack.append(Binary(pop(), payload, pop()))
+        elif kind == UNARY:
+            stack.append(Unary(payload, pop()))
+        elif kind == GROUPING:
+            stack.append(Grouping(pop()))
+        elif kind == VARIABLE:
+            stack.append(Variable(payload))
+        elif kind == CONDITIONAL:
+            stack.append(Conditional(pop(), pop(), pop()))
+        elif kind == ERROR:
+            stack.append(Error(payload, None))
+        else:
+            stack.append(Error(payload, pop()))
+
+    return stack[0]
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def varint_size(value: int) -> int:
+    return max(1, (value.bit_length() + 6) // 7)
+
+
+def zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+class Encoder:
+    """Accumulates a body and the string table it refers to, strings are stored once no matter how often they're used"""
+
+    def __init__(self, kind: bytes) -> None:
+        self.kind = kind
+        self.strings: dict[str, int] = {}
+        self.body = bytearray()
+
+    def string(self, text: str) -> int:
+        index = self.strings.get(text)
+        if index is None:
+            index = self.strings[text] = len(self.strings)
+        return index
+
+    def value(self, out: bytearray, value: Any, lexeme: str | None = None) -> None:
+        if value is None:
+            out.append(NIL)
+        elif value is True:
+            out.append(TRUE)
+        elif value is False:
+            out.append(FALSE)
+        elif type(value) is float:
+            # whole numbers are by far the most common, those fitting a double exactly go as varints (but not -0)
+            if value.is_integer() and abs(value) < MAX_EXACT_INTEGER and not (value == 0 and math.copysign(1.0, value) < 0):
+                out.append(INTEGER)
+                write_varint(out, zigzag(int(value)))
+            else:
+                out.append(FLOAT)
+                out += DOUBLE.pack(value)
+        elif type(value) is str:
+            if value == lexeme:
+                out.append(LEXEME)
+            else:
+                out.append(STRING)
+                write_varint(out, self.string(value))
+        else:
+            raise ValueError(f"Can't serialize literal of type {type(value).__name__}")
+
+    def operator(self, out: bytearray, token: Token) -> None:
+        write_varint(out, token.token_type.value)
+        write_varint(out, self.string(token.lexeme))
+        write_varint(out, token.line)
+
+    def token(self, out: bytearray, token: Token) -> None:
+        """Any token, of error nodes - with its literal, unlike operators and names"""
+        has_literal = token.literal is not None
+        write_varint(out, token.token_type.value << 1 | has_literal)
+        write_varint(out, self.string(token.lexeme))
+        write_varint(out, token.line)
+        if has_literal:
+            self.value(out, token.literal, token.lexeme)
+
+    def finish(self) -> bytes:
+        out = bytearray(MAGIC)
+        out.append(FORMAT_VERSION)
+        out += self.kind
+        write_varint(out, len(self.strings))
+        for text in self.strings:
+            data = text.encode()
+            write_varint(out, len(data))
+            out += data
+        return bytes(out + self.body)
+
+
+def dump_tokens(tokens: Iterable[Token]) -> bytes:
+    encoder = Encoder(TOKENS_KIND)
+    body = bytearray()
+    count = 0
+    line = 0
+
+    for token in tokens:
+        has_literal = token.literal is not None
+        write_varint(body, token.token_type.value << 1 | has_literal)
+        write_varint(body, encoder.string(token.lexeme))
+        write_varint(body, zigzag(token.line - line))
+        if has_literal:
+            encoder.value(body, token.literal, token.lexeme)
+        line = token.line
+        count += 1
+
+    write_varint(encoder.body, count)
+    encoder.body += body
+    return encoder.finish()
+
+
+def dump_ast(expr: Expr) -> bytes:
+    """Encodes the tree in two passes over its flattened pre-order - subtree sizes are summed up bottom-up first,
+       as every node states the sizes of its children ahead of them, then everything is written out top-down"""
+    encoder = Encoder(AST_KIND)
+    flat = flatten(expr)
+    heads: list[bytes] = [b""] * (len(flat) // 2)  # node encodings without the child sizes
+    skips: list[tuple[int, ...]] = [()] * len(heads)  # child sizes to write after them
+    sizes: list[int] = []  # subtree sizes of already visited nodes, mirroring unflatten
+
+    for i in range(len(heads) - 1, -1, -1):
+        kind, payload = flat[2 * i], flat[2 * i + 1]
+        head = bytearray()
+        if kind >= NIL:
+            encoder.value(head, payload)
+            size = len(head)
+        else:
+            head.append(kind)
+            if kind == BINARY:
+                encoder.operator(head, payload)
+                left, right = sizes.pop(), sizes.pop()
+                skips[i] = (left,)
+                size = len(head) + varint_size(left) + left + right
+            elif kind == UNARY or kind == GROUPING:
+                if kind == UNARY:
+                    encoder.operator(head, payload)
+                size = len(head) + sizes.pop()
+            elif kind == VARIABLE:
+                encoder.operator(head, payload)
+                size = len(head)
+            elif kind == ERROR or kind == PARTIAL:
+                encoder.token(head, payload)
+                size = len(head) + (sizes.pop() if kind == PARTIAL else 0)
+            else:
+                condition, then_branch, else_branch = sizes.pop(), sizes.pop(), sizes.pop()
+                skips[i] = (condition, then_branch)
+                size = len(head) + varint_size(condition) + varint_size(then_branch) + condition + then_branch + else_branch
+        heads[i] = bytes(head)
+        sizes.append(size)
+
+    body = encoder.body
+    for head, skip in zip(heads, skips):
+        body += head
+        for size in skip:
+            write_varint(body, size)
+    return encoder.finish()
+
+
+class Decoder:
+    """Zero-copy reader of serialized data in any buffer (bytes, memoryview, mmap) - only the string table offsets
+       are read upfront, strings are decoded the first time they're used"""
+
+    def __init__(self, data: Any, kind: bytes) -> None:
+        self.data = memoryview(data).cast("B") if not isinstance(data, memoryview) else data.cast("B")
+        header = MAGIC + bytes([FORMAT_VERSION]) + kind
+        if bytes(self.data[:len(header)]) != header:
+            raise ValueError("Not a serialized plox " + ("token stream" if kind == TOKENS_KIND else "syntax tree"))
+
+        count, position = self.varint(len(header))
+        self.string_bounds: list[tuple[int, int]] = []
+        for _ in range(count):
+            length, position = self.varint(position)
+            self.string_bounds.append((position, position + length))
+            position += length
+        self.strings: list[str | None] = [None] * count
+        self.body = position
+
+    def varint(self, position: int) -> tuple[int, int]:
+        data = self.data
+        byte = data[position]
+        value = byte & 0x7F
+        shift = 7
+        while byte & 0x80:
+            position += 1
+            byte = data[position]
+            value |= (byte & 0x7F) << shift
+            shift += 7
+        return value, position + 1
+
+    def string(self, index: int) -> str:
+        text = self.strings[index]
+        if text is None:
+            start, end = self.string_bounds[index]
+            text = self.strings[index] = str(self.data[start:end], "utf-8")
+        return text
+
+    def value(self, tag: int, position: int, lexeme: str | None = None) -> tuple[Any, int]:
+        if tag == INTEGER:
+            value, position = self.varint(position)
+            return float(unzigzag(value)), position
+        elif tag == FLOAT:
+            return DOUBLE.unpack_from(self.data, position)[0], position + DOUBLE.size
+        elif tag == STRING:
+            index, position = self.varint(position)
+            return self.string(index), position
+        elif tag == LEXEME:
+            return lexeme, position
+        return (None, True, False)[tag - NIL], position
+
+    def operator(self, position: int) -> tuple[Token, int]:
+        token_type, position = self.varint(position)
+        lexeme, position = self.varint(position)
+        line, position = self.varint(position)
+        return Token(TOKEN_TYPES[token_type], self.string(lexeme), None, line), position
+
+    def name(self, position: int) -> tuple[Token, int]:
+        # identifiers are scanned with their lexeme as literal, it's not stored twice
+        token, position = self.operator(position)
+        token.literal = token.lexeme
+        return token, position
+
+    def token(self, position: int) -> tuple[Token, int]:
+        header, position = self.varint(position)
+        lexeme, position = self.varint(position)
+        line, position = self.varint(position)
+        lexeme = self.string(lexeme)
+        literal = None
+        if header & 1:
+            literal, position = self.value(self.data[position], position + 1, lexeme)
+        return Token(TOKEN_TYPES[header >> 1], lexeme, literal, line), position
+
+
+def load_tokens(data: Any) -> Iterator[Token]:
+    """Lazily decoded token stream, it can be handed to Parser as is"""
+    decoder = Decoder(data, TOKENS_KIND)
+    count, position = decoder.varint(decoder.body)
+    line = 0
+
+    for _ in range(count):
+        header, position = decoder.varint(position)
+        lexeme, position = decoder.varint(position)
+        delta, position = decoder.varint(position)
+        lexeme = decoder.string(lexeme)
+        line += unzigzag(delta)
+        literal = None
+        if header & 1:
+            literal, position = decoder.value(decoder.data[position], position + 1, lexeme)
+        yield Token(TOKEN_TYPES[header >> 1], lexeme, literal, line)
+
+
+class AstReader(Decoder):
+    """Serialized syntax tree, either materialized whole or explored node by node through ExprViews"""
+
+    def __init__(self, data: Any) -> None:
+        super().__init__(data, AST_KIND)
+
+    @property
+    def root(self) -> "ExprView":
+        return ExprView(self, self.body)
+
+    def node(self, position: int) -> tuple[int, Any, list[int], int]:
+        """Decodes a single node into its kind, payload (operator, name or error token, literal value), child offsets
+           and the offset right past its head, which is where its first child starts"""
+        kind = self.data[position]
+        position += 1
+        if kind >= NIL:
+            value, position = self.value(kind, position)
+            return kind, value, [], position
+
+        if kind == VARIABLE:
+            name, position = self.name(position)
+            return kind, name, [], position
+
+        if kind == ERROR or kind == PARTIAL:
+            token, position = self.token(position)
+            return kind, token, [position] if kind == PARTIAL else [], position
+
+        operator = None
+        if kind == BINARY or kind == UNARY:
+            operator, position = self.operator(position)
+
+        if kind == BINARY:
+            left, position = self.varint(position)
+            return kind, operator, [position, position + left], position
+        if kind == CONDITIONAL:
+            condition, position = self.varint(position)
+            then_branch, position = self.varint(position)
+            return kind, None, [position, position + condition, position + condition + then_branch], position
+        return kind, operator, [position], position
+
+    def materialize(self, position: int | None = None) -> Expr:
+        """Builds the subtree at position (the whole tree by default), reading its nodes in one linear pass"""
+        position = self.body if position is None else position
+        flat: list[Any] = []
+        pending = 1  # subtrees still to be read, the pre-order encoding of one ends right when this drops to 0
+
+        while pending:
+            kind, payload, children, position = self.node(position)
+            flat += [kind, payload]
+            pending += len(children) - 1
+
+        return unflatten(flat)
+
+
+def load_ast(data: Any) -> Expr:
+    return AstReader(data).materialize()
+
+
+class ExprView:
+    """Node of a serialized tree decoded on first access - nothing below it is read until its children are asked for"""
+    __slots__ = ("reader", "offset", "decoded")
+
+    NODE_TYPES = {
+        BINARY: Binary, GROUPING: Grouping, UNARY: Unary, CONDITIONAL: Conditional, VARIABLE: Variable,
+        ERROR: Error, PARTIAL: Error,
+    }
+
+    def __init__(self, reader: AstReader, offset: int) -> None:
+        self.reader = reader
+        self.offset = offset
+        self.decoded: tuple[int, Any, list[int], int] | None = None
+
+    def decode(self) -> tuple[int, Any, list[int], int]:
+        if self.decoded is None:
+            self.decoded = self.reader.node(self.offset)
+        return self.decoded
+
+    @property
+    def node_type(self) -> type[Expr]:
+        return self.NODE_TYPES.get(self.decode()[0], Literal)
+
+    @property
+    def operator(self) -> Token | None:
+        kind, payload, _, _ = self.decode()
+        return payload if kind == BINARY or kind == UNARY else None
+
+    @property
+    def name(self) -> Token | None:
+        kind, payload, _, _ = self.decode()
+        return payload if kind == VARIABLE else None
+
+    @property
+    def token(self) -> Token | None:
+        kind, payload, _, _ = self.decode()
+        return payload if kind == ERROR or kind == PARTIAL else None
+
+    @property
+    def value(self) -> Any:
+        kind, payload, _, _ = self.decode()
+        return payload if kind >= NIL else None
+
+    @property
+    def children(self) -> list["ExprView"]:
+        return [ExprView(self.reader, offset) for offset in self.decode()[2]]
+
+    def materialize(self) -> Expr:
+        return self.reader.materialize(self.offset)
@@ -0,0 +1,113 @@
+import io
+import os
+import signal
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Any
+from .session import Session
+from .client import REQUEST_HEADER, encode_response
+
+
+DEFAULT_TIMEOUT = 10.0  # seconds a request may wait for a worker and run
+MAX_REQUEST_SIZE = 1 << 24  # bytes of a single program
+
+# exit codes of responses besides those of running a script, so 65 for syntax and 70 for runtime errors
+REQUEST_TOO_LARGE = 64
+TIMED_OUT = 75
+
+
+class LoxServer:
+    """Runs programs sent over a Unix socket, saving clients the start of an interpreter and the imports of plox
+       (and sharing the AST cache between them). Every program runs in a session of its own on a worker thread,
+       its output and errors are sent back instead of being printed. At most max_concurrent programs run at once,
+       others wait for a worker, and a request waiting and running for longer than timeout is answered with
+       TIMED_OUT. A worker can't be interrupted though, so it's only free again once the program ends."""
+
+    def __init__(
+        self,
+        path: str,
+        max_concurrent: int | None = None,  # one worker per CPU by default
+        timeout: float = DEFAULT_TIMEOUT,
+        max_request_size: int = MAX_REQUEST_SIZE,
+        **options: Any,  # Session arguments of every request, e.g. evaluator or a shared ast_cache
+    ) -> None:
+        self.path = path
+        self.max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_request_size = max_request_size
+        self.options = options
+        self.executor = ThreadPoolExecutor(self.max_concurrent, thread_name_prefix="plox-worker")
+        self.workers = asyncio.Semaphore(self.max_concurrent)
+
+    def run_program(self, source: str) -> tuple[int, str, str]:
+        out, err = io.StringIO(), io.StringIO()
+        session = Session(out=out, err=err, **self.options)
+        session.run(source)
+        code = 65 if session.had_error else 70 if session.had_runtime_error else 0
+        return code, out.getvalue(), err.getvalue()
+
+    async def execute(self, source: str) -> tuple[int, str, str]:
+        loop = asyncio.get_running_loop()
+        await self.workers.acquire()
+        future = self.executor.submit(self.run_program, source)
+        # released once the program ends rather than when the request is given up on, which can't stop the worker
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self.workers.release))
+        return await asyncio.wrap_future(future)
+
+    async def respond(self, source: str) -> tuple[int, str, str]:
+        try:
+            return await asyncio.wait_for(self.execute(source), self.timeout)
+        except TimeoutError:
+            return TIMED_OUT, "", f"Timed out after {self.timeout:g} s.\n"
+        except Exception as error:
+            # what would have ended a process running the program (e.g. a RecursionError) ends only its request
+            return 1, "", f"{type(error).__name__}: {error}\n"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(REQUEST_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break  # the client is done
+                (size,) = REQUEST_HEADER.unpack(header)
+                if size > self.max_request_size:
+                    message = f"Request of {size} bytes exceeds the limit of {self.max_request_size} bytes.\n"
+                    writer.write(encode_response(REQUEST_TOO_LARGE, "", message))
+                    await writer.drain()
+                    break  # the program isn't read, so the stream can't go on
+                # undecodable bytes are reported as unexpected characters
+                source = (await reader.readexactly(size)).decode(errors="replace")
+                writer.write(encode_response(*await self.respond(source)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # the client went away in the middle of a request
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def start(self) -> asyncio.Server:
+        """Listens on the socket, a stale socket file left by a server that didn't stop cleanly is replaced"""
+        return await asyncio.start_unix_server(self.handle, self.path)
+
+    async def serve(self) -> None:
+        """Serves until SIGINT or SIGTERM, then removes the socket"""
+        server = await self.start()
+        stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stopped.set)
+        try:
+            await stopped.wait()
+        finally:
+            # not waiting for connections to close, an idle client would keep the server up
+            server.close()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            with suppress(FileNotFoundError):
+                os.unlink(self.path)
+
+
+def run_server(path: str, **options: Any) -> None:
+    asyncio.run(LoxServer(path, **options).serve())
@@ -0,0 +1,240 @@
+import sys
+import mmap
+from collections.abc import Mapping
+from contextlib import nullcontext
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, TextIO, ContextManager
+from .tokens import Token
+from .diagnostics import Diagnostics, error_location
+from .expressions import Expr
+
+if TYPE_CHECKING:
+    from .cache import AstCache
+    from .incremental import IncrementalDocument
+    from .instrumentation import Instrumentation, PhaseStats
+    from .interpreter import LoxRuntimeError
+
+
+class Engines(Mapping):
+    """Engines by name, each imported the first time it's looked up - a run uses one scanner, parser and evaluator,
+       so starting the interpreter never pays for the others (e.g. the regex scanner compiling its patterns)"""
+
+    def __init__(self, **locations: str) -> None:  # name -> "module:attribute", relative to the lox package
+        self.locations = locations
+        self.loaded: dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        engine = self.loaded.get(name)
+        if engine is None:
+            module, attribute = self.locations[name].split(":")
+            engine = self.loaded[name] = getattr(import_module(module, __package__), attribute)
+        return engine
+
+    def __iter__(self):
+        return iter(self.locations)
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+
+SCANNER_ENGINES = Engines(
+    classic=".scanner:Scanner",
+    regex=".regex_scanner:RegexScanner",
+    columnar=".regex_scanner:ColumnarScanner",
+    stream=".stream_scanner:StreamScanner",
+)
+
+PARSER_ENGINES = Engines(
+    recursive=".parser:Parser",
+    precedence=".precedence_parser:PrecedenceParser",
+    generated=".generated_parser:GeneratedParser",
+)
+
+EVALUATORS = Engines(
+    tree=".interpreter:evaluate",
+    closure=".interpreter:evaluate_compiled",
+    vm=".vm:evaluate_bytecode",
+)
+
+BYTE_SOURCES = (bytes, bytearray, mmap.mmap)  # scanned by MappedScanner whatever the scanner engine
+
+NOT_MEASURED = nullcontext()  # phase of a session without instrumentation
+
+
+class Session:
+    """Configuration and error state of running Lox code, handed to scanners and parsers as their reporter.
+       Nothing is shared between sessions (but an AstCache passed to several of them), so each thread or executor
+       task running scripts concurrently can use one of its own. A single session is not meant to be shared.
+       Error state is that of the last run, every run starts without diagnostics or errors of the ones before it."""
+
+    def __init__(
+        self,
+        scanner_engine: str = "classic",  # key of SCANNER_ENGINES
+        parser_engine: str = "recursive",  # key of PARSER_ENGINES
+        evaluator: str | None = None,  # key of EVALUATORS, expressions are only pretty-printed without one
+        optimize: bool = False,
+        disassemble: bool = False,
+        ast_cache: "AstCache | None" = None,  # None disables caching of parsed expressions
+        out: TextIO | None = None,  # results and errors go here, sys.stdout (at the time of printing) by default
+        err: TextIO | None = None,  # optimizer reports go here, sys.stderr by default
+        instrumentation: "Instrumentation | None" = None,  # measures phases of every run when given
+        memory_map: bool = False,  # scripts are mapped and scanned as bytes, errors are reported with columns
+    ) -> None:
+        self.scanner_engine = scanner_engine
+        self.parser_engine = parser_engine
+        self.evaluator = evaluator
+        self.optimize = optimize
+        self.disassemble = disassemble
+        self.ast_cache = ast_cache
+        self.out = out
+        self.err = err
+        self.instrumentation = instrumentation
+        self.memory_map = memory_map
+        self.diagnostics = Diagnostics()
+        self.had_error = False
+        self.had_runtime_error = False
+
+    def lexer_error(self, line: int, message: str, column: int | None = None) -> None:
+        self.report(line, "", message, column)
+
+    def parser_error(self, token: Token, message: str) -> None:
+        self.report(token.line, error_location(token), message, token.column)
+
+    def runtime_error(self, error: "LoxRuntimeError") -> None:
+        print(f"{error}\n[line {error.line}]", file=self.out)
+        self.had_runtime_error = True
+
+    def report(self, line: int, where: str, message: str, column: int | None = None) -> None:
+        self.diagnostics.report(line, where, message, column)
+        print(self.diagnostics.items[-1], file=self.out)
+        self.had_error = True
+
+    def run(self, source: "str | bytes | mmap.mmap | TextIO | IncrementalDocument", digest: bytes | None = None, script_path: str | None = None) -> None:
+        # a REPL or a server running line after line on a session would otherwise keep every diagnostic forever
+        self.diagnostics = Diagnostics()
+        self.had_error = self.had_runtime_error = False
+
+        with NOT_MEASURED if self.instrumentation is None else self.instrumentation.run():
+            cache = self.ast_cache
+            expression = None
+            if cache is not None:
+                with self.phase("cache"):
+                    if digest is None and isinstance(source, str):
+                        from .cache import source_digest
+                        digest = source_digest(source)
+                    if digest is not None:
+                        expression = cache.get(digest, script_path)
+
+            if expression is None:
+                expression = self.parse(source)
+                if self.had_error:
+                    return
+                if cache is not None and digest is not None:
+                    cache.put(digest, expression, script_path)
+
+            if self.optimize:
+                from .optimizer import fold_constants
+                with self.phase("optimize") as stats:
+                    expression, eliminated = fold_constants(expression)
+                if stats is not None:
+                    from .ast_utils import tree_shape
+                    stats.nodes, stats.depth = tree_shape(expression)
+                print(f"[optimizer] eliminated {eliminated} nodes", file=self.err or sys.stderr)
+
+            if self.disassemble:
+                from .bytecode import compile_bytecode
+                from .disassembler import disassemble
+                with self.phase("compile"):
+                    listing = disassemble(compile_bytecode(expression))
+                print(listing, file=self.out)
+
+            if self.evaluator is not None:
+                with self.phase("evaluate"):
+                    self.interpret(expression)
+                return
+
+            from .ast_printer import write_expr  # nothing prints trees when evaluating or only checking them
+            with self.phase("print"):
+                write_expr(expression, self.out or sys.stdout)  # streamed, as text of a huge tree is even bigger
+                print(file=self.out)
+            # REPL input: -123 * (45.67 + 8.901)
+            # REPL output: (* (- 123.0) (group (+ 45.67 8.901)))
+
+            # REPL input: 1 == 2 ? 45 : -123 * (45.67 + 8.901)
+            # REPL output: (if (== 1.0 2.0) then 45.0 else (* (- 123.0) (group (+ 45.67 8.901))))
+
+    def phase(self, name: str) -> ContextManager["PhaseStats | None"]:
+        return NOT_MEASURED if self.instrumentation is None else self.instrumentation.phase(name)
+
+    def parse(self, source: "str | bytes | mmap.mmap | TextIO | IncrementalDocument") -> Expr | None:
+        # a document can only be given once lox.incremental has been imported, so that's not done just to check it
+        incremental = sys.modules.get(f"{__package__}.incremental")
+        if incremental is not None and isinstance(source, incremental.IncrementalDocument):
+            # an editor's buffer, only what its last edits touched is parsed again
+            with self.phase("parse") as parsing:
+                expression = source.parse(reporter=self)
+            if parsing is not None:
+                from .ast_utils import tree_shape
+                parsing.tokens = len(source.tokens)
+                parsing.nodes, parsing.depth = tree_shape(expression)
+            return expression
+
+        with self.phase("scan") as scanning:
+            if isinstance(source, BYTE_SOURCES):
+                from .mapped_scanner import MappedScanner
+                scanner = MappedScanner(source, reporter=self)
+            else:
+                scanner = SCANNER_ENGINES[self.scanner_engine](source, reporter=self)
+            tokens = scanner.scan_tokens()
+        if scanning is not None:
+            if hasattr(tokens, "__len__"):
+                scanning.tokens = len(tokens)
+            else:
+                from .instrumentation import counted
+                tokens = counted(tokens, scanning)
+
+        with self.phase("parse") as parsing:
+            parser = PARSER_ENGINES[self.parser_engine](tokens, reporter=self)
+            expression = parser.parse()
+
+            for _ in parser.tokens:
+                pass  # a lazy token stream still has to report lexer errors past the end of the expression
+        if parsing is not None:
+            from .ast_utils import tree_shape
+            parsing.tokens = scanning.tokens
+            parsing.nodes, parsing.depth = tree_shape(expression)
+
+        return expression
+
+    def interpret(self, expression: Expr) -> None:
+        from .interpreter import LoxRuntimeError, stringify, expression_line
+        try:
+            value = EVALUATORS[self.evaluator](expression)
+            print(stringify(value), file=self.out)
+        except LoxRuntimeError as error:
+            self.runtime_error(error)
+        except RecursionError:
+            # the tree-walking and closure engines recurse, trees the iterative parsers build may be deeper than that
+            self.runtime_error(LoxRuntimeError(expression_line(expression), "Expression nests too deeply."))
+
+    def run_file(self, file_path: str) -> None:
+        if self.memory_map:
+            from .mapped_scanner import map_file
+            source = map_file(file_path)
+            digest = None
+            if self.ast_cache is not None:
+                import hashlib
+                digest = hashlib.sha256(source).digest()
+            self.run(source, digest, file_path)
+            return
+
+        digest = None
+        if self.ast_cache is not None:
+            # hashing raw bytes in chunks, so the streaming engine still never holds the whole script
+            import hashlib
+            with open(file_path, "rb") as file:
+                digest = hashlib.file_digest(file, "sha256").digest()
+
+        with open(file_path, "r") as file:
+            # streaming engine reads the file itself chunk by chunk
+            self.run(file if self.scanner_engine == "stream" else file.read(), digest, file_path)
@@ -0,0 +1,71 @@
+import io
+from typing import Iterator, TextIO
+from .tokens import TokenType, Token, KEYWORDS
+from .regex_scanner import TOKEN_PATTERN, OPERATORS
+from .diagnostics import Reporter, default_reporter
+
+
+class StreamScanner:
+    """Lazy variant of RegexScanner reading the source in chunks and yielding tokens as soon as they're complete,
+       so neither the whole script nor the whole token list has to be held in memory at once"""
+
+    def __init__(self, source: str | TextIO, chunk_size: int = 64 * 1024, reporter: Reporter | None = None) -> None:
+        self.reader = io.StringIO(source) if isinstance(source, str) else source
+        self.chunk_size = chunk_size
+        self.reporter = reporter or default_reporter()
+
+    def scan_tokens(self) -> Iterator[Token]:
+        read = self.reader.read
+        match_at = TOKEN_PATTERN.match
+        buffer = ""
+        pos = 0
+        line = 1
+        eof = False
+
+        while True:
+            m = match_at(buffer, pos)
+
+            # a lexeme touching the end of the buffer may continue in the next chunk (identifiers, numbers, strings,
+            # comments) and Lox looks 2 characters ahead (12.5, //, /*), so such matches are retried on more input
+            if m is None or (not eof and m.end() + 1 >= len(buffer)):
+                if eof:
+                    break
+                # reading at least as much as is pending keeps lexemes spanning many chunks linear overall
+                chunk = read(max(self.chunk_size, len(buffer) - pos))
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                eof = not chunk
+                continue
+
+            pos = m.end()
+            kind = m.lastgroup
+
+            if kind == "OPERATOR":
+                text = m[kind]
+                yield Token(OPERATORS[text], text, None, line)
+            elif kind == "IDENTIFIER":
+                text = m[kind]
+                yield Token(KEYWORDS.get(text, TokenType.IDENTIFIER), text, text, line)
+            elif kind == "NUMBER":
+                text = m[kind]
+                yield Token(TokenType.NUMBER, text, float(text), line)
+            elif kind == "NEWLINE" or kind == "C_COMMENT":
+                line += buffer.count("\n", m.start(kind), pos)
+            elif kind == "LINE_COMMENT":
+                pass
+            elif kind == "STRING":
+                line += buffer.count("\n", m.start(kind), pos)
+                text = m[kind]
+                yield Token(TokenType.STRING, text, text[1:-1], line)
+            else:
+                match kind:
+                    case "UNTERMINATED_C_COMMENT":
+                        line += buffer.count("\n", m.start(kind), pos)
+                        self.reporter.lexer_error(line, "Unterminated C-style comment.")
+                    case "UNTERMINATED_STRING":
+                        line += buffer.count("\n", m.start(kind), pos)
+                        self.reporter.lexer_error(line, "Unterminated string.")
+                    case _:
+                        self.reporter.lexer_error(line, "Unexpected character.")
+
+        yield Token(TokenType.EOF, "", None, line)
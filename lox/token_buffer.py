@@ -0,0 +1,62 @@
+from array import array
+from typing import Any, Iterator, Sequence, overload
+from .tokens import TokenType, Token, KEYWORDS
+
+
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+# tokens whose literal is the lexeme itself, everything else but NUMBER and STRING has no literal at all
+LEXEME_LITERALS = frozenset(KEYWORDS.values()) | {TokenType.IDENTIFIER}
+
+
+class TokenBuffer(Sequence[Token]):
+    """Columnar token storage - one compact array per Token field instead of a Token instance per token.
+       Lexemes are sliced out of the source on demand and only NUMBER and STRING literals are stored,
+       indexing or iterating the buffer creates short-lived Token views for existing callers."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.types = array("B")
+        self.starts = array("I")
+        self.lengths = array("I")
+        self.lines = array("I")
+        self.literals: dict[int, Any] = {}
+
+    def append(self, token_type: TokenType, start: int, length: int, line: int, literal: Any = None) -> None:
+        if literal is not None and token_type not in LEXEME_LITERALS:
+            self.literals[len(self.types)] = literal
+        self.types.append(token_type.value)
+        self.starts.append(start)
+        self.lengths.append(length)
+        self.lines.append(line)
+
+    def token_type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def lexeme(self, index: int) -> str:
+        start = self.starts[index]
+        return self.source[start:start + self.lengths[index]]
+
+    def literal(self, index: int) -> Any:
+        if TOKEN_TYPES[self.types[index]] in LEXEME_LITERALS:
+            return self.lexeme(index)
+        return self.literals.get(index)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    @overload
+    def __getitem__(self, index: int) -> Token: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[Token]: ...
+
+    def __getitem__(self, index: int | slice) -> Token | list[Token]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return Token(self.token_type(index), self.lexeme(index), self.literal(index), self.lines[index])
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.types)):
+            yield self[index]
@@ -1,9 +1,9 @@
-from enum import Enum, auto
-from dataclasses import dataclass
+from enum import IntEnum, auto
 from typing import Any
 
 
-class TokenType(Enum):
+class TokenType(IntEnum):
+    # plain ints underneath, so token types hash and compare at C speed and index the per-type tables below
     # Single-character tokens
     LEFT_PAREN = auto()
     RIGHT_PAREN = auto()
@@ -55,23 +55,41 @@ class TokenType(Enum):
     EOF = auto()
 
 
-@dataclass
 class Token:
+    # a plain class in the shape of the generated AST nodes rather than a @dataclass, which execs code it synthesizes
+    # (and imports dataclasses) on every start of the interpreter
+    __slots__ = ("token_type", "lexeme", "literal", "line")
+    __match_args__ = ("token_type", "lexeme", "literal", "line")
     token_type: TokenType
     lexeme: str
     literal: Any
     line: int
     # 4.2.3: side note on how to turn scanner offset into line and column numbers as a location of the token
-    # which is slow but only calculated for an erroneous token
+    # which is slow but only calculated for an erroneous token - LocatedToken of lox/mapped_scanner.py does just that
+    column: int | None = None  # only known for tokens of byte sources
+
+    def __init__(self, token_type: TokenType, lexeme: str, literal: Any, line: int) -> None:
+        self.token_type = token_type
+        self.lexeme = lexeme
+        self.literal = literal
+        self.line = line
 
     def __repr__(self) -> str:
         return (
-            f"Token({str(self.token_type)}, "
+            f"Token(TokenType.{self.token_type.name}, "
             f"lexeme={repr(self.lexeme)}, "
             f"literal={repr(self.literal)}, "
             f"line={repr(self.line)})"
         )
 
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            (self.token_type, self.lexeme, self.literal, self.line)
+            == (other.token_type, other.lexeme, other.literal, other.line)
+        )
+
 
 KEYWORDS = {
     "and": TokenType.AND,
@@ -91,3 +109,30 @@ KEYWORDS = {
     "var": TokenType.VAR,
     "while": TokenType.WHILE,
 }
+
+
+def type_table(entries: dict[TokenType, Any], default: Any) -> tuple:
+    """Table indexed by the int value of a token type, for the hot loops of scanners and parsers"""
+    table = [default] * (max(TokenType) + 1)
+    for token_type, value in entries.items():
+        table[token_type] = value
+    return tuple(table)
+
+
+# precedence levels of left-associative binary operators in assets/lox.gram, lowest first
+EQUALITY, COMPARISON, TERM, FACTOR = range(1, 5)
+
+BINARY_PRECEDENCE = {
+    TokenType.BANG_EQUAL: EQUALITY, TokenType.EQUAL_EQUAL: EQUALITY,
+    TokenType.GREATER: COMPARISON, TokenType.GREATER_EQUAL: COMPARISON,
+    TokenType.LESS: COMPARISON, TokenType.LESS_EQUAL: COMPARISON,
+    TokenType.MINUS: TERM, TokenType.PLUS: TERM,
+    TokenType.SLASH: FACTOR, TokenType.STAR: FACTOR,
+}
+
+BINARY_LEVELS = type_table(BINARY_PRECEDENCE, 0)  # 0 for anything but a binary operator
+UNARY_CAPABLE = type_table({TokenType.BANG: True, TokenType.MINUS: True}, False)
+STATEMENT_STARTS = type_table(dict.fromkeys([
+    TokenType.CLASS, TokenType.FUN, TokenType.VAR, TokenType.FOR, TokenType.IF, TokenType.WHILE, TokenType.PRINT,
+    TokenType.RETURN,
+], True), False)
@@ -4,10 +4,13 @@ from enum import Enum
 from pathlib import Path
 
 from .ast_generator import generate_ast_module
+from .parser_generator import generate_parser_module
+from .grammar import GRAMMAR_PATH
 
 
 class __Mode(Enum):
 	AST_GEN = "ast_gen"
+	PARSER_GEN = "parser_gen"
 
 
 def __parse_params() -> argparse.Namespace:
@@ -15,10 +18,13 @@ def __parse_params() -> argparse.Namespace:
 
 	parser.add_argument("mode", type=__Mode, )
 
+	# AST_GEN and PARSER_GEN mode params
+	parser.add_argument("--gram", type=Path, help="Grammar definition file", default=GRAMMAR_PATH)
+	parser.add_argument("--lox_root", type=Path, help="Lox root directory to insert with generated modules", default=Path("lox"))
+
 	# AST_GEN mode params
-	# TODO (1): AST generator operating on assets/lox.gram
-	# parser.add_argument("--gram", type=Path, help="Grammar definition file")
-	parser.add_argument("--lox_root", type=Path, help="Lox root directory to insert with expressions module", default=Path("lox"))
+	parser.add_argument("--slots", action="store_true", help="Generate nodes with __slots__ instead of __dict__")
+	parser.add_argument("--frozen", action="store_true", help="Generate immutable nodes")
 
 	params = parser.parse_args()
 	return params
@@ -29,8 +35,9 @@ def main() -> None:
 
 	match p.mode:
 		case __Mode.AST_GEN:
-			# TODO (1): grammar def file as `gram` parameter here
-			generate_ast_module(lox_root=p.lox_root)
+			generate_ast_module(lox_root=p.lox_root, slots=p.slots, frozen=p.frozen, gram=p.gram)
+		case __Mode.PARSER_GEN:
+			generate_parser_module(lox_root=p.lox_root, gram=p.gram)
 		case _:
 			print(f"No implemetation for mode {p.mode}")
 
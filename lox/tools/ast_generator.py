@@ -1,6 +1,8 @@
 import sys
 from pathlib import Path
 
+from .grammar import GRAMMAR_PATH, read_grammar
+
 # istg I need to learn macros in Rust
 
 
@@ -8,45 +10,85 @@ NLNL = "\n\n"
 TAB = "    "  # 4 spaces in lieu of \t
 
 IMPORTS = [
-    "from dataclasses import dataclass",
     "from typing import Any",
     "from .tokens import Token",
 ]
+FROZEN_IMPORTS = ["from dataclasses import FrozenInstanceError"]
 
-EXPRS = [
-    "Binary -> left: Expr, operator: Token, right: Expr",
-    "Grouping -> expression: Expr",
-    "Literal -> value: Any",
-    "Unary -> operator: Token, right: Expr",
-    "Conditional -> condition: Expr, then_branch: Expr, else_branch: Expr"
-]
 
+def quoted(names: list[str]) -> str:
+    return ", ".join(f'"{name}"' for name in names) + ("," if len(names) == 1 else "")
 
-def generate_expr_meta_dataclass(expr_def: str) -> str:
+
+def generate_expr_class(expr_def: str, slots: bool = False, frozen: bool = False) -> str:
+    """Plain class of a node with everything @dataclass would have synthesized written out, so importing the module
+       doesn't exec generated code for every node class (nor import dataclasses) at each start of the interpreter.
+       Fields with a default are like dataclass fields with compare=False - left out of comparisons, hashes, reprs
+       and positional patterns, they only tell about a node (e.g. where it came from) instead of being a part of it."""
     class_name, fields = expr_def.split("->")
     class_name, fields = [s.strip() for s in [class_name, fields]]
     fields = [f.strip() for f in fields.split(",")]
+    all_names = [field.split(":")[0].strip() for field in fields]
+    names = [field.split(":")[0].strip() for field in fields if "=" not in field]
 
-    meta_class_def = "@dataclass\n" + f"class {class_name}(Expr):\n"
+    meta_class_def = f"class {class_name}(Expr):\n"
+    if slots:
+        meta_class_def += f"{TAB}__slots__ = ({quoted(all_names)})\n"
+    meta_class_def += f"{TAB}__match_args__ = ({quoted(names)})  # positional pattern matching on nodes\n"
     for field in fields:
-        meta_class_def += f"{TAB}{field}\n"
+        meta_class_def += f"{TAB}{field.split('=')[0].strip()}\n"
+
+    meta_class_def += f"\n{TAB}def __init__(self, {', '.join(fields)}) -> None:\n"
+    for name in all_names:
+        if frozen:
+            meta_class_def += f'{TAB * 2}object.__setattr__(self, "{name}", {name})\n'
+        else:
+            meta_class_def += f"{TAB * 2}self.{name} = {name}\n"
+
+    values = ", ".join(f"{name}={{self.{name}!r}}" for name in names)
+    meta_class_def += f"\n{TAB}def __repr__(self) -> str:\n"
+    meta_class_def += f'{TAB * 2}return f"{class_name}({values})"\n'
+
+    meta_class_def += f"\n{TAB}def __eq__(self, other: object) -> bool:\n"
+    meta_class_def += f"{TAB * 2}if other.__class__ is not self.__class__:\n"
+    meta_class_def += f"{TAB * 3}return NotImplemented\n"
+    if len(names) == 1:
+        meta_class_def += f"{TAB * 2}return self.{names[0]} == other.{names[0]}\n"
+    else:
+        others = ", ".join(f"other.{name}" for name in names)
+        meta_class_def += f"{TAB * 2}return (self.{', self.'.join(names)}) == ({others})\n"
+
+    if frozen:
+        meta_class_def += f"\n{TAB}def __hash__(self) -> int:\n"
+        own_values = ", ".join(f"self.{name}" for name in names) + ("," if len(names) == 1 else "")
+        meta_class_def += f"{TAB * 2}return hash(({own_values}))\n"
+        meta_class_def += f"\n{TAB}def __setattr__(self, name: str, value: Any) -> None:\n"
+        meta_class_def += f'{TAB * 2}raise FrozenInstanceError(f"cannot assign to field {{name!r}}")\n'
+        meta_class_def += f"\n{TAB}def __delattr__(self, name: str) -> None:\n"
+        meta_class_def += f'{TAB * 2}raise FrozenInstanceError(f"cannot delete field {{name!r}}")\n'
 
     return meta_class_def
 
 
-def generate_ast_module(lox_root: Path) -> None:
+def render_ast_module(slots: bool = False, frozen: bool = False, gram: Path = GRAMMAR_PATH) -> str:
+    """Source of the expressions module with the nodes declared in the grammar,
+       with slots every node (and the Expr base) gets __slots__ instead of __dict__"""
+    module = "".join(map(lambda i: i + "\n", (FROZEN_IMPORTS if frozen else []) + IMPORTS))
+    module += NLNL
+    module += f"class Expr:\n{TAB}__slots__ = ()\n" if slots else f"class Expr:\n{TAB}pass\n"
+
+    for expr in read_grammar(gram).node_defs():
+        module += NLNL
+        module += generate_expr_class(expr, slots, frozen)
+
+    return module
+
+
+def generate_ast_module(lox_root: Path, slots: bool = False, frozen: bool = False, gram: Path = GRAMMAR_PATH) -> None:
     assert lox_root.is_dir(), "Expressions module will be generated automatically in a Lox root directory"
     print("Generating AST module into Lox root directory at:", lox_root.absolute())
 
     module_path = lox_root / "expressions.py"
     print("Generating expression.py file:", module_path.absolute())
     with open(module_path, "w") as ast_file:
-
-        ast_file.writelines(map(lambda i: i + "\n", IMPORTS))
-        ast_file.write(NLNL)
-        ast_file.write(f"class Expr:\n{TAB}pass\n")
-
-        for expr in EXPRS:
-            ast_file.write(NLNL)
-            meta_class_def = generate_expr_meta_dataclass(expr)
-            ast_file.write(meta_class_def)
+        ast_file.write(render_ast_module(slots, frozen, gram))
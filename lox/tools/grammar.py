@@ -0,0 +1,201 @@
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+GRAMMAR_PATH = Path(__file__).parent.parent.parent / "assets" / "lox.gram"
+
+TOKEN_PATTERN = re.compile(
+    r'(?P<skip>\s+|#[^\n]*)|"(?P<string>[^"\n]*)"|(?P<name>[A-Za-z_]\w*)|(?P<number>\d+)|(?P<symbol>→|::|[;|(){}?*+!^:,=])'
+)
+
+
+class GrammarError(ValueError):
+    pass
+
+
+@dataclass
+class Terminal:
+    """A single lexeme, with the message reported when it's expected but missing"""
+    lexeme: str
+    message: str | None = None
+
+
+@dataclass
+class Choice:
+    """One of a parenthesized set of lexemes, the token matched is kept"""
+    lexemes: list[str]
+
+
+@dataclass
+class TokenName:
+    name: str  # of TokenType, e.g. NUMBER
+
+
+@dataclass
+class RuleRef:
+    name: str
+
+
+@dataclass
+class Report:
+    """Error reported at the token matched just before, the alternative goes on to build an error node"""
+    message: str
+
+
+@dataclass
+class Sequence:
+    """An alternative of a rule, or a group within one when quantified with ?, * or +"""
+    items: list = field(default_factory=list)
+    node: str | None = None
+    quantifier: str | None = None
+
+
+@dataclass
+class Fail:
+    """Alternative raising an error when none of the others matched"""
+    message: str
+
+
+@dataclass
+class Rule:
+    name: str
+    alternatives: list[Sequence | Fail]
+
+
+@dataclass
+class Grammar:
+    nodes: dict[str, list[tuple[str, str]]]  # node name -> (field name, type) pairs
+    rules: dict[str, Rule]  # in order of definition, the first one is the start rule
+    # node name -> (field name, type, default) of fields after the ones rules build nodes of, left out of comparisons
+    extra_fields: dict[str, list[tuple[str, str, str]]] = field(default_factory=dict)
+
+    def node_defs(self) -> list[str]:
+        """Nodes in the "Name -> field: Type, ..., extra: Type = default" form of the AST generator"""
+        return [
+            f"{name} -> " + ", ".join(
+                [f"{field}: {annotation}" for field, annotation in fields]
+                + [f"{field}: {annotation} = {default}" for field, annotation, default in self.extra_fields.get(name, [])]
+            )
+            for name, fields in self.nodes.items()
+        ]
+
+
+class GrammarReader:
+    """Recursive descent reader of the .gram notation (see the end of assets/lox.gram)"""
+
+    def __init__(self, text: str) -> None:
+        self.tokens: list[tuple[str, str, int]] = []  # kind, text, line
+        line, position = 1, 0
+        while position < len(text):
+            m = TOKEN_PATTERN.match(text, position)
+            if m is None:
+                raise GrammarError(f"[line {line}] Unexpected character {text[position]!r}.")
+            if m.lastgroup != "skip":
+                self.tokens.append((m.lastgroup, m[m.lastgroup], line))
+            line += m[0].count("\n")
+            position = m.end()
+        self.tokens.append(("eof", "", line))
+        self.current = 0
+
+    def read(self) -> Grammar:
+        grammar = Grammar({}, {})
+        while self.peek()[0] != "eof":
+            name = self.expect("name")
+            if self.match("::"):
+                grammar.nodes[name], extra_fields = self.fields()
+                if extra_fields:
+                    grammar.extra_fields[name] = extra_fields
+            else:
+                self.expect("→")
+                grammar.rules[name] = Rule(name, self.alternatives())
+            self.expect(";")
+        return grammar
+
+    def fields(self) -> tuple[list[tuple[str, str]], list[tuple[str, str, str]]]:
+        fields, extra_fields = [], []
+        while True:
+            name = self.expect("name")
+            self.expect(":")
+            annotation = self.expect("name")
+            if self.match("="):
+                default = self.expect("number") if self.peek()[0] == "number" else self.expect("name")
+                extra_fields.append((name, annotation, default))
+            elif extra_fields:
+                self.fail("Expect a default of a field following one with a default")
+            else:
+                fields.append((name, annotation))
+            if not self.match(","):
+                return fields, extra_fields
+
+    def alternatives(self) -> list[Sequence | Fail]:
+        alternatives = [self.alternative()]
+        while self.match("|"):
+            alternatives.append(self.alternative())
+        return alternatives
+
+    def alternative(self) -> Sequence | Fail:
+        if self.match("!"):
+            return Fail(self.expect("string"))
+
+        sequence = Sequence()
+        while (item := self.item()) is not None:
+            sequence.items.append(item)
+        if not sequence.items:
+            self.fail("Expect an item of an alternative")
+        if self.match("{"):
+            sequence.node = self.expect("name")
+            self.expect("}")
+        return sequence
+
+    def item(self) -> Terminal | Choice | TokenName | RuleRef | Report | Sequence | None:
+        kind, text, _ = self.peek()
+        if kind == "string":
+            self.current += 1
+            return Terminal(text, self.expect("string") if self.match("!") else None)
+        if kind == "name":
+            self.current += 1
+            return TokenName(text) if text.isupper() else RuleRef(text)
+        if self.match("^"):
+            return Report(self.expect("string"))
+        if not self.match("("):
+            return None
+
+        alternatives = self.alternatives()
+        self.expect(")")
+        quantifier = next((q for q in "?*+" if self.match(q)), None)
+        if all(isinstance(a, Sequence) and len(a.items) == 1 and type(a.items[0]) is Terminal and a.node is None
+               and a.items[0].message is None for a in alternatives):
+            if quantifier is not None:
+                self.fail("Expect a choice of terminals without a quantifier")
+            return Choice([a.items[0].lexeme for a in alternatives])
+        if len(alternatives) != 1 or isinstance(alternatives[0], Fail):
+            self.fail("Expect a single sequence in a group of anything but terminals")
+        group = alternatives[0]
+        group.quantifier = quantifier
+        return group
+
+    def peek(self) -> tuple[str, str, int]:
+        return self.tokens[self.current]
+
+    def match(self, symbol: str) -> bool:
+        kind, text, _ = self.peek()
+        if kind == "symbol" and text == symbol:
+            self.current += 1
+            return True
+        return False
+
+    def expect(self, kind_or_symbol: str) -> str:
+        kind, text, _ = self.peek()
+        if kind == kind_or_symbol or (kind == "symbol" and text == kind_or_symbol):
+            self.current += 1
+            return text
+        self.fail(f"Expect {kind_or_symbol}")
+
+    def fail(self, message: str) -> None:
+        kind, text, line = self.peek()
+        raise GrammarError(f"[line {line}] {message}, got {text!r}." if kind != "eof" else f"[line {line}] {message}, got end of file.")
+
+
+def read_grammar(path: Path = GRAMMAR_PATH) -> Grammar:
+    return GrammarReader(path.read_text()).read()
@@ -0,0 +1,280 @@
+import json
+from pathlib import Path
+
+from lox.tokens import TokenType, KEYWORDS
+from lox.regex_scanner import OPERATORS
+from .grammar import (
+    Grammar, GrammarError, Rule, Sequence, Fail, Terminal, Choice, TokenName, RuleRef, Report, GRAMMAR_PATH, read_grammar
+)
+
+
+TAB = "    "  # 4 spaces in lieu of \t
+
+HEADER = [
+    "# generated by python -m lox.tools parser_gen out of assets/lox.gram, regenerate it instead of editing",
+    "from .tokens import TokenType as TT",
+    "from .expressions import Expr",
+    "from .parser import Parser, ParseError",
+]
+
+LEXEMES = OPERATORS | KEYWORDS
+KEYWORD_VALUES = {"true": True, "false": False, "nil": None}  # keywords standing for a value of a node field
+
+
+class ParserGenerator:
+    """Renders a Parser subclass with a method per rule of the grammar. Every precedence level becomes straight-line
+       code testing the current token against a frozenset constant (or a single token type) instead of going through
+       the generic binary_left_assoc, alternatives dispatch on the token their first item matches.
+
+       The grammar has to be LL(1) in the shape the hand-written parser already is: alternatives and groups start
+       with a terminal, a choice of them or a token name, but for the last alternative which may start with a rule.
+       Syntax errors propagating through a sequence building a node get the node of what it matched so far as their
+       partial tree, with the partial tree of the error in place of the field that failed and error nodes for the
+       fields after it."""
+
+    def __init__(self, grammar: Grammar) -> None:
+        self.grammar = grammar
+        self.constants: dict[tuple[TokenType, ...], str] = {}  # frozenset constants by their token types
+        self.constant_lines: list[str] = []
+
+    def render(self, class_name: str = "GeneratedParser") -> str:
+        methods = [self.rule(rule) for rule in self.grammar.rules.values()]
+
+        module = "\n".join(HEADER) + "\n\n\n"
+        if self.constant_lines:
+            module += "\n".join(self.constant_lines) + "\n\n\n"
+        module += f"class {class_name}(Parser):\n"
+        module += f'{TAB}"""Recursive descent parser generated from the grammar, a drop-in for Parser"""\n'
+        for lines in methods:
+            module += "\n" + "".join(f"{TAB}{line}\n" if line else "\n" for line in lines)
+        return module
+
+    def rule(self, rule: Rule) -> list[str]:
+        nullable = any(
+            a.node is None and any(isinstance(item, Report) for item in a.items)
+            for a in rule.alternatives if isinstance(a, Sequence)
+        )
+        lines = [f"def {rule.name}(self) -> {'Expr | None' if nullable else 'Expr'}:"]
+
+        alternatives = rule.alternatives
+        if len(alternatives) == 1 and not (isinstance(alternatives[0], Sequence) and self.first(alternatives[0].items[0])):
+            return lines + indent(self.alternative(alternatives[0], rule))
+
+        branches: list[tuple[list[TokenType], list[str]]] = []
+        default = None
+        for alternative in alternatives:
+            if default is not None:
+                raise GrammarError(f"Alternatives of {rule.name} past one without a leading token are unreachable.")
+            body = self.alternative(alternative, rule)
+            first = self.first(alternative.items[0]) if isinstance(alternative, Sequence) else None
+            if first is None:
+                default = body
+            elif branches and branches[-1][1] == body:
+                branches[-1][0].extend(first)  # adjacent alternatives doing the same, e.g. literals of any token
+            else:
+                branches.append((first, body))
+
+        lines.append(f"{TAB}token_type = self.current_token.token_type")
+        for token_types, body in branches:
+            lines.append(f"{TAB}if {self.test('token_type', rule, token_types)}:")
+            lines += indent(indent(body))
+        if default is None:
+            raise GrammarError(f"Rule {rule.name} falls through without a node, end it with a ! \"message\" alternative.")
+        return lines + indent(default)
+
+    def alternative(self, alternative: Sequence | Fail, rule: Rule) -> list[str]:
+        if isinstance(alternative, Fail):
+            return [f"raise self.error(self.peek(), {string(alternative.message)})"]
+        lines, result = self.sequence(alternative, rule, accumulator=None)
+        if result == "expr" and lines[-1].startswith("expr = "):
+            return lines[:-1] + [f"return {lines[-1].removeprefix('expr = ')}"]  # e.g. a single rule to descend into
+        return lines + [f"return {result}"]
+
+    def sequence(self, sequence: Sequence, rule: Rule, accumulator: str | None) -> tuple[list[str], str | None]:
+        """Statements matching a sequence and the expression of what it yields, one matching its first item has to be
+           preceded by a test of it. An accumulator holds what was built so far before a quantified group."""
+        items = sequence.items
+        reported = any(isinstance(item, Report) for item in items)
+        captured = [i for i, item in enumerate(items) if self.captures(item)]
+        if sequence.node is not None:
+            if sequence.node not in self.grammar.nodes:
+                raise GrammarError(f"Rule {rule.name} builds an undeclared node {sequence.node}.")
+            fields = self.grammar.nodes[sequence.node][1 if accumulator else 0:]
+            if len(fields) != len(captured):
+                raise GrammarError(f"Rule {rule.name} matches {len(captured)} items for the fields of {sequence.node}.")
+            names = dict(zip(captured, fields))
+        elif reported or not captured:
+            names = {}
+        elif len(captured) == 1:
+            names = {captured[0]: ("expr", "Expr")}
+        else:
+            raise GrammarError(f"Rule {rule.name} matches {len(captured)} items without building a node of them.")
+
+        lines: list[str] = []
+        values: list[str] = []
+        built = [accumulator] if accumulator else []  # values of the node built so far, fields past them missing
+        pending: list[str] = []  # consumed punctuation, its errors are the ones of the next field
+        for i, item in enumerate(items):
+            reporting = i + 1 < len(items) and isinstance(items[i + 1], Report)
+            name, annotation = names.get(i, (None, None))
+            match item:
+                case RuleRef(rule_name):
+                    if rule_name not in self.grammar.rules:
+                        raise GrammarError(f"Rule {rule.name} refers to an undefined rule {rule_name}.")
+                    call = f"{name} = self.{rule_name}()" if name else f"self.{rule_name}()"
+                    if sequence.node is None:
+                        lines.append(call)
+                    else:
+                        missing = len(self.grammar.nodes[sequence.node]) - len(built) - 1
+                        partial = built + ["err.partial"] + ["self.factory.error(err.token, None)"] * missing
+                        lines += recover(pending + [call], sequence.node, partial)
+                        pending = []
+                        built.append(name)
+                case Terminal() | Choice() | TokenName() if i == 0 or not isinstance(item, Choice):
+                    token = self.consume(item) if i else None  # the first one was tested already
+                    if i and sequence.node is not None:
+                        if name is not None:
+                            raise GrammarError(f"Rule {rule.name} builds {sequence.node} of a token past its start.")
+                        pending.append(token)
+                    elif reporting and name is not None:
+                        lines += advance(name) + [f"self.error({name}, {string(items[i + 1].message)})"]
+                    elif reporting:
+                        lines.append(f"self.error({token or 'self.advance()'}, {string(items[i + 1].message)})")
+                    elif name is None or isinstance(item, Terminal) and annotation != "Token":
+                        lines += [token] if token else advance()
+                    elif annotation == "Token":
+                        lines += [f"{name} = {token}"] if token else advance(name)
+                    else:
+                        lines += [f"{name} = {token}.literal"] if token else [f"{name} = self.current_token.literal"] + advance()
+                    if name is not None and isinstance(item, Terminal) and annotation != "Token":
+                        if item.lexeme not in KEYWORD_VALUES:
+                            raise GrammarError(f"Rule {rule.name} gives {item.lexeme} to {name}, a field of no token.")
+                        values.append(repr(KEYWORD_VALUES[item.lexeme]))
+                        built.append(values[-1])
+                        continue
+                    if name is not None:
+                        built.append(name)
+                case Report():
+                    if i == 0 or not isinstance(items[i - 1], Terminal | Choice | TokenName):
+                        raise GrammarError(f"Rule {rule.name} reports an error past something other than a token.")
+                case Sequence():
+                    built = any(names.get(j, (None,))[0] == "expr" for j in range(i))
+                    lines += self.group(item, rule, "expr" if built else None)
+                case _:
+                    raise GrammarError(f"Rule {rule.name} has a choice of terminals past the start of a sequence.")
+            if name is not None:
+                values.append(name)
+
+        if pending:  # punctuation closing the sequence, what it follows is kept in an error node
+            if not values:
+                lines += pending
+            else:
+                partial = built[:-1] + [f"self.factory.error(err.token, {built[-1]})"]
+                lines += recover(pending, sequence.node, partial)
+
+        if reported and sequence.node is None:
+            return lines, None
+        if sequence.node is not None:
+            factory = f"self.factory.{sequence.node.lower()}"
+            return lines, f"{factory}({', '.join([accumulator] * bool(accumulator) + values)})"
+        return lines, "expr" if captured else accumulator
+
+    def group(self, group: Sequence, rule: Rule, accumulator: str | None) -> list[str]:
+        if accumulator is None or group.node is None:
+            raise GrammarError(f"Groups of {rule.name} must follow what they build upon and build a node.")
+        first = self.first(group.items[0])
+        if first is None:
+            raise GrammarError(f"Groups of {rule.name} have to start with a token.")
+        keyword = {"?": "if", "*": "while"}.get(group.quantifier)
+        if keyword is None:
+            raise GrammarError(f"Groups quantified with {group.quantifier} aren't supported by the generator.")
+
+        lines, result = self.sequence(group, rule, accumulator)
+        return [f"{keyword} {self.test('self.current_token.token_type', rule, first)}:"] + indent(
+            lines + [f"{accumulator} = {result}"]
+        )
+
+    def captures(self, item) -> bool:
+        """Whether an item yields a value for a node - rules, tokens and chosen terminals but for punctuation"""
+        match item:
+            case RuleRef() | TokenName() | Choice():
+                return True
+            case Terminal(lexeme):
+                return lexeme.isalpha()
+        return False
+
+    def first(self, item) -> list[TokenType] | None:
+        match item:
+            case Terminal(lexeme):
+                return [self.token_type(lexeme)]
+            case Choice(lexemes):
+                return [self.token_type(lexeme) for lexeme in lexemes]
+            case TokenName(name):
+                if name not in TokenType.__members__:
+                    raise GrammarError(f"Unknown token type {name}.")
+                return [TokenType[name]]
+        return None
+
+    def consume(self, item: Terminal | TokenName) -> str:
+        [token_type] = self.first(item)
+        if isinstance(item, TokenName):
+            message = f"Expect {item.name.lower()}."
+        else:
+            message = item.message or f"Expect '{item.lexeme}'."
+        return f"self.consume(TT.{token_type.name}, {string(message)})"
+
+    def token_type(self, lexeme: str) -> TokenType:
+        if lexeme not in LEXEMES:
+            raise GrammarError(f"Unknown terminal {lexeme!r}.")
+        return LEXEMES[lexeme]
+
+    def test(self, token_type: str, rule: Rule, token_types: list[TokenType]) -> str:
+        """Membership test of a token type, constants are shared by all rules testing for the same set"""
+        if len(token_types) == 1:
+            return f"{token_type} is TT.{token_types[0].name}"
+        key = tuple(token_types)
+        if key not in self.constants:
+            prefix = f"{rule.name.upper()}_"
+            name = f"{prefix}{sum(constant.startswith(prefix) for constant in self.constants.values()) + 1}"
+            self.constants[key] = name
+            lexemes = {token_type: lexeme for lexeme, token_type in LEXEMES.items()}
+            members = ", ".join(f"TT.{t.name}" for t in token_types)
+            alternatives = " | ".join(f'"{lexemes[t]}"' if t in lexemes else t.name for t in token_types)
+            self.constant_lines.append(f"{name} = frozenset(({members}))  # {alternatives}")
+        return f"{token_type} in {self.constants[key]}"
+
+
+def string(text: str) -> str:
+    return json.dumps(text, ensure_ascii=False)  # a double-quoted Python literal as well
+
+
+def recover(lines: list[str], node: str, partial: list[str]) -> list[str]:
+    """Statements giving the syntax errors they raise a partial tree of the node they're a part of"""
+    return ["try:"] + indent(lines) + [
+        "except ParseError as err:",
+        f"{TAB}err.partial = self.factory.{node.lower()}({', '.join(partial)})",
+        f"{TAB}raise",
+    ]
+
+
+def advance(target: str | None = None) -> list[str]:
+    """Parser.advance inlined, a token already tested against a set of types is never EOF"""
+    previous = f"{target} = self.previous_token" if target else "self.previous_token"
+    return [f"{previous} = self.current_token", "self.current_token = next(self.tokens)"]
+
+
+def indent(lines: list[str]) -> list[str]:
+    return [TAB + line for line in lines]
+
+
+def render_parser_module(gram: Path = GRAMMAR_PATH) -> str:
+    return ParserGenerator(read_grammar(gram)).render()
+
+
+def generate_parser_module(lox_root: Path, gram: Path = GRAMMAR_PATH) -> None:
+    assert lox_root.is_dir(), "Parser module will be generated automatically in a Lox root directory"
+
+    module_path = lox_root / "generated_parser.py"
+    print("Generating generated_parser.py file:", module_path.absolute())
+    with open(module_path, "w") as parser_file:
+        parser_file.write(render_parser_module(gram))
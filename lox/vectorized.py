@@ -0,0 +1,224 @@
+from itertools import repeat
+from typing import Any, Callable, Mapping, Sequence
+from .tokens import Token, TokenType as TT
+from .expressions import Expr, Binary, Grouping, Literal, Unary, Conditional, Variable, Error
+from .interpreter import LoxRuntimeError, compile_binary, compile_unary, is_truthy, undefined_variable, syntax_error
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("lox.vectorized needs NumPy, install plox with the vectorized extra") from error
+
+
+# values of a node over the rows it's evaluated on are either a scalar (Lox value the same for every row, literals
+# and what's computed from them only) or a column - float64 if all rows are numbers, bool if all are booleans and
+# object holding Lox values otherwise. Only the first two are computed by NumPy, object columns by the scalar path.
+NUMBER, BOOLEAN, OBJECT = range(3)
+
+NUMPY_OPERATORS: dict[TT, Callable[[Any, Any], np.ndarray]] = {
+    TT.PLUS: np.add,
+    TT.MINUS: np.subtract,
+    TT.STAR: np.multiply,
+    TT.SLASH: np.divide,
+    TT.GREATER: np.greater,
+    TT.GREATER_EQUAL: np.greater_equal,
+    TT.LESS: np.less,
+    TT.LESS_EQUAL: np.less_equal,
+}
+DTYPES = {NUMBER: np.float64, BOOLEAN: np.bool_, OBJECT: object}
+LOX_TYPES = {type(None), bool, float, str}
+
+
+def kind(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return NUMBER if value.dtype == np.float64 else BOOLEAN if value.dtype == np.bool_ else OBJECT
+    return NUMBER if type(value) is float else BOOLEAN if type(value) is bool else OBJECT
+
+
+def lox_value(value: Any) -> Any:
+    if value is None or type(value) is bool or type(value) is float or type(value) is str:
+        return value
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    raise ValueError(f"Can't evaluate Lox expressions over values of type {type(value).__name__}")
+
+
+def tighten(values: list[Any]) -> np.ndarray:
+    """Column of Lox values, as a float64 or bool one if they're all numbers or all booleans"""
+    types = set(map(type, values))
+    if types == {float}:
+        return np.array(values, dtype=np.float64)
+    if types == {bool}:
+        return np.array(values, dtype=np.bool_)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def to_column(values: Sequence[Any] | np.ndarray) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        if values.ndim != 1:
+            raise ValueError(f"Columns must be one-dimensional, got {values.ndim} dimensions")
+        if values.dtype == np.bool_:
+            return values
+        if values.dtype.kind in "iuf":
+            return values.astype(np.float64, copy=False)
+        values = values.tolist()
+    # lists aren't put through np.asarray, which would turn numbers mixed with strings into strings
+    if not set(map(type, values)) <= LOX_TYPES:
+        values = [lox_value(value) for value in values]
+    return tighten(values)
+
+
+class Rows:
+    """Rows an expression is evaluated on - all of the input or the ones taking a branch of a conditional. Columns
+       are converted (or masked down from the enclosing rows) the first time a variable is used on them."""
+    __slots__ = ("source", "mask", "count", "columns")
+
+    def __init__(self, source: "Mapping[str, Any] | Rows", count: int, mask: np.ndarray | None = None) -> None:
+        self.source = source
+        self.mask = mask
+        self.count = count
+        self.columns: dict[str, np.ndarray] = {}
+
+    def column(self, name: Token) -> np.ndarray:
+        column = self.columns.get(name.lexeme)
+        if column is None:
+            if isinstance(self.source, Rows):
+                column = self.source.column(name)[self.mask]
+                if column.dtype == object:
+                    # e.g. numbers left after the rows holding nil took the other branch are computed by NumPy again
+                    column = tighten(column.tolist())
+            else:
+                try:
+                    column = to_column(self.source[name.lexeme])
+                except KeyError:
+                    raise undefined_variable(name) from None
+                if len(column) != self.count:
+                    raise ValueError(f"Column {name.lexeme} has {len(column)} rows, expected {self.count}")
+            self.columns[name.lexeme] = column
+        return column
+
+    def select(self, mask: np.ndarray) -> "Rows":
+        return Rows(self, int(np.count_nonzero(mask)), mask)
+
+
+def truthy(value: Any) -> np.ndarray | bool:
+    if not isinstance(value, np.ndarray):
+        return is_truthy(value)
+    if value.dtype == np.bool_:
+        return value
+    if value.dtype == np.float64:
+        return np.ones(len(value), dtype=np.bool_)
+    return np.array([cell is not None and cell is not False for cell in value.tolist()], dtype=np.bool_)
+
+
+def cells(value: Any) -> Callable[[], Any]:
+    """Operand of a closure compiled by the interpreter yielding the value of the next row on every call"""
+    return iter(value.tolist()).__next__ if isinstance(value, np.ndarray) else repeat(value).__next__
+
+
+def scalar_unary(operator: Token, right: Any, count: int) -> Any:
+    if not isinstance(right, np.ndarray):
+        return compile_unary(operator, lambda: right)()
+    run = compile_unary(operator, cells(right))
+    return tighten([run() for _ in range(count)])
+
+
+def scalar_binary(left: Any, operator: Token, right: Any, count: int) -> Any:
+    if not isinstance(left, np.ndarray) and not isinstance(right, np.ndarray):
+        return compile_binary(lambda: left, operator, lambda: right)()
+    run = compile_binary(cells(left), operator, cells(right))
+    return tighten([run() for _ in range(count)])
+
+
+def unary(operator: Token, right: Any, count: int) -> Any:
+    if isinstance(right, np.ndarray):
+        if operator.token_type == TT.BANG:
+            return ~truthy(right)
+        if right.dtype == np.float64:
+            return np.negative(right)
+    return scalar_unary(operator, right, count)
+
+
+def binary(left: Any, operator: Token, right: Any, count: int) -> Any:
+    token_type = operator.token_type
+    if isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+        left_kind, right_kind = kind(left), kind(right)
+        if token_type == TT.EQUAL_EQUAL or token_type == TT.BANG_EQUAL:
+            # values of different kinds are never equal, true == 1 included, and comparing object columns with nil
+            # or a string leaves nothing for Python's == to get wrong either
+            scalar = right if isinstance(left, np.ndarray) else left
+            if left_kind != OBJECT and right_kind != OBJECT or scalar is None or type(scalar) is str:
+                if left_kind == right_kind:
+                    equal = np.equal(left, right).astype(np.bool_, copy=False)
+                else:
+                    equal = np.zeros(count, dtype=np.bool_)
+                return equal if token_type == TT.EQUAL_EQUAL else ~equal
+        elif left_kind == NUMBER and right_kind == NUMBER:
+            if token_type == TT.SLASH and np.any(np.equal(right, 0)):
+                raise LoxRuntimeError(operator.line, "Division by zero.")
+            return NUMPY_OPERATORS[token_type](left, right)
+    # strings, nil and mixed types - every row goes through the interpreter's closures, errors included
+    return scalar_binary(left, operator, right, count)
+
+
+def merge(mask: np.ndarray, then_value: Any, else_value: Any) -> np.ndarray:
+    then_kind, else_kind = kind(then_value), kind(else_value)
+    merged = np.empty(len(mask), dtype=DTYPES[then_kind] if then_kind == else_kind else object)
+    merged[mask] = then_value
+    merged[~mask] = else_value
+    return merged
+
+
+def evaluate_rows(expr: Expr, rows: Rows) -> Any:
+    match expr:
+        case Literal(value):
+            return value
+        case Variable(name):
+            return rows.column(name)
+        case Grouping(expression):
+            return evaluate_rows(expression, rows)
+        case Unary(operator, right):
+            return unary(operator, evaluate_rows(right, rows), rows.count)
+        case Binary(left, operator, right):
+            return binary(evaluate_rows(left, rows), operator, evaluate_rows(right, rows), rows.count)
+        case Conditional(condition, then_branch, else_branch):
+            condition = truthy(evaluate_rows(condition, rows))
+            if not isinstance(condition, np.ndarray):
+                return evaluate_rows(then_branch if condition else else_branch, rows)
+            if condition.all():
+                return evaluate_rows(then_branch, rows)
+            if not condition.any():
+                return evaluate_rows(else_branch, rows)
+            # like np.where, but each branch only ever sees the rows taking it, so it can't fail on the others
+            then_value = evaluate_rows(then_branch, rows.select(condition))
+            else_value = evaluate_rows(else_branch, rows.select(~condition))
+            return merge(condition, then_value, else_value)
+        case Error(token, _):
+            raise syntax_error(token)
+
+    raise NotImplementedError(f"Non-exhaustive match in vectorized evaluator failed on expression: {type(expr)}")
+
+
+def evaluate_columns(expr: Expr, columns: Mapping[str, Sequence[Any] | np.ndarray], count: int | None = None) -> np.ndarray:
+    """Evaluates the expression once per row of the columns, each variable taking the row's value of the column
+       of its name - numbers and booleans column-wise with NumPy, strings, nil and columns of mixed types row by row.
+       Results are what evaluating the expression for every row would give, as a float64 column if they're all
+       numbers, a bool one if they're all booleans and an object one otherwise. The first runtime error of any row
+       is raised, it needn't be the one of the lowest row. Without columns the row count has to be given."""
+    if count is None:
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) != 1:
+            raise ValueError("Columns must be of the same length" if lengths else "Row count of no columns is unknown")
+        count = lengths.pop()
+    if count == 0:
+        return np.empty(0, dtype=object)
+
+    with np.errstate(all="ignore"):  # inf and nan come out of float arithmetic silently, as they do in Python
+        value = evaluate_rows(expr, Rows(columns, count))
+    if isinstance(value, np.ndarray):
+        return value
+    return np.full(count, value, dtype=DTYPES[kind(value)])
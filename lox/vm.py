@@ -0,0 +1,93 @@
+from typing import Any, Mapping
+from .expressions import Expr
+from .bytecode import Chunk, compile_bytecode, OpCode, OPCODE_BITS, OPCODE_MASK
+from .interpreter import LoxRuntimeError, NO_VARIABLES
+
+
+def execute(chunk: Chunk, environment: Mapping[str, Any] = NO_VARIABLES) -> Any:
+    """Stack-based virtual machine - a single dispatch loop over the flat instruction stream, no Python call per node.
+       Variables are read from the environment, a chunk can be run against different ones without recompiling."""
+    code, constants = chunk.code, chunk.constants
+    stack: list[Any] = []
+    push, pop = stack.append, stack.pop
+    ip = 0
+
+    # opcodes as locals, comparing against those is way cheaper than enum attribute lookups
+    CONSTANT, NIL, TRUE, FALSE = OpCode.CONSTANT.value, OpCode.NIL.value, OpCode.TRUE.value, OpCode.FALSE.value
+    NEGATE, NOT = OpCode.NEGATE.value, OpCode.NOT.value
+    ADD, SUBTRACT, MULTIPLY, DIVIDE = OpCode.ADD.value, OpCode.SUBTRACT.value, OpCode.MULTIPLY.value, OpCode.DIVIDE.value
+    EQUAL, NOT_EQUAL = OpCode.EQUAL.value, OpCode.NOT_EQUAL.value
+    GREATER, GREATER_EQUAL = OpCode.GREATER.value, OpCode.GREATER_EQUAL.value
+    LESS, LESS_EQUAL = OpCode.LESS.value, OpCode.LESS_EQUAL.value
+    JUMP_IF_FALSE, JUMP, RETURN = OpCode.JUMP_IF_FALSE.value, OpCode.JUMP.value, OpCode.RETURN.value
+    GET_VARIABLE = OpCode.GET_VARIABLE.value
+
+    while True:
+        instruction = code[ip]
+        ip += 1
+        opcode = instruction & OPCODE_MASK
+
+        if opcode == CONSTANT:
+            push(constants[instruction >> OPCODE_BITS])
+        elif opcode <= FALSE:
+            push(None if opcode == NIL else opcode == TRUE)
+        elif opcode <= NOT:
+            value = stack[-1]
+            if opcode == NOT:
+                stack[-1] = value is None or value is False
+            elif type(value) is float:
+                stack[-1] = -value
+            else:
+                raise LoxRuntimeError(chunk.lines[ip - 1], "Operand must be a number.")
+        elif opcode <= LESS_EQUAL:
+            b = pop()
+            a = stack[-1]
+            if opcode == EQUAL:
+                stack[-1] = type(a) is type(b) and a == b
+            elif opcode == NOT_EQUAL:
+                stack[-1] = type(a) is not type(b) or a != b
+            elif type(a) is float and type(b) is float:
+                if opcode == ADD:
+                    stack[-1] = a + b
+                elif opcode == SUBTRACT:
+                    stack[-1] = a - b
+                elif opcode == MULTIPLY:
+                    stack[-1] = a * b
+                elif opcode == DIVIDE:
+                    if b == 0:
+                        raise LoxRuntimeError(chunk.lines[ip - 1], "Division by zero.")
+                    stack[-1] = a / b
+                elif opcode == GREATER:
+                    stack[-1] = a > b
+                elif opcode == GREATER_EQUAL:
+                    stack[-1] = a >= b
+                elif opcode == LESS:
+                    stack[-1] = a < b
+                else:
+                    stack[-1] = a <= b
+            elif opcode == ADD:
+                if type(a) is not str or type(b) is not str:
+                    raise LoxRuntimeError(chunk.lines[ip - 1], "Operands must be two numbers or two strings.")
+                stack[-1] = a + b
+            else:
+                raise LoxRuntimeError(chunk.lines[ip - 1], "Operands must be numbers.")
+        elif opcode == GET_VARIABLE:
+            name = constants[instruction >> OPCODE_BITS]
+            try:
+                push(environment[name])
+            except KeyError:
+                raise LoxRuntimeError(chunk.lines[ip - 1], f"Undefined variable '{name}'.") from None
+        elif opcode == JUMP_IF_FALSE:
+            value = pop()
+            if value is None or value is False:
+                ip = instruction >> OPCODE_BITS
+        elif opcode == JUMP:
+            ip = instruction >> OPCODE_BITS
+        elif opcode == RETURN:
+            return pop()
+        else:
+            raise NotImplementedError(f"Unknown opcode {opcode} at offset {ip - 1}")
+
+
+def evaluate_bytecode(expr: Expr, environment: Mapping[str, Any] = NO_VARIABLES) -> Any:
+    return execute(compile_bytecode(expr), environment)
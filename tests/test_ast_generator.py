@@ -0,0 +1,47 @@
+import dataclasses
+import pytest
+from pathlib import Path
+from lox.tools.ast_generator import render_ast_module
+
+
+def load_module(**options: bool) -> dict:
+	namespace = {"__name__": "lox.test_expressions", "__package__": "lox"}
+	exec(render_ast_module(**options), namespace)
+	return namespace
+
+
+def test_expressions_module_up_to_date() -> None:
+	module = Path(__file__).parent.parent / "lox" / "expressions.py"
+	assert module.read_text() == render_ast_module(slots=True), "lox/expressions.py is out of sync with the generator"
+
+
+def test_slotted_nodes() -> None:
+	nodes = load_module(slots=True)
+	Binary = nodes["Binary"]
+	literal = nodes["Literal"](1.0)
+
+	assert not hasattr(literal, "__dict__"), "Slotted nodes mustn't carry a per-instance __dict__"
+	match Binary(literal, None, literal):
+		case Binary(left, _, right):
+			assert left is right is literal, "Slotted nodes broke positional pattern matching"
+		case _:
+			pytest.fail("Slotted nodes broke positional pattern matching")
+
+
+def test_frozen_nodes() -> None:
+	nodes = load_module(slots=True, frozen=True)
+	grouping = nodes["Grouping"](nodes["Literal"](1.0))
+
+	assert nodes["Grouping"].__match_args__ == ("expression",), "Frozen nodes lost __match_args__"
+	with pytest.raises(dataclasses.FrozenInstanceError):
+		grouping.expression = None
+
+
+def test_fields_with_defaults() -> None:
+	nodes = load_module(slots=True, frozen=True)
+	Literal = nodes["Literal"]
+
+	assert Literal.__match_args__ == ("value",)
+	assert Literal(1.0, line=3).line == 3 and Literal(1.0).line == 0
+	assert Literal(1.0, line=3) == Literal(1.0) and hash(Literal(1.0, line=3)) == hash(Literal(1.0)), \
+		"Fields with defaults must be left out of comparisons"
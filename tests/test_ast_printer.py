@@ -0,0 +1,72 @@
+import io
+import pytest
+from lox.regex_scanner import RegexScanner
+from lox.parser import Parser
+from lox.interning import InterningNodeFactory
+from lox.diagnostics import Diagnostics
+from lox.ast_printer import pprint_expr, pprint_expr_recursive, write_expr
+
+
+def parse(source: str, factory: InterningNodeFactory | None = None):
+	diagnostics = Diagnostics()
+	tokens = RegexScanner(source, reporter=diagnostics).scan_tokens()
+	return Parser(tokens, factory, reporter=diagnostics).parse_all()[0]  # partial trees of syntax errors included
+
+
+class CountingWriter(io.StringIO):
+	def __init__(self) -> None:
+		super().__init__()
+		self.writes = 0
+
+	def write(self, text: str) -> int:
+		self.writes += 1
+		return super().write(text)
+
+
+@pytest.mark.parametrize("source", [
+	"-123 * (45.67 + 8.901)",
+	"1 == 2 ? \"x\" : nil != !true ? false : (1 < 2) >= -(3)",
+	"(== 1) + (* 2) - 3",  # error productions leave syntax errors in the tree
+	"price * (1 - discount) > limit ? name : -price",
+	"1 + (2 * ",
+	"a ? (b c",
+])
+def test_same_as_recursive(source: str) -> None:
+	expr = parse(source)
+	assert pprint_expr(expr) == pprint_expr(expr, memoize=True) == pprint_expr_recursive(expr)
+
+
+@pytest.mark.parametrize("source", [
+	"(\"s1\" + -12 * !true) == (nil\n+ 3.5 / (1 < 2 ? 3 : 4.5)) != (\"s1\" + -12 * !true) >= false",
+	"((((-(1)))) * (((!(\"x\"))))) - (((2 < 3 ? 4 : 5))) + ((((-(1)))) * (((!(\"x\")))))",
+	"((== 1) + 2 @) * ((< nil) / (* \"s\")) - (3 # + (!= 4))",  # error productions and stray characters
+])
+def test_shared_and_erroneous_trees(source: str) -> None:
+	expr = parse(source, InterningNodeFactory())
+	expected = pprint_expr_recursive(expr)
+
+	assert pprint_expr(expr) == expected
+	assert pprint_expr(expr, memoize=True) == expected
+
+
+def test_deep_tree() -> None:
+	expr = parse(" - ".join(["1"] * 100_000) + " + " + "(" * 50 + "2" + ")" * 50)
+	assert pprint_expr(expr) == "(+ " + "(- " * 99_999 + "1.0" + " 1.0)" * 99_999 + " " + "(group " * 50 + "2.0" + ")" * 51
+
+
+def test_shared_subtrees() -> None:
+	expr = parse(" + ".join(["(1 * (2 - 3))"] * 5), InterningNodeFactory())
+	text = pprint_expr(expr, memoize=True)
+
+	assert text == pprint_expr(expr)
+	assert text.count("(group (* 1.0 (group (- 2.0 3.0))))") == 5
+
+
+@pytest.mark.parametrize("memoize", [False, True])
+def test_streaming(memoize: bool) -> None:
+	expr = parse(" + ".join(["(1 * (2 - 3))"] * 5_000), InterningNodeFactory())
+	file = CountingWriter()
+	write_expr(expr, file, memoize)
+
+	assert file.getvalue() == pprint_expr(expr)
+	assert file.writes > 2, "Text should be written out as it's printed"
@@ -0,0 +1,131 @@
+import io
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from lox.lox import SCANNER_ENGINES, PARSER_ENGINES
+from lox.parser import Parser
+from lox.diagnostics import Diagnostics, Diagnostic
+from lox.batch import collect_scripts, check_script, run_batch
+
+
+SCRIPTS = {
+	"ok.lox": "1 + 2 * 3",
+	"nested/bad.lox": "1 +\n(2",
+	"nested/deeper/lexer.lox": "\"unterminated\n\n",
+	"nested/ugly.lox": "== 1 ? : @",
+}
+
+
+@pytest.fixture
+def scripts(tmp_path):
+	for name, source in SCRIPTS.items():
+		(tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+		(tmp_path / name).write_text(source)
+	(tmp_path / "nested" / "notes.txt").write_text("not a script")
+	return tmp_path
+
+
+@pytest.mark.parametrize("scanner_engine", SCANNER_ENGINES)
+@pytest.mark.parametrize("parser_engine", PARSER_ENGINES)
+def test_diagnostics_collected(scripts, scanner_engine: str, parser_engine: str, capsys) -> None:
+	assert check_script(scripts / "ok.lox", scanner_engine, parser_engine) == []
+	assert check_script(scripts / "nested/bad.lox", scanner_engine, parser_engine) == [
+		Diagnostic(2, "at end", "Expect ')' after expression."),
+	]
+	# eager scanners report lexer errors before parsing even starts, the stream scanner as tokens are pulled
+	assert sorted(str(d) for d in check_script(scripts / "nested/ugly.lox", scanner_engine, parser_engine)) == [
+		"[line 1] Error : Unexpected character.",
+		"[line 1] Error at ':': Expect expression.",
+		"[line 1] Error at '==': Missing left-hand operand for binary operator.",
+	]
+	assert capsys.readouterr().out == "", "Batch checks must not print through Lox"
+
+
+def test_collect_scripts(scripts) -> None:
+	found = collect_scripts([str(scripts / "nested"), str(scripts / "ok.lox")])
+
+	assert [path.relative_to(scripts).as_posix() for path in found] == [
+		"nested/bad.lox", "nested/deeper/lexer.lox", "nested/ugly.lox", "ok.lox",
+	]
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_ordered_report(scripts, jobs: int) -> None:
+	out = io.StringIO()
+	code = run_batch([str(scripts), str(scripts / "missing.lox")], "classic", "recursive", jobs, out)
+	lines = out.getvalue().splitlines()
+
+	assert code == 66, "Unreadable files take precedence over syntax errors"
+	assert [line.split(": ")[0].removeprefix(str(scripts) + "/") for line in lines[:-1]] == [
+		"nested/bad.lox", "nested/deeper/lexer.lox", "nested/deeper/lexer.lox",
+		"nested/ugly.lox", "nested/ugly.lox", "nested/ugly.lox", "missing.lox",
+	]
+	assert lines[-1] == "checked 5 files, 6 errors in 3 files, 1 unreadable"
+
+
+def test_exit_codes(scripts) -> None:
+	assert run_batch([str(scripts / "ok.lox")] * 3, "regex", "recursive", 2, io.StringIO()) == 0
+	assert run_batch([str(scripts / "ok.lox"), str(scripts / "nested/bad.lox")], "regex", "recursive", 2, io.StringIO()) == 65
+
+
+def test_reporters_are_separate() -> None:
+	first, second = Diagnostics(), Diagnostics()
+	Parser(SCANNER_ENGINES["classic"]("(1", reporter=first).scan_tokens(), reporter=first).parse()
+	Parser(SCANNER_ENGINES["classic"]("2", reporter=second).scan_tokens(), reporter=second).parse()
+
+	assert first.had_error and not second.had_error
+
+
+def test_recovery(tmp_path) -> None:
+	(tmp_path / "many.lox").write_text("1 +;\n(2;\n3 * 4;\n5 5")
+	out = io.StringIO()
+
+	assert run_batch([str(tmp_path / "many.lox")], "classic", "recursive", 1, out) == 65
+	assert out.getvalue().count("Error") == 1, "Without recovery only the first error is reported"
+
+	out = io.StringIO()
+	assert run_batch([str(tmp_path / "many.lox")], "classic", "recursive", 1, out, max_errors=2) == 65
+	lines = out.getvalue().splitlines()
+	assert [line.split(": ", 1)[1] for line in lines[:-1]] == [
+		"[line 1] Error at ';': Expect expression.",
+		"[line 2] Error at ';': Expect ')' after expression.",
+		"[line 2] Error at ';': Too many errors.",
+	]
+	assert lines[-1] == "checked 1 files, 3 errors in 1 files, 0 unreadable"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_deeper_than_recursion_limit(scripts, jobs: int) -> None:
+	(scripts / "nested" / "deep.lox").write_text("\n" + "-" * 50_000 + "1")
+	out = io.StringIO()
+
+	assert run_batch([str(scripts / "nested")], "classic", "recursive", jobs, out) == 65
+	assert f"{scripts / 'nested' / 'deep.lox'}: [line 2] Error at '-': Expression nests too deeply." in out.getvalue()
+	assert out.getvalue().splitlines()[-1] == "checked 4 files, 7 errors in 4 files, 0 unreadable"
+
+
+@pytest.mark.parametrize("parser_engine", PARSER_ENGINES)
+def test_deep_script_checked(tmp_path, parser_engine: str) -> None:
+	(tmp_path / "deep.lox").write_text("(" * 50_000 + "1" + ")" * 50_000)
+	diagnostics = check_script(tmp_path / "deep.lox", "classic", parser_engine)
+
+	assert [d.message for d in diagnostics] == ([] if parser_engine == "precedence" else ["Expression nests too deeply."])
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_memory_mapped(scripts, jobs: int) -> None:
+	out = io.StringIO()
+
+	assert run_batch([str(scripts / "nested")], "classic", "recursive", jobs, out, memory_map=True) == 65
+	assert f"{scripts / 'nested' / 'ugly.lox'}: [line 1:10] Error : Unexpected character." in out.getvalue().splitlines()
+
+
+@pytest.mark.parametrize("option", ["--eval=vm", "-O", "--disassemble"])
+def test_options_of_runs_rejected(scripts, option: str) -> None:
+	result = subprocess.run(
+		[sys.executable, "-m", "lox", option, str(scripts)], capture_output=True, text=True, cwd=Path(__file__).parent.parent,
+	)
+
+	assert result.returncode == 64, "Batch mode only checks scripts, it mustn't ignore options of running them"
+	assert result.stdout.startswith("Usage:")
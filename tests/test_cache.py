@@ -0,0 +1,88 @@
+import pickle
+from lox.scanner import Scanner
+from lox.parser import Parser
+from lox.lox import Lox
+from lox.session import Session
+from lox.cache import AstCache, CACHE_DIR, HEADER, source_digest
+from lox.expressions import Literal
+
+
+def parse(source: str):
+	return Parser(Scanner(source).scan_tokens()).parse()
+
+
+def test_lru_eviction() -> None:
+	cache = AstCache(capacity=2, use_disk=False)
+	digests = [source_digest(str(i)) for i in range(3)]
+	for i, digest in enumerate(digests[:2]):
+		cache.put(digest, Literal(float(i)))
+
+	assert cache.get(digests[0]) == Literal(0.0)
+	cache.put(digests[2], Literal(2.0))  # evicts the least recently used entry, which is the second one now
+
+	assert cache.get(digests[1]) is None
+	assert cache.get(digests[0]) == Literal(0.0)
+	assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_disk_cache(tmp_path) -> None:
+	script = tmp_path / "script.lox"
+	script.write_text("1 + 2 * 3")
+	digest = source_digest(script.read_bytes())
+	expr = parse("1 + 2 * 3")
+
+	AstCache().put(digest, expr, script)
+	cache = AstCache()
+
+	assert (tmp_path / CACHE_DIR).is_dir()
+	assert cache.get(digest, script) == expr
+	assert cache.get(source_digest("1 + 2 * 4"), script) is None, "Changed source must not hit a stale entry"
+	assert (cache.hits, cache.disk_hits, cache.misses) == (0, 1, 1)
+
+	cache_file = AstCache.cache_path(script)
+	cache_file.write_bytes(cache_file.read_bytes()[:-3])
+	assert AstCache().get(digest, script) is None, "Truncated cache file should count as a miss"
+
+
+class Planted:
+	ran = False
+
+	def __reduce__(self) -> tuple:
+		return setattr, (Planted, "ran", True)
+
+
+def test_planted_cache_file(tmp_path) -> None:
+	script = tmp_path / "script.lox"
+	script.write_text("1 + 2")
+	digest = source_digest(script.read_bytes())
+	AstCache().put(digest, parse("1 + 2"), script)
+	cache_file = AstCache.cache_path(script)
+	assert cache_file.read_bytes().startswith(HEADER + digest)
+
+	cache_file.write_bytes(HEADER + digest + pickle.dumps(Planted()))
+	assert AstCache().get(digest, script) is None, "Entries that aren't trees of the binary format are misses"
+	assert not Planted.ran, "Cache files must never be unpickled"
+
+
+def test_run_file_cache(tmp_path, monkeypatch, capsys) -> None:
+	script = tmp_path / "script.lox"
+	script.write_text("-123 * (45.67 + 8.901)")
+	monkeypatch.setattr(Lox, "default_session", Session(ast_cache=AstCache()))
+
+	Lox.run_file(str(script))
+	Lox.ast_cache.entries.clear()  # forget the in-process copy, as a fresh process would
+	Lox.run_file(str(script))
+
+	assert capsys.readouterr().out == "(* (- 123.0) (group (+ 45.67 8.901)))\n" * 2
+	assert (Lox.ast_cache.disk_hits, Lox.ast_cache.misses) == (1, 1)
+
+
+def test_errors_not_cached(monkeypatch, capsys) -> None:
+	monkeypatch.setattr(Lox, "default_session", Session(ast_cache=AstCache(use_disk=False)))
+
+	Lox.run("1 + @")
+	Lox.had_error = False
+	Lox.run("1 + @")
+
+	assert capsys.readouterr().out.count("Unexpected character") == 2, "Erroneous sources have to be scanned every time"
+	assert not Lox.ast_cache.entries
@@ -0,0 +1,101 @@
+import io
+import random
+import pytest
+from lox.incremental import IncrementalDocument
+from lox.regex_scanner import RegexScanner
+from lox.parser import Parser
+from lox.diagnostics import Diagnostics
+from lox.session import Session
+
+
+PIECES = [
+	"1", "2.5", " + ", "-", "*", "(", ")", "\"", "/*", "*/", "\n", "//", " ", "==", "!", "? ", ": ", "x", "nil", "@", "12",
+]
+
+
+def scan_and_parse(source: str):
+	diagnostics = Diagnostics()
+	tokens = RegexScanner(source, reporter=diagnostics).scan_tokens()
+	expr = Parser(tokens, reporter=diagnostics).parse()
+	return tokens, expr, diagnostics.items
+
+
+def assert_matches_full_parse(document: IncrementalDocument) -> None:
+	tokens, expr, errors = scan_and_parse(document.text)
+	diagnostics = Diagnostics()
+	assert document.parse(diagnostics) == expr
+	assert document.tokens == tokens
+	assert diagnostics.items == errors
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_random_edits(seed: int) -> None:
+	rng = random.Random(seed)
+	for _ in range(100):
+		document = IncrementalDocument("".join(rng.choice(PIECES) for _ in range(rng.randint(0, 40))))
+		for _ in range(20):
+			offset = rng.randint(0, len(document.text))
+			deleted = rng.randint(0, min(3, len(document.text) - offset))
+			document.edit(offset, deleted, "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 2))))
+			if rng.random() < 0.7:  # edits in between parses pile up
+				assert_matches_full_parse(document)
+
+
+@pytest.mark.parametrize("edits", [
+	[(4, 0, "\"")],  # opens a string swallowing the rest of the text
+	[(4, 0, "\""), (4, 1, "")],
+	[(4, 0, "\""), (12, 0, "\"")],
+	[(4, 0, "/*")],  # opens a comment
+	[(4, 0, "/*"), (17, 0, "*/")],
+	[(4, 0, "/*"), (4, 2, "")],
+	[(0, 0, "//")],
+	[(1, 0, "/"), (1, 1, "")],  # "1 /+ 2" - the operator next to the edit changes as well
+])
+def test_strings_and_comments(edits: list[tuple[int, int, str]]) -> None:
+	document = IncrementalDocument("1 + (2 *\n 3) - 4 / 5\n + 6")
+	document.parse(Diagnostics())
+	for edit in edits:
+		document.edit(*edit)
+		assert_matches_full_parse(document)
+
+
+def test_line_shift() -> None:
+	document = IncrementalDocument("1 +\n2 +\n\"a\nb\" + 3 @")
+	expr = document.parse(Diagnostics())
+	document.edit(0, 0, "\n\n")
+
+	assert [token.line for token in document.tokens] == [3, 3, 4, 4, 6, 6, 6, 6]
+	assert expr.operator.line == 6, "Trees parsed earlier share tokens renumbered in place"
+	assert document.lexer_errors[0][1] == 6
+	assert_matches_full_parse(document)
+
+
+def test_reuses_subtrees() -> None:
+	document = IncrementalDocument(" + ".join(f"({i} * 2)" for i in range(100)))
+	expr = document.parse(Diagnostics())
+	document.edit(len(document.text), 0, " + 7")
+	new_expr = document.parse(Diagnostics())
+
+	assert new_expr.left.left is expr.left, "Chain prefix in front of the edit should be taken over"
+	document.edit(0, 0, "-")
+	assert document.parse(Diagnostics()).left.right is new_expr.left.right, "So should subtrees past an edit"
+
+
+def test_errors_reported_again() -> None:
+	document = IncrementalDocument("(1 + 2) * (3 +)")
+	document.parse(Diagnostics())
+	document.edit(0, 0, " ")
+
+	diagnostics = Diagnostics()
+	assert document.parse(diagnostics) is None
+	assert [str(diagnostic) for diagnostic in diagnostics.items] == ["[line 1] Error at ')': Expect expression."]
+
+
+def test_session_runs_document() -> None:
+	session = Session(evaluator="tree", out=io.StringIO())
+	document = IncrementalDocument("1 + 2")
+	session.run(document)
+	document.edit(5, 0, " * 3")
+	session.run(document)
+
+	assert session.out.getvalue() == "3\n7\n"
@@ -0,0 +1,40 @@
+import io
+import pytest
+from lox.session import Session, SCANNER_ENGINES
+from lox.instrumentation import Instrumentation
+from lox.ast_utils import tree_shape
+from lox.regex_scanner import RegexScanner
+from lox.parser import Parser
+
+
+@pytest.mark.parametrize("scanner_engine", SCANNER_ENGINES)
+def test_phases(scanner_engine: str) -> None:
+	runs = []
+	session = Session(
+		scanner_engine=scanner_engine, evaluator="vm", optimize=True, out=io.StringIO(), err=io.StringIO(),
+		instrumentation=Instrumentation(hooks=[runs.append]),
+	)
+	session.run("-1 + 2 * (3 - 4)")
+
+	assert runs == session.instrumentation.runs
+	scan, parse, optimize, evaluate = runs[0]
+	assert [phase.name for phase in runs[0]] == ["scan", "parse", "optimize", "evaluate"]
+	assert scan.tokens == parse.tokens == 11, "Lazy token streams are counted while parsed"
+	assert (parse.nodes, parse.depth) == (9, 5)
+	assert (optimize.nodes, optimize.depth) == (1, 1)
+	assert all(phase.seconds > 0 and phase.peak_bytes is None for phase in runs[0])
+
+
+def test_errors_and_memory() -> None:
+	instrumentation = Instrumentation(trace_memory=True)
+	session = Session(out=io.StringIO(), instrumentation=instrumentation)
+	session.run("1 + (2")
+
+	assert [phase.name for phase in instrumentation.runs[0]] == ["scan", "parse"]
+	assert all(phase.peak_bytes > 0 for phase in instrumentation.runs[0])
+	assert instrumentation.report()["runs"][0][1]["nodes"] == 0
+
+
+def test_deep_tree_shape() -> None:
+	expr = Parser(RegexScanner(" + ".join(["1"] * 10_000)).scan_tokens()).parse()
+	assert tree_shape(expr) == (19_999, 10_000)
@@ -0,0 +1,41 @@
+import pytest
+from lox.scanner import Scanner
+from lox.parser import Parser
+from lox.interning import InterningNodeFactory
+from lox.expressions import Binary
+from lox.interpreter import LoxRuntimeError, evaluate
+
+
+def parse(source: str, factory: InterningNodeFactory | None = None):
+	return Parser(Scanner(source).scan_tokens(), factory).parse()
+
+
+def test_identical_subtrees_are_shared() -> None:
+	factory = InterningNodeFactory()
+	expr = parse("2 * (1 + 3) == 2 * (1 + 3) == 2 * (1 + 3)", factory)
+
+	assert isinstance(expr, Binary) and isinstance(expr.left, Binary), "Unexpected parse of interned expression"
+	assert expr.left.left is expr.left.right is expr.right, "Structurally identical subtrees weren't shared"
+	assert factory.hits > 0 and 0 < factory.hit_rate < 1, "Interning statistics weren't recorded"
+
+
+def test_interned_tree_equals_plain_tree() -> None:
+	source = "1 == 2 ? true : -123 * (45.67 + 8.901) - -123 * (45.67 + 8.901)"
+	assert parse(source, InterningNodeFactory()) == parse(source), "Interning changed the parsed tree"
+
+
+def test_literals_distinguished_by_type() -> None:
+	factory = InterningNodeFactory()
+	assert factory.literal(True) is not factory.literal(1.0), "true and 1 mustn't be interned as the same literal"
+	assert factory.literal(0.0) is not factory.literal(-0.0), "0 and -0 mustn't be interned as the same literal"
+	assert factory.literal("a") is factory.literal("a"), "Equal literals should be interned"
+
+
+def test_runtime_errors_keep_their_lines() -> None:
+	factory = InterningNodeFactory()
+	expr = parse("(true ? 1 : -nil) +\n(false ? 1 : -nil)", factory)
+
+	assert expr.left.expression.else_branch is not expr.right.expression.else_branch, "Operators on different lines mustn't be shared"
+	with pytest.raises(LoxRuntimeError) as exc_info:
+		evaluate(expr)
+	assert exc_info.value.line == 2, "Runtime error must point at the line of the failing occurrence"
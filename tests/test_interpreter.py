@@ -0,0 +1,90 @@
+import pytest
+from lox.scanner import Scanner
+from lox.parser import Parser
+from lox.interpreter import LoxRuntimeError, evaluate, compile_expr, stringify
+from lox.diagnostics import Diagnostics
+
+
+ENGINES = {
+	"tree": evaluate,
+	"closure": lambda expr, environment={}: compile_expr(expr, environment)(),
+}
+
+
+def parse(source: str):
+	return Parser(Scanner(source).scan_tokens()).parse()
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("source, expected", [
+	("-123 * (45.67 + 8.901)", "-6712.233"),
+	("1 + 2 * 3 - 4 / 2", "5"),
+	("\"lo\" + \"x\"", "lox"),
+	("1 == 2 ? 45 : 46", "46"),
+	("nil ? 1 : false ? 2 : 0 ? 3 : 4", "3"),
+	("!nil == !false", "true"),
+	("1 == true", "false"),
+	("nil == nil", "true"),
+	("\"1\" != 1", "true"),
+	("3 >= 3 == 2 < 1", "false"),
+	("- -1.5", "1.5"),
+])
+def test_evaluation(engine: str, source: str, expected: str) -> None:
+	assert stringify(ENGINES[engine](parse(source))) == expected, f"{engine} engine evaluated {source} incorrectly"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("source, message", [
+	("-\"a\"", "Operand must be a number."),
+	("\"a\" - 1", "Operands must be numbers."),
+	("1\n+ \"a\"", "Operands must be two numbers or two strings."),
+	("true < 1", "Operands must be numbers."),
+	("1 / (2 - 2)", "Division by zero."),
+])
+def test_runtime_errors(engine: str, source: str, message: str) -> None:
+	with pytest.raises(LoxRuntimeError) as exc_info:
+		ENGINES[engine](parse(source))
+
+	assert str(exc_info.value) == message, f"{engine} engine raised wrong runtime error for {source}"
+	assert exc_info.value.line == source.count("\n") + 1, "Runtime error should point at the operator's line"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_partial_trees(engine: str) -> None:
+	[expr] = Parser(Scanner("true ? 1 : 2 +\n(3 *").scan_tokens(), reporter=Diagnostics()).parse_all()
+	assert ENGINES[engine](expr) == 1.0, "Branches not taken aren't evaluated, errors in them included"
+
+	[expr] = Parser(Scanner("false ? 1 : 2 +\n(3 *").scan_tokens(), reporter=Diagnostics()).parse_all()
+	with pytest.raises(LoxRuntimeError) as exc_info:
+		ENGINES[engine](expr)
+	assert str(exc_info.value) == "Can't evaluate an expression with a syntax error."
+	assert exc_info.value.line == 2, "Error should point at the line of the syntax error"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_variables(engine: str) -> None:
+	expr = parse("price * (1 - discount) > limit ? name + \"!\" : name")
+	environment = {"price": 120.0, "discount": 0.25, "limit": 80.0, "name": "x"}
+
+	assert ENGINES[engine](expr, environment) == "x!"
+	assert ENGINES[engine](expr, dict(environment, limit=100.0)) == "x"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_undefined_variable(engine: str) -> None:
+	with pytest.raises(LoxRuntimeError) as exc_info:
+		ENGINES[engine](parse("1 +\nmissing"), {"other": 1.0})
+
+	assert str(exc_info.value) == "Undefined variable 'missing'."
+	assert exc_info.value.line == 2, "Runtime error should point at the variable's line"
+
+
+def test_compiled_reads_environment_on_every_call() -> None:
+	environment = {"x": 1.0}
+	run = compile_expr(parse("x * 2"), environment)
+	results = []
+	for x in [1.0, 2.0, 3.0]:
+		environment["x"] = x
+		results.append(run())
+
+	assert results == [2.0, 4.0, 6.0]
@@ -0,0 +1,96 @@
+import io
+import pytest
+from pathlib import Path
+from lox.scanner import Scanner
+from lox.mapped_scanner import MappedScanner, LineIndex, map_file
+from lox.diagnostics import Diagnostics
+from lox.session import Session
+from lox.cache import AstCache
+
+
+SOURCES = [
+	"-123 * (45.67 + 8.901)",
+	"1 == 2 ? 45 : -123 * (45.67 + 8.901)",
+	"var x /* float */ = 3 + 2",
+	f"idef /* {'\n' * 3} */ idef",
+	"a != b >= c <= d > e < f = g ! h",
+	"foo_bar _baz qux1 1.5.2 12. .5",
+	"\"one line string\" after // trailing comment\nnext",
+	"/*/ still a comment */ x",
+	"@ # $ x\n\t\r y  \t",
+	"café + _é1 * 1é ∑ and",
+	"\"ünïcödé\" == x",
+	"€12.5 + é12.5 - 12.é * 1.5.é / 12٣ + x€.5",
+	"",
+	"\n\n",
+]
+
+
+def located(tokens: list) -> list[tuple]:
+	return [(t.token_type, t.lexeme, t.literal, t.line) for t in tokens]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_matches_classic_scanner(source: str) -> None:
+	expected, found = Diagnostics(), Diagnostics()
+	expected_tokens = Scanner(source, reporter=expected).scan_tokens()
+	tokens = MappedScanner(source.encode(), reporter=found).scan_tokens()
+
+	assert located(tokens) == located(expected_tokens), "Mapped scanner produced different tokens than the classic one"
+	assert [(d.line, d.message) for d in found.items] == [(d.line, d.message) for d in expected.items]
+
+
+def test_zz_syntax_test_file() -> None:
+	path = Path(__file__).parent.parent / "zz_syntax_test.lox"
+
+	assert located(MappedScanner(map_file(str(path))).scan_tokens()) == located(Scanner(path.read_text()).scan_tokens())
+
+
+def test_columns() -> None:
+	diagnostics = Diagnostics()
+	tokens = MappedScanner("1 +\n  ∑ x\n".encode() + b"\xff\"open", reporter=diagnostics).scan_tokens()
+
+	assert [(t.lexeme, t.line, t.column) for t in tokens] == [("1", 1, 1), ("+", 1, 3), ("x", 2, 5), ("", 3, 7)]
+	assert [str(d) for d in diagnostics.items] == [
+		"[line 2:3] Error : Unexpected character.",
+		"[line 3:1] Error : Unexpected character.",
+		"[line 3:2] Error : Unterminated string.",
+	]
+
+
+def test_line_index_built_on_demand() -> None:
+	index = LineIndex(b"a\nbc\n\nd")
+	assert index.newlines is None
+
+	assert [index.line(offset) for offset in range(8)] == [1, 1, 2, 2, 2, 3, 4, 4]
+	assert [index.column(offset) for offset in range(8)] == [1, 2, 1, 2, 3, 1, 1, 2]
+	assert list(index.newlines) == [1, 4, 5]
+
+
+def test_scanning_skips_line_index() -> None:
+	scanner = MappedScanner(b"1 +\n2 *\n3")
+	scanner.scan_tokens()
+	assert scanner.index.newlines is None, "Error-free scans must not look up any line"
+
+
+def test_run_file(tmp_path) -> None:
+	(tmp_path / "empty.lox").write_bytes(b"")
+	(tmp_path / "bad.lox").write_text("1 +\n  (2")
+	session = Session(memory_map=True, evaluator="tree", out=io.StringIO())
+
+	session.run_file(str(tmp_path / "empty.lox"))
+	session.run_file(str(tmp_path / "bad.lox"))
+	assert session.out.getvalue() == (
+		"[line 1:1] Error at end: Expect expression.\n"
+		"[line 2:5] Error at end: Expect ')' after expression.\n"
+	)
+
+
+def test_cached_run(tmp_path) -> None:
+	(tmp_path / "ok.lox").write_text("1 +\n2")
+	out = io.StringIO()
+	for _ in range(2):
+		Session(memory_map=True, evaluator="vm", ast_cache=AstCache(), out=out).run_file(str(tmp_path / "ok.lox"))
+
+	assert out.getvalue() == "3\n3\n"
+	assert list((tmp_path / "__loxcache__").iterdir()), "Trees of mapped scripts are cached like any other"
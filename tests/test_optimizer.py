@@ -0,0 +1,62 @@
+import pytest
+from lox.scanner import Scanner
+from lox.parser import Parser
+from lox.precedence_parser import PrecedenceParser
+from lox.ast_printer import pprint_expr
+from lox.interpreter import LoxRuntimeError, evaluate
+from lox.optimizer import fold_constants
+from lox.serialization import flatten
+
+
+def parse(source: str):
+	return Parser(Scanner(source).scan_tokens()).parse()
+
+
+@pytest.mark.parametrize("source, expected, eliminated", [
+	("-123 * (45.67 + 8.901)", "-6712.233", 6),
+	("true ? \"x\" : 1 / 0", "x", 5),
+	("nil ? 1 : (2)", "2.0", 4),
+	("\"a\" - (1 + 1)", "(- a 2.0)", 3),
+	("1 / 0 * 1", "(/ 1.0 0.0)", 2),
+	("-(-(\"a\" - 1))", "(- a 1.0)", 4),
+	("!!!(\"a\" - 1)", "(! (- a 1.0))", 3),
+	("-\"a\" - 0", "(- a)", 2),
+	("\"a\" + 0", "(+ a 0.0)", 0),
+	("(1 == true) != (0 == -0)", "True", 9),
+	("x * 1 - (2 * 3)", "(- (* x 1.0) 6.0)", 3),  # x may hold a string
+	("(1 < 2) ? -x - 0 : y", "(- x)", 8),
+])
+def test_folding(source: str, expected: str, eliminated: int) -> None:
+	folded, count = fold_constants(parse(source))
+
+	assert pprint_expr(folded) == expected, f"Folding {source} produced unexpected tree"
+	assert count == eliminated, f"Folding {source} reported wrong number of eliminated nodes"
+
+
+@pytest.mark.parametrize("source", ["\"a\" - 1", "-nil", "2 * (1 / (1 - 1))", "(1 < \"2\") ? 1 : 2"])
+def test_runtime_errors_preserved(source: str) -> None:
+	folded, _ = fold_constants(parse(source))
+
+	with pytest.raises(LoxRuntimeError) as expected:
+		evaluate(parse(source))
+	with pytest.raises(LoxRuntimeError) as actual:
+		evaluate(folded)
+
+	assert str(actual.value) == str(expected.value), f"Folding {source} changed its runtime error"
+
+
+@pytest.mark.parametrize("source, expected", [
+	("(" * 50_000 + "1 + x" + ")" * 50_000, "(+ 1.0 x)"),
+	("-" * 50_000 + "(x * 2)", "(* x 2.0)"),
+	("-" * 50_001 + "2", "-2.0"),
+	("false ? 1 : " * 20_000 + "x * 1", "(* x 1.0)"),
+	("x ? " * 20_000 + "1" + " : 2" * 20_000, None),
+])
+def test_deeper_than_recursion_limit(source: str, expected: str | None) -> None:
+	expr = PrecedenceParser(Scanner(source).scan_tokens()).parse()
+	folded, count = fold_constants(expr)
+
+	if expected is not None:
+		assert pprint_expr(folded) == expected
+	else:
+		assert count == 0 and flatten(folded) == flatten(expr), "Nothing to fold in a chain of conditionals on a variable"
@@ -2,8 +2,11 @@ import pytest
 
 from lox.parser import Parser, ParseError
 from lox.tokens import Token, TokenType as TT
-from lox.expressions import Conditional, Literal
-from lox.lox import Lox as LoxImpl
+from lox.expressions import Binary, Conditional, Literal, Variable, Error
+from lox.lox import Lox as LoxImpl, PARSER_ENGINES
+from lox.regex_scanner import RegexScanner
+from lox.diagnostics import Diagnostics
+from lox.ast_printer import pprint_expr
 
 
 def mk_ts(tts: list[TT]) -> list[Token]:
@@ -23,6 +26,15 @@ def test_conditional() -> None:
 
 	assert parsed_expr == expected_expr, "Parsing conditional expression failed"
 
+
+@pytest.mark.parametrize("parser_engine", PARSER_ENGINES)
+def test_variables(parser_engine: str) -> None:
+	x, plus, y = Token(TT.IDENTIFIER, "x", "x", 1), Token(TT.PLUS, "+", None, 1), Token(TT.IDENTIFIER, "y", "y", 1)
+	expr = PARSER_ENGINES[parser_engine]([x, plus, y, Token(TT.EOF, "", None, 1)]).parse()
+
+	assert expr == Binary(Variable(x), plus, Variable(y)), f"{parser_engine} parser didn't parse variable references"
+	assert pprint_expr(expr) == "(+ x y)"
+
 def test_conditional_missing_colon() -> None:
 	ts = mk_ts([TT.TRUE, TT.QUESTION, TT.STRING, TT.STRING])
 	
@@ -36,3 +48,61 @@ def test_conditional_missing_colon() -> None:
 	assert LoxImpl.had_error, "Missing colon in conditional should report an error"
 	assert exc_info.type is ParseError, "On missing colon Conditional should panic and raise ParseError"
 	assert full_parser_pass is None, "Parser.parse() should return None after encountering ParseError"
+
+
+@pytest.mark.parametrize("parser_engine", PARSER_ENGINES)
+def test_recovery(parser_engine: str) -> None:
+	diagnostics = Diagnostics()
+	tokens = RegexScanner("1 +;\n2 2;\n(3;\n== 4;\n5 * 6", reporter=diagnostics).scan_tokens()
+	expressions = PARSER_ENGINES[parser_engine](tokens, reporter=diagnostics).parse_all()
+
+	assert [str(d) for d in diagnostics.items] == [
+		"[line 1] Error at ';': Expect expression.",
+		"[line 2] Error at '2': Expect ';' after expression.",
+		"[line 3] Error at ';': Expect ')' after expression.",
+		"[line 4] Error at '==': Missing left-hand operand for binary operator.",
+	]
+	assert [pprint_expr(expr) for expr in expressions] == [
+		"(+ 1.0 [SYNTAX ERROR])",
+		"[SYNTAX ERROR 2.0]",
+		"(group [SYNTAX ERROR 3.0])",
+		"[SYNTAX ERROR 4.0]",  # error productions leave an error node behind
+		"(* 5.0 6.0)",
+	], "Parsing should go on past every error, keeping what parsed before it"
+
+
+@pytest.mark.parametrize("parser_engine", PARSER_ENGINES)
+@pytest.mark.parametrize("source, expected", [
+	("a ? 1 + : b", "(if a then (+ 1.0 [SYNTAX ERROR]) else [SYNTAX ERROR])"),
+	("a ? b c", "(if a then b else [SYNTAX ERROR])"),
+	("a ? b : -", "(if a then b else (- [SYNTAX ERROR]))"),
+	("(1 * (2 + ))", "(group (* 1.0 (group (+ 2.0 [SYNTAX ERROR]))))"),
+	("(a ? (b : c", "(group (if a then (group [SYNTAX ERROR b]) else [SYNTAX ERROR]))"),
+	("1 - (== 2 * !)", "(- 1.0 (group [SYNTAX ERROR (* 2.0 (! [SYNTAX ERROR]))]))"),
+	(")", "[SYNTAX ERROR]"),
+])
+def test_partial_trees(parser_engine: str, source: str, expected: str) -> None:
+	diagnostics = Diagnostics()
+	tokens = RegexScanner(source, reporter=diagnostics).scan_tokens()
+	[expression] = PARSER_ENGINES[parser_engine](tokens, reporter=diagnostics).parse_all()
+
+	assert pprint_expr(expression) == expected
+	assert PARSER_ENGINES[parser_engine](tokens, reporter=Diagnostics()).parse() is None, "parse() keeps no partial trees"
+
+
+@pytest.mark.parametrize("parser_engine", PARSER_ENGINES)
+def test_recovery_error_cap(parser_engine: str) -> None:
+	diagnostics = Diagnostics()
+	tokens = RegexScanner(") ; " * 100_000 + "+ " * 100_000, reporter=diagnostics).scan_tokens()
+	expressions = PARSER_ENGINES[parser_engine](tokens, reporter=diagnostics).parse_all(max_errors=10)
+
+	assert len(diagnostics.items) == 11 and len(expressions) == 10
+	assert str(diagnostics.items[-1]) == "[line 1] Error at ')': Too many errors."
+
+
+def test_recovery_from_deep_nesting() -> None:
+	diagnostics = Diagnostics()
+	tokens = RegexScanner("(" * 100_000 + "1; 2", reporter=diagnostics).scan_tokens()
+
+	assert Parser(tokens, reporter=diagnostics).parse_all() == [Error(tokens[0], None), Literal(2.0)]
+	assert [d.message for d in diagnostics.items] == ["Expression nests too deeply."]
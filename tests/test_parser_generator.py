@@ -0,0 +1,105 @@
+import random
+import pytest
+from pathlib import Path
+from lox.regex_scanner import RegexScanner
+from lox.tokens import Token, TokenType as TT
+from lox.parser import Parser
+from lox.generated_parser import GeneratedParser
+from lox.diagnostics import Diagnostics
+from lox.tools.grammar import GrammarError, GrammarReader, read_grammar
+from lox.tools.parser_generator import ParserGenerator, render_parser_module
+
+
+CORPUS = [
+	"-123 * (45.67 + 8.901)",
+	"1 == 2 ? \"x\" : nil != !true ? false : (1 < 2) >= -(3)",
+	"a ? b ? c : d : e",
+	"1 2",
+	"+ 1 * 2 - 3",
+	"1 * < 2 == 3",
+	"== 1 ? 2 : 3",
+	"(1 + 2",
+	"1 ? 2 3",
+	"1 ? 2 : ",
+	"* / 1",
+	"!",
+	"",
+	")",
+]
+
+
+def parse(parser_type: type[Parser], tokens: list[Token]) -> tuple:
+	diagnostics = Diagnostics()
+	expr = parser_type(tokens, reporter=diagnostics).parse()
+	return expr, parser_type(tokens, reporter=Diagnostics()).parse_all(), diagnostics.items  # partial trees as well
+
+
+def assert_same(tokens: list[Token]) -> None:
+	assert parse(GeneratedParser, tokens) == parse(Parser, tokens), f"Parsers differ on {' '.join(t.lexeme for t in tokens)}"
+
+
+def test_parser_module_up_to_date() -> None:
+	module = Path(__file__).parent.parent / "lox" / "generated_parser.py"
+	assert module.read_text() == render_parser_module(), "lox/generated_parser.py is out of sync with lox.gram"
+
+
+@pytest.mark.parametrize("source", CORPUS)
+def test_corpus(source: str) -> None:
+	assert_same(RegexScanner(source).scan_tokens())
+
+
+@pytest.mark.parametrize("source", [
+	"(\"s1\" + -12 * !true) == (nil\n+ 3.5 / (1 < 2 ? 3 : 4.5)) != x >= false ? \"a\" : -(-y)",
+	"((((-(1)))) * (((!(\"x\"))))) - (((2 < 3 ? 4 : 5 ? 6 : 7)))",
+	"1 + 2 - 3 * 4 / 5 + 6 - 7 * 8 / 9 <= 1 == 2 != 3",
+	"((== 1) + 2) * ((< nil) / (* \"s\")) - (3 + (!= 4))",  # error productions
+])
+def test_mixed_sources(source: str) -> None:
+	assert_same(RegexScanner(source, reporter=Diagnostics()).scan_tokens())
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_token_sequences(seed: int) -> None:
+	rng = random.Random(seed)
+	pool = [
+		TT.NUMBER, TT.STRING, TT.TRUE, TT.FALSE, TT.NIL, TT.LEFT_PAREN, TT.RIGHT_PAREN, TT.QUESTION, TT.COLON,
+		TT.BANG, TT.BANG_EQUAL, TT.MINUS, TT.PLUS, TT.STAR, TT.SLASH, TT.EQUAL_EQUAL, TT.LESS, TT.GREATER_EQUAL,
+		TT.IDENTIFIER,
+	]
+	for _ in range(200):
+		types = rng.choices(pool, k=rng.randint(1, 25))
+		tokens = [Token(tt, tt.name, 1.0, i) for i, tt in enumerate(types)] + [Token(TT.EOF, "", None, len(types))]
+		assert_same(tokens)
+
+
+def test_grammar_nodes() -> None:
+	grammar = read_grammar()
+	assert list(grammar.rules)[0] == "expression"
+	assert grammar.node_defs()[0] == "Binary -> left: Expr, operator: Token, right: Expr"
+
+
+@pytest.mark.parametrize("text", [
+	"expression → term",  # missing ;
+	"expression → ;",
+	"expression → \"?\" @ ;",
+	"Binary :: left Expr ;",
+	"expression → ( \"+\" )* ;",
+	"expression → ( term | \"+\" ) ;",
+])
+def test_malformed_grammar(text: str) -> None:
+	with pytest.raises(GrammarError):
+		GrammarReader(text).read()
+
+
+@pytest.mark.parametrize("text", [
+	"expression → term ;",  # undefined rule
+	"Literal :: value: Any ; expression → \"@@\" NUMBER {Literal} | ! \"Expect expression.\" ;",  # unknown terminal
+	"Literal :: value: Any ; expression → NUMBER {Literal} ;",  # falls through
+	"Literal :: value: Any ; expression → NUMBER NUMBER {Literal} | ! \"Expect expression.\" ;",  # too many fields
+	"expression → expression ( \"+\" expression {Binary} )* ;",  # undeclared node
+	"Binary :: left: Expr, operator: Token, right: Expr ; expression → NUMBER ( ( \"+\" ) NUMBER {Binary} )+ ;",
+	"Variable :: name: Token ; expression → \"(\" IDENTIFIER {Variable} | ! \"x\" ;",  # no partial tree of a token
+])
+def test_unsupported_grammar(text: str) -> None:
+	with pytest.raises(GrammarError):
+		ParserGenerator(GrammarReader(text).read()).render()
@@ -0,0 +1,62 @@
+import io
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from lox.lox import Lox
+from lox.session import Session
+from lox.pipe import run_pipe, split_items
+
+
+class FlushCountingWriter(io.StringIO):
+	def __init__(self) -> None:
+		super().__init__()
+		self.flushes = 0
+
+	def flush(self) -> None:
+		self.flushes += 1
+		super().flush()
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 1 << 20])
+def test_split_items(read_size: int) -> None:
+	source = io.BytesIO(b"1 + 2;;3;;;;4 *;; 5")
+	items = [bytes(item) for items in split_items(source, b";;", read_size) for item in items]
+	assert items == [b"1 + 2", b"3", b"", b"4 *", b" 5"], "Delimiters spanning reads must still split programs"
+
+
+def test_empty_delimiter() -> None:
+	with pytest.raises(ValueError):
+		next(split_items(io.BytesIO(b"1;2"), b""))
+
+	for delimiter in ["", "\\x"]:  # empty and a malformed escape
+		result = subprocess.run(
+			[sys.executable, "-m", "lox", "--pipe", "--delimiter", delimiter], input="1", capture_output=True, text=True,
+			cwd=Path(__file__).parent.parent,
+		)
+		assert result.returncode == 64 and result.stdout.startswith("Usage:"), f"--delimiter {delimiter!r} accepted"
+
+
+def test_errors_per_program(monkeypatch) -> None:
+	monkeypatch.setattr(Lox, "default_session", Session())
+	out = FlushCountingWriter()
+	code = run_pipe(io.BytesIO(b"1 + 2\n\n(3\n\"a\" - 1\n4 * 5\n"), out, evaluator="vm")
+
+	assert out.getvalue() == (
+		"3\n"
+		"[line 1] Error at end: Expect ')' after expression.\n"
+		"Operands must be numbers.\n[line 1]\n"
+		"20\n"
+	), "An error must not affect programs following it"
+	assert code == 65
+	assert out.flushes == 1, "Output is flushed once per read, not per line"
+	assert not Lox.had_error and not Lox.had_runtime_error, "Programs must run in sessions of their own"
+
+
+def test_delimiter_and_exit_codes() -> None:
+	out = io.StringIO()
+	assert run_pipe(io.BytesIO("1 +\n2\0\"\xff\" == 1\0".encode()), out, "\0", evaluator="tree") == 0
+	assert out.getvalue() == "3\n\0false\n\0"
+
+	assert run_pipe(io.BytesIO(b"-nil"), io.StringIO(), evaluator="tree") == 70
+	assert run_pipe(io.BytesIO(b"1\n\xff"), io.StringIO()) == 65, "Undecodable bytes are unexpected characters"
@@ -0,0 +1,118 @@
+import random
+import re
+import sys
+import pytest
+from typing import Iterable
+from pathlib import Path
+from lox.scanner import Scanner
+from lox.stream_scanner import StreamScanner
+from lox.tokens import Token, TokenType as TT
+from lox.parser import Parser
+from lox.precedence_parser import PrecedenceParser, BINARY_PRECEDENCE, UNARY_OPERATORS, ERROR_PRODUCTIONS
+from lox.expressions import Grouping, Unary
+
+
+CORPUS = [
+	"-123 * (45.67 + 8.901)",
+	"1 == 2 ? 45 : -123 * (45.67 + 8.901)",
+	"1 - 2 - 3 * 4 / 5 / 6 + 7",
+	"a ? b : c ? d : e",
+	"a ? b ? c : d : e",
+	"(a ? b : c) ? d : e",
+	"1 < 2 == 3 >= 4 != !!-5",
+	"1 2",
+	"+ 1 * 2 - 3",
+	"1 * + 2 - 3 == 4",
+	"1 * < 2 == 3",
+	"== 1 ? 2 : 3",
+	"- + 1",
+	"(1 + 2",
+	"1 ? 2 3",
+	"1 ? 2 : ",
+	"* / 1",
+	"!",
+	"",
+	")",
+	"(((1)))",
+	"true ? nil : false",
+]
+
+
+def parse(parser_type: type[Parser], tokens: Iterable[Token], capsys: pytest.CaptureFixture[str]) -> tuple:
+	expr = parser_type(tokens).parse()
+	return expr, capsys.readouterr().out
+
+
+def assert_same(tokens: list[Token], capsys: pytest.CaptureFixture[str]) -> None:
+	expected, expected_errors = parse(Parser, tokens, capsys)
+	actual, actual_errors = parse(PrecedenceParser, tokens, capsys)
+
+	assert actual == expected, f"Trees differ for {' '.join(t.lexeme for t in tokens)}"
+	assert actual_errors == expected_errors, f"Reported errors differ for {' '.join(t.lexeme for t in tokens)}"
+
+	expected_partial, actual_partial = Parser(tokens).parse_all(), PrecedenceParser(tokens).parse_all()
+	capsys.readouterr()
+	assert actual_partial == expected_partial, f"Partial trees differ for {' '.join(t.lexeme for t in tokens)}"
+
+
+@pytest.mark.parametrize("source", CORPUS)
+def test_corpus(source: str, capsys: pytest.CaptureFixture[str]) -> None:
+	assert_same(Scanner(source).scan_tokens(), capsys)
+
+
+@pytest.mark.parametrize("source", ["+ @ 1", "(1 @ ] 2", "1 ? # 2 : $"])
+def test_lexer_errors_interleaved_with_lazy_stream(source: str, capsys: pytest.CaptureFixture[str]) -> None:
+	expected, expected_errors = parse(Parser, StreamScanner(source).scan_tokens(), capsys)
+	actual, actual_errors = parse(PrecedenceParser, StreamScanner(source).scan_tokens(), capsys)
+
+	assert actual == expected, f"Trees differ for {source}"
+	assert actual_errors == expected_errors, f"Order of reported errors differs for {source}"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_token_sequences(seed: int, capsys: pytest.CaptureFixture[str]) -> None:
+	rng = random.Random(seed)
+	pool = [
+		TT.NUMBER, TT.STRING, TT.TRUE, TT.NIL, TT.LEFT_PAREN, TT.RIGHT_PAREN, TT.QUESTION, TT.COLON,
+		TT.BANG, TT.MINUS, TT.PLUS, TT.STAR, TT.SLASH, TT.EQUAL_EQUAL, TT.LESS, TT.GREATER_EQUAL, TT.IDENTIFIER,
+	]
+	for _ in range(200):
+		types = rng.choices(pool, k=rng.randint(1, 25))
+		tokens = [Token(tt, tt.name, 1.0, i) for i, tt in enumerate(types)] + [Token(TT.EOF, "", None, len(types))]
+		assert_same(tokens, capsys)
+
+
+def test_deeper_than_recursion_limit() -> None:
+	depth = sys.getrecursionlimit() * 2
+	source = "(" * depth + "1" + ")" * depth + " + " + "-" * depth + "2"
+
+	expr = PrecedenceParser(Scanner(source).scan_tokens()).parse()
+
+	groupings, node = 0, expr.left
+	while isinstance(node, Grouping):
+		groupings, node = groupings + 1, node.expression
+	negations, node = 0, expr.right
+	while isinstance(node, Unary):
+		negations, node = negations + 1, node.right
+
+	assert groupings == negations == depth, "Nesting deeper than the recursion limit wasn't parsed"
+
+
+def test_operator_table_matches_grammar() -> None:
+	grammar = (Path(__file__).parent.parent / "assets" / "lox.gram").read_text()
+	lexemes = {tt: lexeme for lexeme, tt in [
+		("!=", TT.BANG_EQUAL), ("==", TT.EQUAL_EQUAL), (">", TT.GREATER), (">=", TT.GREATER_EQUAL),
+		("<", TT.LESS), ("<=", TT.LESS_EQUAL), ("-", TT.MINUS), ("+", TT.PLUS), ("/", TT.SLASH), ("*", TT.STAR),
+		("!", TT.BANG),
+	]}
+
+	def rule_operators(rule: str) -> set[str]:
+		body = re.search(rf"^{rule}\s+→(.*?)(?:;|$)", grammar, re.MULTILINE).group(1)
+		return set(re.findall(r'"([^"]+)"', body))
+
+	for level, rule in enumerate(["equality", "comparison", "term", "factor"], start=1):
+		expected = rule_operators(rule)
+		assert {lexemes[tt] for tt, lvl in BINARY_PRECEDENCE.items() if lvl == level} == expected, f"{rule} level differs"
+
+	assert {lexemes[tt] for tt in UNARY_OPERATORS} == rule_operators("unary"), "Unary operators differ from lox.gram"
+	assert {lexemes[tt] for tt in ERROR_PRODUCTIONS} == {"!=", "==", ">", ">=", "<", "<=", "+", "/", "*"}
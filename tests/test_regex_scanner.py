@@ -0,0 +1,40 @@
+import pytest
+from pathlib import Path
+from lox.scanner import Scanner
+from lox.regex_scanner import RegexScanner
+
+
+SOURCES = [
+	"-123 * (45.67 + 8.901)",
+	"1 == 2 ? 45 : -123 * (45.67 + 8.901)",
+	"var x /* float */ = 3 + 2",
+	f"idef /* {'\n' * 3} */ idef",
+	"a != b >= c <= d > e < f = g ! h",
+	"foo_bar _baz qux1 1.5.2 12. .5",
+	"\"multi\nline\nstring\" after // trailing comment\nnext",
+	"/*/ still a comment */ x",
+	"@ # $ x\n\t\r y  \t",
+	"€12.5 + é12.5 - 12.é",
+	"idef /* lorem ipsum",
+	"idef \"lorem ipsum\n",
+	"",
+	"\n\n",
+]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_matches_classic_scanner(source: str, capsys: pytest.CaptureFixture[str]) -> None:
+	expected_tokens = Scanner(source).scan_tokens()
+	expected_errors = capsys.readouterr().out
+
+	tokens = RegexScanner(source).scan_tokens()
+	errors = capsys.readouterr().out
+
+	assert tokens == expected_tokens, "Regex scanner produced different tokens than the classic one"
+	assert errors == expected_errors, "Regex scanner reported different errors than the classic one"
+
+
+def test_zz_syntax_test_file() -> None:
+	source = (Path(__file__).parent.parent / "zz_syntax_test.lox").read_text()
+
+	assert RegexScanner(source).scan_tokens() == Scanner(source).scan_tokens()
@@ -0,0 +1,124 @@
+import mmap
+import pickle
+import pytest
+from lox.scanner import Scanner
+from lox.parser import Parser
+from lox.expressions import Binary, Grouping, Literal, Unary, Conditional, Error
+from lox.tokens import Token, TokenType as TT
+from lox.diagnostics import Diagnostics
+from lox.serialization import (
+	flatten, unflatten, dump_tokens, load_tokens, dump_ast, load_ast, AstReader, ExprView,
+)
+
+
+SOURCES = [
+	"-123 * (45.67 + 8.901)",
+	"1 == 2 ? 45 : -123 * (45.67 + 8.901)",
+	"nil ? true : false ? \"a\" : !\"b\"",
+	"((1))",
+	"\"zażółć\" + \"gęślą\" != \"\"",
+	"0.1 + 1e0 - 9007199254740993 / 123456789012",
+	"price * (1 - discount) > limit ? name : -price",
+]
+
+
+def parse(source: str):
+	return Parser(Scanner(source).scan_tokens()).parse()
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_flatten_round_trip(source: str) -> None:
+	expr = parse(source)
+
+	assert unflatten(flatten(expr)) == expr, f"Flattening {source} didn't round trip"
+
+
+@pytest.mark.parametrize("source", SOURCES + ["var x = fun;\n// comment\n\"multi\nline\" and or 12.50 @"])
+def test_tokens_round_trip(source: str) -> None:
+	tokens = Scanner(source).scan_tokens()
+
+	assert list(load_tokens(dump_tokens(tokens))) == tokens, f"Token stream of {source} didn't round trip"
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_ast_round_trip(source: str) -> None:
+	expr = parse(source)
+
+	assert load_ast(dump_ast(expr)) == expr, f"Tree of {source} didn't round trip"
+
+
+@pytest.mark.parametrize("source", ["1 + (2 * ", "== \"s\" ? a", "a ? 1 2", ")"])
+def test_partial_trees_round_trip(source: str) -> None:
+	[expr] = Parser(Scanner(source).scan_tokens(), reporter=Diagnostics()).parse_all()
+
+	assert unflatten(flatten(expr)) == expr, f"Flattening partial tree of {source} didn't round trip"
+	assert load_ast(dump_ast(expr)) == expr, f"Partial tree of {source} didn't round trip"
+
+
+def test_error_views() -> None:
+	number = Token(TT.NUMBER, "2", 2.0, 3)
+	root = AstReader(dump_ast(Error(number, Error(Token(TT.EOF, "", None, 3), None)))).root
+	[partial] = root.children
+
+	assert root.node_type is partial.node_type is Error
+	assert root.token == number, "Error tokens should keep their literal"
+	assert partial.children == [] and partial.token.token_type is TT.EOF
+
+
+@pytest.mark.parametrize("value", [0.0, -0.0, 1.0, -1.0, 2.0 ** 53, -2.0 ** 60, 0.5, float("inf"), "", "x", True, False, None])
+def test_literal_values(value) -> None:
+	loaded = load_ast(dump_ast(Literal(value))).value
+
+	assert type(loaded) is type(value) and str(loaded) == str(value), f"Literal {value!r} changed on the way"
+
+
+def test_deep_tree() -> None:
+	plus = Token(TT.PLUS, "+", None, 1)
+	expr = Literal(0.0)
+	for i in range(20_000):
+		expr = Conditional(Literal(True), Binary(expr, plus, Literal(float(i))), Grouping(Literal(None)))
+
+	assert flatten(load_ast(dump_ast(expr))) == flatten(expr)
+
+
+def test_lazy_views(tmp_path) -> None:
+	expr = parse("1 == 2 ? (3) : -\"four\"")
+	path = tmp_path / "expr.plxb"
+	path.write_bytes(dump_ast(expr))
+
+	with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+		reader = AstReader(data)
+		root = reader.root
+		condition, then_branch, else_branch = root.children
+
+		assert root.node_type is Conditional
+		assert condition.operator == Token(TT.EQUAL_EQUAL, "==", None, 1)
+		assert [child.value for child in condition.children] == [1.0, 2.0]
+		assert then_branch.node_type is Grouping
+		assert else_branch.materialize() == Unary(Token(TT.MINUS, "-", None, 1), Literal("four"))
+		assert root.materialize() == expr
+		del reader, root, condition, then_branch, else_branch  # views have to let go of the mapping before it's closed
+
+
+def test_views_decode_only_what_they_touch() -> None:
+	reader = AstReader(dump_ast(parse("\"left\" + \"right\"")))
+	left, _ = reader.root.children
+
+	assert left.value == "left"
+	assert reader.strings.count(None) == 1, "Right operand's string should stay undecoded"
+
+
+def test_rejects_other_data() -> None:
+	with pytest.raises(ValueError):
+		AstReader(dump_tokens(Scanner("1").scan_tokens()))
+	with pytest.raises(ValueError):
+		list(load_tokens(pickle.dumps([1, 2, 3])))
+
+
+def test_smaller_than_pickle() -> None:
+	source = " + ".join(f"({i} * {i}.5 - \"s{i % 7}\")" for i in range(500))
+	tokens = Scanner(source).scan_tokens()
+	expr = parse(source)
+
+	assert len(dump_tokens(tokens)) * 3 < len(pickle.dumps(tokens))
+	assert len(dump_ast(expr)) * 2 < len(pickle.dumps(flatten(expr)))
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from typing import Callable
+from lox.lox import Lox
+from lox.session import Session
+from lox.cache import AstCache
+from lox.client import LoxClient, encode_request, RESPONSE_HEADER
+from lox.server import LoxServer, TIMED_OUT, REQUEST_TOO_LARGE
+
+
+class SlowServer(LoxServer):
+	"""Runs every program for a while, keeping track of how many of them ran at once"""
+
+	def __init__(self, *args, delay: float = 0.05, **kwargs) -> None:
+		super().__init__(*args, **kwargs)
+		self.delay = delay
+		self.running = self.most_running = 0
+		self.lock = threading.Lock()
+
+	def run_program(self, source: str) -> tuple[int, str, str]:
+		with self.lock:
+			self.running += 1
+			self.most_running = max(self.most_running, self.running)
+		time.sleep(self.delay)
+		with self.lock:
+			self.running -= 1
+		return super().run_program(source)
+
+
+async def request(path: str, source: bytes) -> tuple[int, str, str]:
+	reader, writer = await asyncio.open_unix_connection(path)
+	writer.write(encode_request(source))
+	code, out_size, err_size = RESPONSE_HEADER.unpack(await reader.readexactly(RESPONSE_HEADER.size))
+	data = await reader.readexactly(out_size + err_size)
+	writer.close()
+	return code, data[:out_size].decode(), data[out_size:].decode()
+
+
+def serve_in_thread(server: LoxServer) -> Callable[[], None]:
+	"""Starts the server in a thread of its own, so blocking clients can be tested, returns what stops it"""
+	started = threading.Event()
+	control = {}
+
+	async def main() -> None:
+		control["loop"], control["stopped"] = asyncio.get_running_loop(), asyncio.Event()
+		async with await server.start():
+			started.set()
+			await control["stopped"].wait()
+
+	thread = threading.Thread(target=asyncio.run, args=(main(),))
+	thread.start()
+	started.wait()
+
+	def stop() -> None:
+		control["loop"].call_soon_threadsafe(control["stopped"].set)
+		thread.join()
+	return stop
+
+
+def test_requests_isolated(tmp_path, monkeypatch) -> None:
+	path = str(tmp_path / "plox.sock")
+	monkeypatch.setattr(Lox, "default_session", Session())
+	stop = serve_in_thread(LoxServer(path, evaluator="vm", optimize=True))
+
+	with LoxClient(path) as client:
+		assert client.run("1 + 2") == (0, "3\n", "[optimizer] eliminated 2 nodes\n")
+		assert client.run("(1 @") == (65, "[line 1] Error : Unexpected character.\n[line 1] Error at end: Expect ')' after expression.\n", "")
+		assert client.run(b"-nil") == (70, "Operand must be a number.\n[line 1]\n", "[optimizer] eliminated 0 nodes\n")
+		assert client.run("\"a\" + \"b\"")[:2] == (0, "ab\n"), "An error must not affect programs following it"
+
+	stop()
+	assert not Lox.had_error and not Lox.had_runtime_error, "Requests must run in sessions of their own"
+
+
+def test_shared_ast_cache(tmp_path) -> None:
+	path = str(tmp_path / "plox.sock")
+	cache = AstCache(use_disk=False)
+
+	async def main() -> list:
+		async with await LoxServer(path, evaluator="tree", ast_cache=cache).start():
+			return [await request(path, b"2 * 21") for _ in range(3)]
+
+	assert asyncio.run(main()) == [(0, "42\n", "")] * 3
+	assert (cache.misses, cache.hits) == (1, 2), "Only the first request should scan and parse"
+
+
+def test_concurrency_limit(tmp_path) -> None:
+	path = str(tmp_path / "plox.sock")
+	server = SlowServer(path, max_concurrent=2, evaluator="vm")
+
+	async def main() -> list:
+		async with await server.start():
+			return await asyncio.gather(*(request(path, f"{i} * 2".encode()) for i in range(8)))
+
+	assert asyncio.run(main()) == [(0, f"{i * 2}\n", "") for i in range(8)]
+	assert server.most_running == 2, "Programs beyond the limit must wait for a worker"
+
+
+def test_timeout(tmp_path) -> None:
+	path = str(tmp_path / "plox.sock")
+	server = SlowServer(path, max_concurrent=1, timeout=0.1, delay=0.3, evaluator="vm")
+
+	async def main() -> list:
+		async with await server.start():
+			start = time.perf_counter()
+			timed_out = await request(path, b"1")
+			elapsed = time.perf_counter() - start
+			assert elapsed < 0.25, "A request must be answered once it times out, not when its program ends"
+			server.timeout = 10
+			return [timed_out, await request(path, b"2")]
+
+	assert asyncio.run(main()) == [(TIMED_OUT, "", "Timed out after 0.1 s.\n"), (0, "2\n", "")]
+	assert server.most_running == 1, "A worker is taken until its program ends, even after its request timed out"
+
+
+def test_request_too_large(tmp_path) -> None:
+	path = str(tmp_path / "plox.sock")
+
+	async def main() -> tuple:
+		async with await LoxServer(path, max_request_size=8).start():
+			return await request(path, b"1 + 2 + 3")
+
+	assert asyncio.run(main()) == (REQUEST_TOO_LARGE, "", "Request of 9 bytes exceeds the limit of 8 bytes.\n")
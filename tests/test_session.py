@@ -0,0 +1,131 @@
+import io
+import sys
+import asyncio
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from lox.lox import Lox
+from lox.session import Session, SCANNER_ENGINES, PARSER_ENGINES, EVALUATORS
+from lox.cache import AstCache
+
+
+CASES = [
+	("-123 * (45.67 + 8.901)", "-6712.233\n", False, False),
+	("1 +\n(2", "[line 2] Error at end: Expect ')' after expression.\n", True, False),
+	("\"a\" - 1", "Operands must be numbers.\n[line 1]\n", False, True),
+	("== 1 @", None, True, False),
+	("true ? \"x\" : 1 / 0", "x\n", False, False),
+]
+
+
+@pytest.fixture
+def frequent_switches():
+	interval = sys.getswitchinterval()
+	sys.setswitchinterval(1e-6)  # threads take turns as often as possible to make any shared state show up
+	yield
+	sys.setswitchinterval(interval)
+
+
+def run_session(seed: int, cache: AstCache | None = None) -> tuple[int, Session]:
+	rng = random.Random(seed)
+	case = rng.randrange(len(CASES))
+	session = Session(
+		scanner_engine=rng.choice(list(SCANNER_ENGINES)), parser_engine=rng.choice(list(PARSER_ENGINES)),
+		evaluator=rng.choice(list(EVALUATORS)), ast_cache=cache, out=io.StringIO(),
+	)
+	for _ in range(rng.randint(1, 5)):
+		session.run(CASES[case][0])
+	return case, session
+
+
+@pytest.mark.parametrize("shared_cache", [False, True])
+def test_parallel_sessions(frequent_switches, shared_cache: bool, monkeypatch, capsys) -> None:
+	monkeypatch.setattr(Lox, "default_session", Session())
+	cache = AstCache(capacity=3, use_disk=False) if shared_cache else None
+	with ThreadPoolExecutor(max_workers=16) as pool:
+		results = list(pool.map(lambda seed: run_session(seed, cache), range(400)))
+
+	for case, session in results:
+		source, output, had_error, had_runtime_error = CASES[case]
+		runs = session.out.getvalue()
+		assert session.had_error == had_error, f"Error state of {source} leaked between sessions"
+		assert session.had_runtime_error == had_runtime_error, f"Runtime error state of {source} leaked between sessions"
+		if output is not None:
+			assert runs == output * (len(runs) // len(output)), f"Output of {source} got mixed up with other sessions"
+	assert capsys.readouterr().out == "", "Sessions must write to their own streams only"
+	assert not Lox.had_error
+
+
+def test_asyncio_executor() -> None:
+	async def main() -> list[Session]:
+		loop = asyncio.get_running_loop()
+		sessions = [Session(evaluator="vm", out=io.StringIO()) for _ in range(20)]
+		await asyncio.gather(*(
+			loop.run_in_executor(None, session.run, f"{i} * 2 == {2 * i} ? ({i}) : -1") for i, session in enumerate(sessions)
+		))
+		return sessions
+
+	sessions = asyncio.run(main())
+	assert [session.out.getvalue() for session in sessions] == [f"{i}\n" for i in range(20)]
+
+
+def test_diagnostics_kept() -> None:
+	session = Session(out=io.StringIO())
+	session.run("(1 @")
+
+	assert [str(diagnostic) for diagnostic in session.diagnostics.items] == [
+		"[line 1] Error : Unexpected character.",
+		"[line 1] Error at end: Expect ')' after expression.",
+	]
+	assert session.out.getvalue() == "".join(f"{diagnostic}\n" for diagnostic in session.diagnostics.items)
+
+
+def test_default_session_wrapper(monkeypatch, capsys) -> None:
+	monkeypatch.setattr(Lox, "default_session", Session())
+	Lox.evaluator = "tree"
+	Lox.run("1 + 2")
+	Lox.run("1 +")
+
+	assert Lox.had_error and Lox.default_session.had_error
+	assert Lox.default_session.evaluator == "tree"
+	assert capsys.readouterr().out == "3\n[line 1] Error at end: Expect expression.\n"
+
+	Lox.had_error = False
+	assert not Lox.default_session.had_error
+
+
+def test_threads_keep_default_session_clean(frequent_switches, monkeypatch) -> None:
+	monkeypatch.setattr(Lox, "default_session", Session())
+	threads = [threading.Thread(target=run_session, args=(seed,)) for seed in range(32)]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	assert not Lox.had_error and not Lox.had_runtime_error
+
+
+@pytest.mark.parametrize("evaluator", EVALUATORS)
+def test_deeper_than_recursion_limit(evaluator: str) -> None:
+	depth = sys.getrecursionlimit() * 2
+	session = Session(parser_engine="precedence", evaluator=evaluator, out=io.StringIO())
+	session.run("\n" + "-" * depth + "1")
+
+	if evaluator == "vm":
+		assert session.out.getvalue() == "1\n" and not session.had_runtime_error, "The VM runs trees of any depth"
+	else:
+		assert session.out.getvalue() == "Expression nests too deeply.\n[line 2]\n"
+		assert session.had_runtime_error, "Recursing engines must report trees too deep for them as runtime errors"
+
+
+def test_error_state_per_run() -> None:
+	session = Session(evaluator="tree", out=io.StringIO())
+	session.run("(1 @")
+	session.run("-nil")
+
+	assert not session.had_error and session.had_runtime_error
+	assert not session.diagnostics.items, "Diagnostics of earlier runs must not pile up"
+
+	session.run("1 + 2")
+	assert not session.had_error and not session.had_runtime_error
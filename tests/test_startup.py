@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+import pytest
+from lox.__main__ import DEFERRED_MODULES, STARTUP_BUDGET_US
+
+
+def test_deferred_imports() -> None:
+	code = f"import sys, lox.__main__; print(*[m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+	imported = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+	assert not imported, f"Starting the interpreter imports {', '.join(imported)}"
+
+
+def test_session_imports_engines_in_use() -> None:
+	code = (
+		"import io, sys; from lox.session import Session; "
+		"Session(scanner_engine='regex', evaluator='vm', out=io.StringIO()).run('1 + 2'); "
+		"print(*sorted(m for m in sys.modules if m.startswith('lox.')))"
+	)
+	imported = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+	assert {"lox.regex_scanner", "lox.vm", "lox.bytecode"} <= set(imported)
+	assert not {"lox.scanner", "lox.ast_printer", "lox.generated_parser"} & set(imported)
+
+
+@pytest.mark.skipif(not os.environ.get("PLOX_TIMING_TESTS"), reason="timing depends on the machine, set PLOX_TIMING_TESTS")
+def test_startup_budget() -> None:
+	def cumulative_us() -> int:
+		result = subprocess.run(
+			[sys.executable, "-X", "importtime", "-c", "import lox.__main__"], capture_output=True, text=True, check=True,
+			env=dict(os.environ, PYTHONDONTWRITEBYTECODE=""),  # timing loads of cached bytecode, not compiling sources
+		)
+		return int(result.stderr.splitlines()[-1].split("|")[1])  # lox.__main__ itself is imported last
+
+	fastest = min(cumulative_us() for _ in range(5))
+	assert fastest < STARTUP_BUDGET_US, f"Importing lox.__main__ took {fastest:,} us"
@@ -0,0 +1,42 @@
+import io
+import pytest
+from lox.scanner import Scanner
+from lox.stream_scanner import StreamScanner
+from lox.parser import Parser
+from lox.expressions import Binary, Grouping, Literal
+
+
+SOURCES = [
+	"-123 * (45.67 + 8.901)",
+	"1 == 2 ? 45 : -123 * (45.67 + 8.901)",
+	f"idef /* {'\n' * 3} */ idef",
+	"a != b >= c <= d > e < f = g ! h // trailing comment",
+	"foo_bar _baz qux1 1.5.2 12. .5 123456789.987654321",
+	"\"multi\nline\nstring\" after // comment\nnext /*/ still a comment */ x",
+	"@ # $ x\n\t\r y   ",
+	"€12.5 + é12.5 - 12.é",
+	"idef /* lorem ipsum",
+	"idef \"lorem ipsum\n",
+	"",
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64 * 1024])
+@pytest.mark.parametrize("source", SOURCES)
+def test_chunk_boundaries(source: str, chunk_size: int, capsys: pytest.CaptureFixture[str]) -> None:
+	expected_tokens = Scanner(source).scan_tokens()
+	expected_errors = capsys.readouterr().out
+
+	tokens = list(StreamScanner(io.StringIO(source), chunk_size).scan_tokens())
+	errors = capsys.readouterr().out
+
+	assert tokens == expected_tokens, f"Stream scanner split lexemes incorrectly with chunk size {chunk_size}"
+	assert errors == expected_errors, f"Stream scanner reported errors incorrectly with chunk size {chunk_size}"
+
+
+def test_parser_consumes_lazy_stream() -> None:
+	tokens = StreamScanner(io.StringIO("1 * (2 + 3)"), chunk_size=2).scan_tokens()
+	expr = Parser(tokens).parse()
+
+	assert isinstance(expr, Binary) and expr.left == Literal(1.0), "Parser failed to consume a lazy token stream"
+	assert isinstance(expr.right, Grouping), "Parser failed to consume a lazy token stream"
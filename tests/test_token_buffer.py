@@ -0,0 +1,43 @@
+import pytest
+from lox.scanner import Scanner
+from lox.regex_scanner import ColumnarScanner
+from lox.token_buffer import TokenBuffer
+from lox.tokens import Token, TokenType as TT
+from lox.parser import Parser
+
+
+SOURCES = [
+	"1 == 2 ? 45 : -123 * (45.67 + 8.901)",
+	"var x /* float */ = 3 + 2; print x",
+	"\"multi\nline\nstring\" after // comment\nnil true false",
+	"idef \"lorem ipsum",
+	"",
+]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_views_match_classic_tokens(source: str) -> None:
+	buffer = ColumnarScanner(source).scan_tokens()
+	expected = Scanner(source).scan_tokens()
+
+	assert len(buffer) == len(expected), "Token buffer holds a different number of tokens"
+	assert list(buffer) == expected, "Token views differ from tokens produced by the classic scanner"
+	assert buffer[-1] == expected[-1] and buffer[1:3] == expected[1:3], "Token buffer indexing is broken"
+
+
+def test_literals_stored_only_for_numbers_and_strings() -> None:
+	buffer = ColumnarScanner("x + 1.5 * \"s\" and true").scan_tokens()
+
+	assert sorted(buffer.literals) == [2, 4], "Only NUMBER and STRING literals should be stored"
+	assert buffer.literal(0) == "x" and buffer.literal(5) == "and", "Identifier literals should be their lexemes"
+
+
+def test_append_and_parse() -> None:
+	buffer = TokenBuffer("1 + 2")
+	buffer.append(TT.NUMBER, 0, 1, 1, 1.0)
+	buffer.append(TT.PLUS, 2, 1, 1)
+	buffer.append(TT.NUMBER, 4, 1, 1, 2.0)
+	buffer.append(TT.EOF, 5, 0, 1)
+
+	assert buffer[1] == Token(TT.PLUS, "+", None, 1), "Appended token reads back incorrectly"
+	assert Parser(buffer).parse() == Parser(Scanner("1 + 2").scan_tokens()).parse(), "Parser can't read a token buffer"
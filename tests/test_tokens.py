@@ -1,4 +1,4 @@
-from lox.tokens import Token, TokenType
+from lox.tokens import Token, TokenType, BINARY_PRECEDENCE, BINARY_LEVELS, UNARY_CAPABLE, STATEMENT_STARTS
 
 
 def test_str_repr() -> None:
@@ -10,4 +10,10 @@ def test_str_repr() -> None:
 
 	assert expected == t_repr, "Invalid Token.__repr__ method"
 	assert token == eval(t_repr), "Eval of repr should create the token"
-	
\ No newline at end of file
+	
+
+def test_type_tables() -> None:
+	assert {tt: BINARY_LEVELS[tt] for tt in TokenType if BINARY_LEVELS[tt]} == BINARY_PRECEDENCE
+	assert {tt for tt in TokenType if UNARY_CAPABLE[tt]} == {TokenType.BANG, TokenType.MINUS}
+	assert not STATEMENT_STARTS[TokenType.EOF] and STATEMENT_STARTS[TokenType.PRINT]
+	assert len(BINARY_LEVELS) == len(UNARY_CAPABLE) == len(STATEMENT_STARTS) == max(TokenType) + 1
@@ -0,0 +1,112 @@
+import math
+import random
+import pytest
+from lox.scanner import Scanner
+from lox.parser import Parser
+from lox.interpreter import LoxRuntimeError, evaluate
+from lox.diagnostics import Diagnostics
+
+np = pytest.importorskip("numpy")
+from lox.vectorized import evaluate_columns  # noqa: E402
+
+
+def parse(source: str):
+	return Parser(Scanner(source).scan_tokens(), reporter=Diagnostics()).parse_all()[0]  # partial trees included
+
+
+def per_row(expr, columns: dict, count: int) -> list:
+	return [evaluate(expr, {name: column[i] for name, column in columns.items()}) for i in range(count)]
+
+
+def assert_same_values(actual: list, expected: list, source: str) -> None:
+	for a, e in zip(actual, expected, strict=True):
+		same = type(a) is type(e) and (a == e or a != a and e != e) and (type(a) is not float or math.copysign(1, a) == math.copysign(1, e))
+		assert same, f"Vectorized {source} gave {actual}, rows one by one {expected}"
+
+
+rng = random.Random(1337)
+COLUMNS = {
+	"x": [rng.choice([-2.0, -0.0, 0.0, 1.5, 3.0, 1e308]) for _ in range(200)],
+	"y": [rng.uniform(-5, 5) for _ in range(200)],
+	"flag": [rng.random() < 0.5 for _ in range(200)],
+	"name": [rng.choice(["a", "b", ""]) for _ in range(200)],
+	"maybe": [rng.choice([None, 1.0, 2.0, "c", True]) for _ in range(200)],
+}
+
+
+@pytest.mark.parametrize("source", [
+	"x * 2 + y / 3 - -x",
+	"x * x * 10",  # overflows to inf
+	"x > y == y <= x",
+	"x == 0 ? 1 : x",
+	"x != 0 ? y / x : nil",
+	"flag ? x : y",
+	"flag == (x >= 0)",
+	"flag == x",
+	"!flag != !x",
+	"name + name == \"aa\" ? x : name",
+	"maybe == nil ? 0 : maybe",
+	"x == nil == (flag != \"a\")",
+	"maybe != \"c\" == (name == maybe)",
+	"maybe == 1 ? maybe * 2 : 0",
+	"!maybe ? name : maybe == \"c\" ? x : y",
+	"(1 + 2) * 3 > 4 ? \"s\" : nil",
+	"flag ? (flag ? x : 1 / 0) : y",
+])
+def test_matches_per_row(source: str) -> None:
+	expr = parse(source)
+	columns = {name: np.array(column) if name in ("x", "y", "flag") else column for name, column in COLUMNS.items()}
+	result = evaluate_columns(expr, columns)
+
+	assert len(result) == 200
+	assert_same_values(result.tolist(), per_row(expr, COLUMNS, 200), source)
+
+
+@pytest.mark.parametrize("source, dtype", [
+	("x + 1", np.float64),
+	("x < 1", np.bool_),
+	("name", object),
+	("flag ? x : nil", object),
+	("maybe == nil ? 0 : 1", np.float64),
+	("42", np.float64),
+])
+def test_result_dtypes(source: str, dtype) -> None:
+	assert evaluate_columns(parse(source), COLUMNS).dtype == dtype
+
+
+@pytest.mark.parametrize("source, message", [
+	("x\n/ (x - x)", "Division by zero."),
+	("\n-name", "Operand must be a number."),
+	("x\n+ name", "Operands must be two numbers or two strings."),
+	("flag\n< 1", "Operands must be numbers."),
+	("x + \nmissing", "Undefined variable 'missing'."),
+	("x +\n(x *", "Can't evaluate an expression with a syntax error."),
+])
+def test_runtime_errors(source: str, message: str) -> None:
+	with pytest.raises(LoxRuntimeError) as exc_info:
+		evaluate_columns(parse(source), COLUMNS)
+
+	assert str(exc_info.value) == message
+	assert exc_info.value.line == 2, "Runtime error should point at the line of the failing node"
+
+
+def test_branches_see_only_their_rows() -> None:
+	columns = {"x": np.array([0.0, 2.0, 0.0, 4.0]), "tag": ["zero", 1.0, "zero", 2.0]}
+
+	assert evaluate_columns(parse("x == 0 ? tag : 8 / x - tag"), columns).tolist() == ["zero", 3.0, "zero", 0.0]
+	assert evaluate_columns(parse("x > 100 ? undefined : 1"), columns).tolist() == [1.0] * 4
+
+
+def test_integer_columns_and_count() -> None:
+	assert evaluate_columns(parse("n / 2"), {"n": np.arange(4)}).tolist() == [0.0, 0.5, 1.0, 1.5]
+	assert evaluate_columns(parse("1 < 2"), {}, count=3).tolist() == [True] * 3
+	assert evaluate_columns(parse("1 / 0"), {"x": []}).tolist() == []
+
+
+def test_invalid_columns() -> None:
+	with pytest.raises(ValueError):
+		evaluate_columns(parse("a + b"), {"a": [1.0], "b": [1.0, 2.0]})
+	with pytest.raises(ValueError):
+		evaluate_columns(parse("1"), {})
+	with pytest.raises(ValueError):
+		evaluate_columns(parse("a"), {"a": [{}]})
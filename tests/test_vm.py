@@ -0,0 +1,110 @@
+import sys
+import pytest
+from lox.scanner import Scanner
+from lox.parser import Parser
+from lox.tokens import Token, TokenType as TT
+from lox.expressions import Binary, Literal, Unary
+from lox.interpreter import LoxRuntimeError, evaluate
+from lox.diagnostics import Diagnostics
+from lox.bytecode import compile_bytecode
+from lox.vm import execute
+from lox.disassembler import disassemble
+from lox.optimizer import fold_constants
+
+
+def parse(source: str):
+	return Parser(Scanner(source).scan_tokens()).parse()
+
+
+@pytest.mark.parametrize("source", [
+	"-123 * (45.67 + 8.901)",
+	"1 + 2 * 3 - 4 / 2 >= 5 == true",
+	"\"lo\" + \"x\" != \"lox\"",
+	"nil ? 1 : false ? 2 : 0 ? (3 ? 4 : 5) : 6",
+	"!nil == !false",
+	"1 == true",
+	"nil == nil",
+	"0 == -0",
+	"1 < 2 ? \"a\" : \"b\"",
+	"x * (y - 1) >= 2 ? name + name : -x",
+	"!x == name",
+])
+def test_matches_tree_walker(source: str) -> None:
+	expr = parse(source)
+	environment = {"x": 3.0, "y": 1.5, "name": "lox"}
+	result = execute(compile_bytecode(expr), environment)
+	expected = evaluate(expr, environment)
+
+	assert type(result) is type(expected) and result == expected, f"VM evaluated {source} differently"
+
+
+@pytest.mark.parametrize("source, message", [
+	("-\"a\"", "Operand must be a number."),
+	("\"a\" - 1", "Operands must be numbers."),
+	("1\n+ \"a\"", "Operands must be two numbers or two strings."),
+	("true\n\n< 1", "Operands must be numbers."),
+	("1 / (2 - 2)", "Division by zero."),
+	("1 +\n\nmissing", "Undefined variable 'missing'."),
+])
+def test_runtime_errors(source: str, message: str) -> None:
+	with pytest.raises(LoxRuntimeError) as exc_info:
+		execute(compile_bytecode(parse(source)))
+
+	assert str(exc_info.value) == message, f"VM raised wrong runtime error for {source}"
+	assert exc_info.value.line == source.count("\n") + 1, "Runtime error should point at the operator's line"
+
+
+def test_partial_trees_not_compiled() -> None:
+	[expr] = Parser(Scanner("1 +\n(2 *").scan_tokens(), reporter=Diagnostics()).parse_all()
+	with pytest.raises(LoxRuntimeError) as exc_info:
+		compile_bytecode(expr)
+
+	assert str(exc_info.value) == "Can't evaluate an expression with a syntax error." and exc_info.value.line == 2
+
+
+def test_deeper_than_recursion_limit() -> None:
+	minus = Token(TT.MINUS, "-", None, 1)
+	expr = Literal(1.0)
+	for _ in range(sys.getrecursionlimit() * 2):
+		expr = Unary(minus, Binary(expr, minus, Literal(1.0)))
+
+	assert execute(compile_bytecode(expr)) == 1.0, "VM failed on a tree deeper than the recursion limit"
+
+
+def test_disassemble() -> None:
+	listing = disassemble(compile_bytecode(parse("true ? -1 : nil")))
+
+	assert listing.splitlines() == [
+		"== expression ==",
+		"0000    0 TRUE",
+		"0001    | JUMP_IF_FALSE       1 -> 5",
+		"0002    1 CONSTANT            0 1",
+		"0003    | NEGATE",
+		"0004    | JUMP                4 -> 6",
+		"0005    | NIL",
+		"0006    | RETURN",
+	], "Unexpected disassembly listing"
+
+
+def test_disassemble_variables() -> None:
+	listing = disassemble(compile_bytecode(parse("x + \"x\"")))
+
+	assert listing.splitlines() == [
+		"== expression ==",
+		"0000    1 GET_VARIABLE        0 x",
+		"0001    | CONSTANT            0 \"x\"",
+		"0002    | ADD",
+		"0003    | RETURN",
+	], "Variable names should share the constant pool with strings but be listed unquoted"
+
+
+def test_disassemble_folded() -> None:
+	folded, _ = fold_constants(parse("\n\n(1 +\n2) * 3"))
+	listing = disassemble(compile_bytecode(folded))
+
+	assert folded == Literal(9.0)
+	assert listing.splitlines() == [
+		"== expression ==",
+		"0000    4 CONSTANT            0 9",
+		"0001    | RETURN",
+	], "Folded constants should be listed at the line of the operator they were folded from"